@@ -0,0 +1,67 @@
+// ============================================
+// ARCHIVE STORE — Reads archive snapshots packed by scripts/archive_store.py
+// archive/store/index.json maps a snapshot id to gzip section blobs, each
+// either a full section or a delta against its parent blob
+// ============================================
+
+var ArchiveStore = {
+  _index: {},      // base -> Promise<index | null>
+  _sections: {},   // blob id -> Promise<section>
+
+  /** Snapshot `id` (e.g. '2026-02-20') rebuilt from the store, or null if not packed */
+  loadSnapshot: async function(base, id) {
+    if (!this._index[base]) {
+      this._index[base] = fetch(base + 'store/index.json?t=' + Date.now())
+        .then(function(r) { return r.ok ? r.json() : null; })
+        .catch(function() { return null; });
+    }
+    var index = await this._index[base];
+    var entry = index && index.snapshots && index.snapshots[id];
+    if (!entry) return null;
+
+    var doc = {};
+    for (var i = 0; i < entry.keys.length; i++) {
+      var key = entry.keys[i];
+      doc[key] = (key in entry.sections) ? await this._section(base, entry.sections[key]) : entry.scalars[key];
+    }
+    // Sections are shared between days — hand out a private copy
+    return JSON.parse(JSON.stringify(doc));
+  },
+
+  _section: function(base, cid) {
+    var self = this;
+    if (!this._sections[cid]) {
+      this._sections[cid] = (async function() {
+        var resp = await fetch(base + 'store/blobs/' + cid.slice(0, 2) + '/' + cid + '.json.gz');
+        if (!resp.ok) throw new Error('archive blob ' + cid + ': HTTP ' + resp.status);
+        var text = await new Response(resp.body.pipeThrough(new DecompressionStream('gzip'))).text();
+        var blob = JSON.parse(text);
+        return blob.parent ? self._decode(blob.data, await self._section(base, blob.parent)) : blob.data;
+      })();
+    }
+    return this._sections[cid];
+  },
+
+  _decode: function(enc, old) {
+    if ('P' in enc) return old;
+    if ('L' in enc) {
+      return enc.L.map(function(item) {
+        if (typeof item === 'number') return old[item];
+        if ('+' in item) return item['+'];
+        var rec = {};
+        var removed = item['-'] || [];
+        Object.keys(old[item['@']]).forEach(function(k) {
+          if (removed.indexOf(k) === -1) rec[k] = old[item['@']][k];
+        });
+        return Object.assign(rec, item['~']);
+      });
+    }
+    if ('D' in enc) {
+      var base = (old && typeof old === 'object' && !Array.isArray(old)) ? old : {};
+      var out = {};
+      for (var k in enc.D) out[k] = this._decode(enc.D[k], base[k]);
+      return out;
+    }
+    return enc['='];
+  }
+};
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""analytics_rollups.py — Compact precomputed aggregates for the dashboards.
+
+results.html and dashboard.html used to download every results file and
+tally breakdowns in the browser. This builds those breakdowns once, after
+grading, into analytics_rollups.json (compact JSON, a few KB gzipped,
+committed); results.html takes its all-time banner from it:
+
+  {"updated": ..., "games": {sport: ROLLUP}, "props": {sport: ROLLUP}}
+
+  ROLLUP = {"overall": REC, "by_type" | "by_prop": {k: REC}, "by_confidence": {bucket: REC},
+            "by_team": {team: REC}, "by_tier": {edge: REC}, "by_direction": {k: REC},
+            "best_bets": REC, "rolling": {"7d": REC, "30d": REC},
+            "streak": {"current": "W3", "longest_win": n, "longest_loss": n},
+            "days": n, "last_date": "YYYY-MM-DD"}
+  REC    = {"wins", "losses", "pushes", "pct", "units", "roi"}  (flat -110, like results.html)
+
+Which keys appear depends on what the source records carry (game picks
+have types, teams and best bets; props have prop types, edge tiers and
+directions). A game pick's team is the side it picked (spread and ML; totals
+have none). Streaks are in graded days: a day counts as a win when it
+had more wins than losses.
+
+Rollups are incremental per graded day: each day's partial tallies are
+kept in the results store (table day_rollups, keyed by the day's content
+hash) and only days whose hash changed are re-tallied; the file is then a
+sum over cached partials (TALLY_VERSION is part of the cache key).
+
+Usage:
+    python scripts/analytics_rollups.py [--out PATH]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from json_canonical import canonicalize
+from results_store import DB_PATH, REPO_ROOT, RESULTS_FILES, connect, sync
+
+OUTPUT_FILE = "analytics_rollups.json"
+WINDOWS = (7, 30)
+# NBA prop picks also sit in results.json days; props roll up from the props results files only
+GAME_TYPES = ("spread", "total", "ml")
+TALLY_VERSION = 3  # bump when the per-day tallies change, so every cached day is re-tallied
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS day_rollups (
+    file TEXT NOT NULL, date TEXT NOT NULL, dup INTEGER NOT NULL DEFAULT 0,
+    hash TEXT NOT NULL, data TEXT NOT NULL,
+    PRIMARY KEY (file, date, dup)
+);
+"""
+
+# Day-level breakdowns in all_props_results.json days that predate stored picks
+_LEGACY_DAY_KEYS = {"by_stat_type": "by_prop", "by_edge_category": "by_tier", "by_direction": "by_direction"}
+
+
+def _conf_bucket(c):
+    if c is None:
+        return None
+    if c < 50:
+        return "<50"
+    if c >= 80:
+        return "80+"
+    lo = int(c // 5 * 5)
+    return f"{lo}-{lo + 5}"
+
+
+def _record(w, l, p):
+    t = w + l
+    units = round(w * 0.9091 - l, 2)
+    return {
+        "wins": w, "losses": l, "pushes": p,
+        "pct": round(w / t * 100, 1) if t > 0 else 0,
+        "units": units,
+        "roi": round(units / t * 100, 1) if t > 0 else 0,
+    }
+
+
+def _add(tally, dim, key, outcome):
+    """Count one outcome (0 win, 1 loss, 2 push) under tally[dim][key]."""
+    if key is None or key == "":
+        return
+    cell = tally.setdefault(dim, {}).setdefault(str(key), [0, 0, 0])
+    cell[outcome] += 1
+
+
+# ── Per-day partials ─────────────────────────────────────────────
+
+
+def _game_day_tally(conn, file, date, dup):
+    tally = {}
+    rows = conn.execute(
+        "SELECT type, away, home, pick, hit, confidence, best_bet FROM picks "
+        f"WHERE file = ? AND date = ? AND dup = ? AND type IN ({', '.join('?' * len(GAME_TYPES))})",
+        (file, date, dup, *GAME_TYPES))
+    for type_, away, home, pick, hit, conf, best in rows:
+        outcome = 2 if hit is None else (0 if hit else 1)
+        _add(tally, "overall", "all", outcome)
+        _add(tally, "by_type", type_, outcome)
+        _add(tally, "by_confidence", _conf_bucket(conf), outcome)
+        side = (pick or "").split(" ", 1)[0]  # "BOS -3.5" / "BOS"; totals pick OVER/UNDER
+        if side in (away, home):
+            _add(tally, "by_team", side, outcome)
+        if best:
+            _add(tally, "best_bets", "all", outcome)
+    return tally
+
+
+def _prop_day_tally(conn, file, date, dup, meta):
+    tally = {}
+    rows = conn.execute(
+        "SELECT prop, team, direction, edge, result, confidence FROM prop_results "
+        "WHERE file = ? AND date = ? AND dup = ?", (file, date, dup)).fetchall()
+    for prop, team, direction, edge, result, conf in rows:
+        if result not in ("WIN", "LOSS", "PUSH"):
+            continue
+        outcome = {"WIN": 0, "LOSS": 1, "PUSH": 2}[result]
+        _add(tally, "overall", "all", outcome)
+        _add(tally, "by_prop", prop, outcome)
+        _add(tally, "by_tier", edge, outcome)
+        _add(tally, "by_direction", direction, outcome)
+        _add(tally, "by_confidence", _conf_bucket(conf), outcome)
+        _add(tally, "by_team", team, outcome)
+    if rows:
+        return tally
+
+    # Older days carry only their own breakdowns — reuse those
+    day = json.loads(meta)
+    ov = day.get("overall") or {}
+    if ov.get("wins") or ov.get("losses"):
+        tally["overall"] = {"all": [ov.get("wins", 0), ov.get("losses", 0), ov.get("pushes", 0)]}
+    for src, dim in _LEGACY_DAY_KEYS.items():
+        for key, rec in (day.get(src) or {}).items():
+            if isinstance(rec, dict):
+                tally.setdefault(dim, {})[key] = [rec.get("wins", 0), rec.get("losses", 0),
+                                                   rec.get("pushes", 0)]
+    return tally
+
+
+def refresh_partials(conn):
+    """Re-tally days whose content hash changed. Returns the number re-tallied."""
+    conn.executescript(ROLLUP_SCHEMA)
+    changed = 0
+    for file, (_, table) in RESULTS_FILES.items():
+        stored = {(d, u): h for d, u, h in conn.execute(
+            "SELECT date, dup, hash FROM day_rollups WHERE file = ?", (file,))}
+        for date, dup, digest, meta in conn.execute(
+                "SELECT date, dup, hash, meta FROM days WHERE file = ?", (file,)).fetchall():
+            digest = f"{digest}/v{TALLY_VERSION}"
+            if stored.pop((date, dup), None) == digest:
+                continue
+            if table == "picks":
+                tally = _game_day_tally(conn, file, date, dup)
+            else:
+                tally = _prop_day_tally(conn, file, date, dup, meta)
+            conn.execute("INSERT OR REPLACE INTO day_rollups (file, date, dup, hash, data) "
+                         "VALUES (?, ?, ?, ?, ?)",
+                         (file, date, dup, digest, json.dumps(tally, separators=(",", ":"))))
+            changed += 1
+        for date, dup in stored:
+            conn.execute("DELETE FROM day_rollups WHERE file = ? AND date = ? AND dup = ?",
+                         (file, date, dup))
+    return changed
+
+
+# ── Rollup ───────────────────────────────────────────────────────
+
+
+def _merge(into, tally, dims=None):
+    for dim, cells in tally.items():
+        if dims is not None and dim not in dims:
+            continue
+        target = into.setdefault(dim, {})
+        for key, (w, l, p) in cells.items():
+            cell = target.setdefault(key, [0, 0, 0])
+            cell[0] += w
+            cell[1] += l
+            cell[2] += p
+
+
+def _streak(day_tallies):
+    """Win/loss streaks over graded days (date order); push-only days don't break them."""
+    current = ""
+    run = longest_win = longest_loss = 0
+    for _, tally in day_tallies:
+        w, l, _ = tally.get("overall", {}).get("all", [0, 0, 0])
+        if w == l:
+            continue
+        side = "W" if w > l else "L"
+        run = run + 1 if side == current else 1
+        current = side
+        if side == "W":
+            longest_win = max(longest_win, run)
+        else:
+            longest_loss = max(longest_loss, run)
+    return {"current": f"{current}{run}" if current else "", "longest_win": longest_win,
+            "longest_loss": longest_loss}
+
+
+def rollup_file(day_tallies):
+    """Aggregate [(date, tally)] (date order) into one ROLLUP dict."""
+    total = {}
+    for _, tally in day_tallies:
+        _merge(total, tally)
+    out = {}
+    overall = total.pop("overall", {}).get("all", [0, 0, 0])
+    out["overall"] = _record(*overall)
+    best = total.pop("best_bets", None)
+    for dim in sorted(total):
+        cells = total[dim]
+        out[dim] = {k: _record(*cells[k]) for k in sorted(cells)}
+    if best:
+        out["best_bets"] = _record(*best["all"])
+
+    last = day_tallies[-1][0] if day_tallies else None
+    if last:
+        end = datetime.strptime(last, "%Y-%m-%d")
+        rolling = {}
+        for n in WINDOWS:
+            start = (end - timedelta(days=n - 1)).strftime("%Y-%m-%d")
+            window = {}
+            for date, tally in day_tallies:
+                if date >= start:
+                    _merge(window, tally, dims=("overall",))
+            rolling[f"{n}d"] = _record(*window.get("overall", {}).get("all", [0, 0, 0]))
+        out["rolling"] = rolling
+    out["streak"] = _streak(day_tallies)
+    out["days"] = len(day_tallies)
+    out["last_date"] = last
+    return out
+
+
+def build_rollups(conn):
+    doc = {"updated": datetime.now().isoformat(timespec="seconds"), "games": {}, "props": {}}
+    for file, (sport, table) in RESULTS_FILES.items():
+        day_tallies = [(date, json.loads(data)) for date, data in conn.execute(
+            "SELECT date, data FROM day_rollups WHERE file = ? AND date != '' ORDER BY date, dup",
+            (file,))]
+        day_tallies = [(d, t) for d, t in day_tallies if t]
+        if day_tallies:
+            doc["games" if table == "picks" else "props"][sport] = rollup_file(day_tallies)
+    return doc
+
+
+def write_compact(path, doc):
+    """Write compact JSON; leave the file alone when only `updated` would change."""
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                existing = json.load(f)
+        except (OSError, ValueError):
+            existing = None
+        if existing is not None:
+            doc = canonicalize(doc, existing)
+            if doc == existing:
+                return False
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, separators=(",", ":"))
+        f.write("\n")
+    return True
+
+
+def update_rollups(root=REPO_ROOT, db_path=DB_PATH, out=None, quiet=False):
+    """Bring the store and day partials up to date, then write the rollups file.
+
+    Returns True if the file changed.
+    """
+    t0 = time.time()
+    sync(root=root, db_path=db_path, quiet=True)
+    conn = connect(db_path)
+    try:
+        with conn:
+            changed = refresh_partials(conn)
+        doc = build_rollups(conn)
+    finally:
+        conn.close()
+    path = out or os.path.join(root, OUTPUT_FILE)
+    written = write_compact(path, doc)
+    if not quiet:
+        print(f"  Rollups: {changed} day(s) re-tallied → {os.path.basename(path)} "
+              f"{'written' if written else 'unchanged'} ({os.path.getsize(path) / 1024:.1f} KB) "
+              f"[{time.time() - t0:.2f}s]")
+    return written
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Precompute dashboard analytics rollups")
+    ap.add_argument("--out", help="write here instead of the repo file")
+    args = ap.parse_args(argv)
+    update_rollups(out=args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""archive_store.py — Content-addressed, delta-compressed store for archive snapshots.
+
+Each archive/projections_<id>.json bundles full copies of every projection,
+props, recommendation and results file, and most of it repeats from one day
+to the next. The store keeps each top-level section of a snapshot as one
+gzip blob named by the SHA-1 of the section's JSON:
+
+  archive/store/index.json                {"format": 1, "snapshots": {id: {"keys", "scalars", "sections"}}}
+  archive/store/blobs/ab/ab12....json.gz  {"v": 1, "parent": id | null, "depth": n, "data": ...}
+
+Identical sections (an unchanged recommendations file, yesterday's results)
+are the same blob. Other sections are delta-encoded against the same
+section of the previous snapshot: record lists (games, props, days, picks)
+go record by record — an unchanged record is its index in the parent list,
+a changed one a field patch, a new one in full — and plain dicts recurse.
+Every MAX_CHAIN deltas (or when a delta isn't worth it) a full blob is
+written instead, so reading any day decodes a bounded chain.
+
+The newest --keep-recent days also stay as plain JSON for the dashboard's
+direct fetch; older ones are read through the store (here via
+load_snapshot, in the browser via js/archive-store.js).
+
+Usage:
+    python scripts/archive_store.py pack [--keep-recent 14]     # ingest new snapshots, prune old JSON
+    python scripts/archive_store.py get 2026-03-01 [--out PATH]
+    python scripts/archive_store.py stats
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+from json_canonical import record_key
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVE_DIR = os.path.join(REPO_ROOT, "archive")
+MAX_CHAIN = 14
+DELTA_MAX_RATIO = 0.8  # keep a delta only if it is at most this share of the full section
+KEEP_RECENT = 14
+INLINE_MAX = 1024  # smaller top-level values (summary, ...) live in the index itself
+SNAPSHOT_RE = re.compile(r"^projections_(\d{4}-\d{2}-\d{2}.*)\.json$")
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def content_id(obj):
+    return hashlib.sha1(_dumps(obj).encode("utf-8")).hexdigest()
+
+
+def _is_record_list(v):
+    return isinstance(v, list) and bool(v) and all(isinstance(x, dict) for x in v)
+
+
+# ── Delta encoding ───────────────────────────────────────────────
+
+
+def _patch(new, old):
+    """Field patch turning record `old` into `new`, or None if a patch can't keep key order."""
+    patch = {"~": {k: v for k, v in new.items() if k not in old or _dumps(old[k]) != _dumps(v)}}
+    removed = [k for k in old if k not in new]
+    if removed:
+        patch["-"] = removed
+    if _dumps(_apply(old, patch)) != _dumps(new):
+        return None
+    return patch
+
+
+def _apply(old, patch):
+    rec = {k: v for k, v in old.items() if k not in patch.get("-", ())}
+    rec.update(patch["~"])
+    return rec
+
+
+def _encode_records(new, old):
+    by_content, by_key = {}, {}
+    for i, rec in enumerate(old):
+        by_content.setdefault(_dumps(rec), i)
+        by_key.setdefault(record_key(rec), i)
+    items = []
+    for rec in new:
+        i = by_content.get(_dumps(rec))
+        if i is not None:
+            items.append(i)
+            continue
+        i = by_key.get(record_key(rec))
+        patch = _patch(rec, old[i]) if i is not None else None
+        if patch is not None and len(_dumps(patch)) < len(_dumps(rec)):
+            items.append({"@": i, **patch})
+        else:
+            items.append({"+": rec})
+    return items
+
+
+def encode(new, old):
+    """Delta-encode a section value against the parent's value at the same place."""
+    if old is not None and _dumps(new) == _dumps(old):
+        return {"P": 1}
+    if _is_record_list(new) and _is_record_list(old):
+        return {"L": _encode_records(new, old)}
+    if isinstance(new, dict) and isinstance(old, dict):
+        return {"D": {k: encode(v, old.get(k)) for k, v in new.items()}}
+    return {"=": new}
+
+
+def decode(enc, old):
+    if "P" in enc:
+        return old
+    if "L" in enc:
+        out = []
+        for item in enc["L"]:
+            if isinstance(item, int):
+                out.append(old[item])
+            elif "+" in item:
+                out.append(item["+"])
+            else:
+                out.append(_apply(old[item["@"]], item))
+        return out
+    if "D" in enc:
+        base = old if isinstance(old, dict) else {}
+        return {k: decode(v, base.get(k)) for k, v in enc["D"].items()}
+    return enc["="]
+
+
+# ── Store ────────────────────────────────────────────────────────
+
+
+class ArchiveStore:
+    """Blob store + date index under archive/store/."""
+
+    def __init__(self, archive_dir=ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+        self.root = os.path.join(archive_dir, "store")
+        self.index_path = os.path.join(self.root, "index.json")
+        self.index = {"format": 1, "snapshots": {}}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+        self._blobs = {}
+        self._sections = {}
+
+    @property
+    def snapshots(self):
+        return self.index["snapshots"]
+
+    def _blob_path(self, cid):
+        return os.path.join(self.root, "blobs", cid[:2], f"{cid}.json.gz")
+
+    def _read_blob(self, cid):
+        if cid not in self._blobs:
+            with open(self._blob_path(cid), "rb") as f:
+                self._blobs[cid] = json.loads(gzip.decompress(f.read()))
+        return self._blobs[cid]
+
+    def _write_blob(self, cid, blob):
+        path = self._blob_path(cid)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # mtime=0: identical content gives identical bytes (no git churn)
+        data = gzip.compress(_dumps(blob).encode("utf-8"), compresslevel=9, mtime=0)
+        with open(path, "wb") as f:
+            f.write(data)
+        self._blobs[cid] = blob
+
+    def section(self, cid):
+        """Reconstruct one section blob (parents decoded once and cached)."""
+        if cid not in self._sections:
+            blob = self._read_blob(cid)
+            parent = blob.get("parent")
+            data = blob["data"]
+            self._sections[cid] = decode(data, self.section(parent)) if parent else data
+        return self._sections[cid]
+
+    def put_section(self, value, parent_cid=None):
+        cid = content_id(value)
+        if os.path.exists(self._blob_path(cid)):
+            return cid
+        blob = {"v": 1, "parent": None, "depth": 0, "data": value}
+        if parent_cid:
+            depth = self._read_blob(parent_cid).get("depth", 0) + 1
+            if depth <= MAX_CHAIN:
+                enc = encode(value, self.section(parent_cid))
+                if len(_dumps(enc)) <= DELTA_MAX_RATIO * len(_dumps(value)):
+                    delta = {"v": 1, "parent": parent_cid, "depth": depth, "data": enc}
+                    if content_id(decode(enc, self.section(parent_cid))) == cid:
+                        blob = delta
+        self._write_blob(cid, blob)
+        self._sections[cid] = value
+        return cid
+
+    def _parent_section(self, snap_id, key):
+        earlier = [s for s in sorted(self.snapshots) if s < snap_id]
+        for s in reversed(earlier):
+            cid = self.snapshots[s]["sections"].get(key)
+            if cid:
+                return cid
+        return None
+
+    def put_snapshot(self, snap_id, doc):
+        """Store a snapshot dict; returns its index entry."""
+        entry = {"keys": list(doc), "scalars": {}, "sections": {}}
+        for key, value in doc.items():
+            if isinstance(value, (dict, list)) and len(_dumps(value)) > INLINE_MAX:
+                entry["sections"][key] = self.put_section(value, self._parent_section(snap_id, key))
+            else:
+                entry["scalars"][key] = value
+        self.snapshots[snap_id] = entry
+        return entry
+
+    def get_snapshot(self, snap_id):
+        entry = self.snapshots.get(snap_id)
+        if entry is None:
+            return None
+        doc = {}
+        for key in entry["keys"]:
+            doc[key] = (self.section(entry["sections"][key]) if key in entry["sections"]
+                        else entry["scalars"][key])
+        return json.loads(_dumps(doc))  # detach from the shared section cache
+
+    def save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        self.index["snapshots"] = dict(sorted(self.snapshots.items()))
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=1)
+            f.write("\n")
+
+
+def load_snapshot(snap_id, archive_dir=ARCHIVE_DIR):
+    """Reader API: a day's snapshot from plain JSON if still present, else from the store."""
+    path = os.path.join(archive_dir, f"projections_{snap_id}.json")
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return ArchiveStore(archive_dir).get_snapshot(snap_id)
+
+
+def pack(archive_dir=ARCHIVE_DIR, keep_recent=KEEP_RECENT):
+    """Ingest snapshot files missing from the store; drop plain JSON more than
+    keep_recent days older than the newest snapshot."""
+    store = ArchiveStore(archive_dir)
+    files = sorted((m.group(1), name) for name in os.listdir(archive_dir)
+                   for m in [SNAPSHOT_RE.match(name)] if m)
+    added = 0
+    for snap_id, name in files:
+        path = os.path.join(archive_dir, name)
+        with open(path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        if snap_id in store.snapshots and _dumps(store.get_snapshot(snap_id)) == _dumps(doc):
+            continue
+        store.put_snapshot(snap_id, doc)
+        added += 1
+    store.save_index()
+
+    pruned = 0
+    if keep_recent is not None and files:
+        newest = datetime.strptime(files[-1][0][:10], "%Y-%m-%d")
+        cutoff = (newest - timedelta(days=keep_recent)).strftime("%Y-%m-%d")
+        verify = ArchiveStore(archive_dir)  # fresh instance: read back from disk
+        for snap_id, name in files:
+            if snap_id[:10] >= cutoff:
+                continue
+            path = os.path.join(archive_dir, name)
+            with open(path, "r", encoding="utf-8") as f:
+                doc = json.load(f)
+            if _dumps(verify.get_snapshot(snap_id)) != _dumps(doc):
+                print(f"  Archive: {name} does not round-trip — keeping it")
+                continue
+            os.remove(path)
+            pruned += 1
+    return added, pruned
+
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(path) for f in fs)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Content-addressed archive snapshot store")
+    sub = ap.add_subparsers(dest="cmd")
+    p = sub.add_parser("pack", help="ingest new archive/projections_*.json, prune old ones")
+    p.add_argument("--keep-recent", type=int, default=KEEP_RECENT,
+                   help="days of plain JSON (before the newest) kept for direct fetches")
+    g = sub.add_parser("get", help="reconstruct one snapshot")
+    g.add_argument("id")
+    g.add_argument("--out")
+    sub.add_parser("stats", help="store size and snapshot count")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "pack":
+        added, pruned = pack(keep_recent=args.keep_recent)
+        print(f"  Archive: {added} snapshot(s) stored, {pruned} plain file(s) pruned")
+    elif args.cmd == "get":
+        doc = load_snapshot(args.id)
+        if doc is None:
+            print(f"  Archive: no snapshot {args.id}")
+            return 1
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(doc, f, indent=2)
+        else:
+            json.dump(doc, sys.stdout, indent=2)
+            print()
+    elif args.cmd == "stats":
+        store = ArchiveStore()
+        blobs = os.path.join(store.root, "blobs")
+        n = sum(len(fs) for _, _, fs in os.walk(blobs)) if os.path.isdir(blobs) else 0
+        print(f"  {len(store.snapshots)} snapshot(s), {n} blob(s), "
+              f"store {_dir_size(store.root) / 1e6:.2f} MB, archive total {_dir_size(ARCHIVE_DIR) / 1e6:.2f} MB")
+    else:
+        ap.print_help()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
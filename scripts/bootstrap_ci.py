@@ -0,0 +1,135 @@
+"""bootstrap_ci.py — Bootstrap intervals for win rate and ROI in the results aggregates.
+
+`_sum_cat` reports ROI as a point estimate; on a 20-pick best-bets sample
+that is mostly noise. These helpers add, next to each aggregate, a
+percentile-bootstrap interval and rolling 7/30-day windows:
+
+  "ci":      {"level": 90, "pct": [lo, hi], "roi": [lo, hi]}
+  "rolling": {"7d": {"wins", "losses", "pct", "roi", "ci"}, "30d": {...}}
+
+Each graded pick is a profit per unit risked: -1 for a loss, the payout of
+its `odds` for a win (flat -110 when it has none), pushes left out — the
+same denominator as the ROI on the dashboards. Picks with equal profit are
+interchangeable, so a bootstrap resample is a multinomial draw over the
+distinct profit values: every resample of a category comes out of one
+`rng.multinomial(..., size=N_BOOT)` call, O(N_BOOT x distinct prices)
+regardless of sample size. The generator is seeded, so unchanged inputs
+give unchanged intervals (no churn in the committed JSON).
+
+Stdlib + NumPy; shared by check_and_grade and merge_json.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+LEVEL = 90
+N_BOOT = int(os.environ.get("GRADE_BOOTSTRAP_N", "4000"))
+SEED = 110
+WINDOWS = (7, 30)
+FLAT_PAYOUT = 100 / 110
+
+# results.json / <sport>_results.json allTime category → its day picks
+GAME_CATEGORIES = {
+    "spreads": lambda p: p.get("type") == "spread",
+    "totals": lambda p: p.get("type") == "total",
+    "moneylines": lambda p: p.get("type") == "ml",
+    "best_bets": lambda p: p.get("best_bet") and p.get("type") in ("spread", "total", "ml"),
+    "props": lambda p: p.get("type") == "prop",
+}
+
+
+def payout(odds):
+    """Profit per unit risked on a win at American `odds` (flat -110 if unknown)."""
+    try:
+        odds = float(odds)
+    except (TypeError, ValueError):
+        return FLAT_PAYOUT
+    if odds >= 100:
+        return odds / 100
+    if odds <= -100:
+        return 100 / -odds
+    return FLAT_PAYOUT
+
+
+def pick_profit(p):
+    """Profit of one graded pick, or None for pushes and ungraded picks."""
+    hit = p.get("hit")
+    if hit is None and p.get("result") in ("WIN", "LOSS"):
+        hit = p["result"] == "WIN"
+    if hit is None:
+        return None
+    return payout(p.get("odds")) if hit else -1.0
+
+
+def interval(profits, n_boot=N_BOOT, level=LEVEL):
+    """{"level", "pct": [lo, hi], "roi": [lo, hi]} for a list of pick profits (None if empty)."""
+    n = len(profits)
+    if n == 0:
+        return None
+    values, counts = np.unique(np.asarray(profits, dtype=float), return_counts=True)
+    draws = np.random.default_rng(SEED).multinomial(n, counts / n, size=n_boot)
+    roi = draws @ values / n * 100
+    pct = draws[:, values > 0].sum(axis=1) / n * 100
+    q = [(100 - level) / 2, 100 - (100 - level) / 2]
+    return {"level": level,
+            "pct": [round(float(x), 1) for x in np.percentile(pct, q)],
+            "roi": [round(float(x), 1) for x in np.percentile(roi, q)]}
+
+
+def _window_stats(profits):
+    w = sum(1 for x in profits if x > 0)
+    t = len(profits)
+    return {"wins": w, "losses": t - w,
+            "pct": round(w / t * 100, 1) if t else 0,
+            "roi": round(sum(profits) / t * 100, 1) if t else 0,
+            "ci": interval(profits)}
+
+
+def intervals(dated_profits):
+    """CI over all [(date, profit)] plus rolling windows ending at the latest date."""
+    if not dated_profits:
+        return {}
+    out = {"ci": interval([x for _, x in dated_profits])}
+    end = datetime.strptime(max(d for d, _ in dated_profits), "%Y-%m-%d")
+    rolling = {}
+    for n in WINDOWS:
+        start = (end - timedelta(days=n - 1)).strftime("%Y-%m-%d")
+        rolling[f"{n}d"] = _window_stats([x for d, x in dated_profits if d >= start])
+    out["rolling"] = rolling
+    return out
+
+
+def _dated_profits(days, keep=None):
+    out = []
+    for d in days:
+        date = d.get("date")
+        if not date:
+            continue
+        for p in d.get("picks") or []:
+            if keep is None or keep(p):
+                x = pick_profit(p)
+                if x is not None:
+                    out.append((date, x))
+    return out
+
+
+def attach_game_intervals(all_time, days):
+    """Add ci/rolling to each allTime category of a game results file (in place)."""
+    for cat, keep in GAME_CATEGORIES.items():
+        if cat in all_time:
+            all_time[cat].update(intervals(_dated_profits(days, keep)))
+    return all_time
+
+
+def attach_prop_intervals(block, days):
+    """Add roi/ci/rolling to a props file's all_time / cumulative block (in place).
+
+    ROI here uses each prop's own odds where the pick carries them.
+    """
+    dated = _dated_profits(days)
+    if dated:
+        block["roi"] = round(sum(x for _, x in dated) / len(dated) * 100, 1)
+        block.update(intervals(dated))
+    return block
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""calibration.py — Brier score, log loss and reliability bins per sport and market.
+
+W-L and flat ROI say nothing about whether a 70% pick wins 70% of the time.
+This scores every graded pick's stated probability against its outcome and
+writes calibration.json (compact, committed):
+
+  {"updated": ..., "games": {sport: {market: CAL}}, "props": {sport: {"props": CAL}}}
+
+  CAL = {"n", "brier", "log_loss", "mean_prob", "hit_rate",
+         "bins": [{"lo", "hi", "n", "mean_prob", "hit_rate"}, ...],   (non-empty only)
+         "recent": {"30d": {"n", "brier", "log_loss", "mean_prob", "hit_rate"}}}
+
+The probability of a pick is, in order of preference: the model win
+probability of the picked side (ML picks carrying home_win_prob /
+away_win_prob), the prop's model_probability, else its confidence — all
+three are percentages (0-100) in every projection and results file. Pushes
+and ungraded picks are left out. Comparing "recent" with the all-time
+numbers shows drift.
+
+Like the rollups, the sums behind every metric are additive, so they are
+kept per graded day in the results store (day_calibration, keyed by the
+day's content hash and CALIBRATION_VERSION) and only changed days are re-scored. Scoring is one
+vectorized pass over the selected rows; --backfill re-scores all history
+in a single pass.
+
+Usage:
+    python scripts/calibration.py [--backfill] [--out PATH]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from analytics_rollups import write_compact
+from results_store import DB_PATH, REPO_ROOT, RESULTS_FILES, connect, sync
+
+OUTPUT_FILE = "calibration.json"
+BINS = 10
+RECENT_DAYS = 30
+EPS = 1e-4
+GAME_MARKETS = ("spread", "total", "ml")
+CALIBRATION_VERSION = 2  # bump when per-day scoring changes, so every cached day is re-scored
+
+CALIBRATION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS day_calibration (
+    file TEXT NOT NULL, date TEXT NOT NULL, dup INTEGER NOT NULL DEFAULT 0,
+    hash TEXT NOT NULL, data TEXT NOT NULL,
+    PRIMARY KEY (file, date, dup)
+);
+"""
+
+
+def _pick_prob(market, pick, home, conf, raw):
+    """Stated probability (0-1) that a graded pick wins, or None. The win
+    probabilities, model_probability and confidence are all stored as percents."""
+    prob = None
+    if market == "ml" and "win_prob" in raw:
+        p = json.loads(raw)
+        same, other = ("home_win_prob", "away_win_prob") if pick == home else ("away_win_prob", "home_win_prob")
+        if p.get(same) is not None:
+            prob = p[same]
+        elif p.get(other) is not None:
+            prob = 100 - p[other]
+    elif market == "props" and "model_probability" in raw:
+        prob = json.loads(raw).get("model_probability")
+    if prob is None:
+        prob = conf
+    if prob is None:
+        return None
+    return float(prob) / 100
+
+
+def _select(conn, file, table, days):
+    """Yield (day_key, market, prob, outcome) for `days` [(date, dup)], or all days if None."""
+    if table == "picks":
+        sql = ("SELECT date, dup, type, pick, home, confidence, raw, hit FROM picks "
+               f"WHERE file = ? AND type IN ({', '.join('?' * len(GAME_MARKETS))}) AND hit IS NOT NULL")
+        args = (file, *GAME_MARKETS)
+    else:
+        sql = ("SELECT date, dup, 'props', NULL, NULL, confidence, raw, result = 'WIN' FROM prop_results "
+               "WHERE file = ? AND result IN ('WIN', 'LOSS')")
+        args = (file,)
+    chunks = [conn.execute(sql, args)] if days is None else (
+        conn.execute(sql + " AND date = ? AND dup = ?", args + day) for day in days)
+    for rows in chunks:
+        for date, dup, market, pick, home, conf, raw, hit in rows:
+            prob = _pick_prob(market, pick, home, conf, raw)
+            if prob is not None:
+                yield (date, dup), market, prob, int(hit)
+
+
+def score(rows):
+    """Vectorized sufficient statistics per (day_key, market) group.
+
+    Returns {day_key: {market: {"n", "brier", "log_loss", "p", "y", "bins": [[n, p, y] * BINS]}}}
+    — all sums, so days and windows combine by addition.
+    """
+    groups = {}
+    gid, probs, hits = [], [], []
+    for key, market, prob, hit in rows:
+        gid.append(groups.setdefault((key, market), len(groups)))
+        probs.append(prob)
+        hits.append(hit)
+    if not groups:
+        return {}
+
+    g = np.asarray(gid)
+    p = np.clip(np.asarray(probs, dtype=float), EPS, 1 - EPS)
+    y = np.asarray(hits, dtype=float)
+    size = len(groups)
+    n = np.bincount(g, minlength=size)
+    brier = np.bincount(g, (p - y) ** 2, size)
+    logloss = np.bincount(g, -(y * np.log(p) + (1 - y) * np.log1p(-p)), size)
+    sum_p = np.bincount(g, p, size)
+    sum_y = np.bincount(g, y, size)
+    cell = g * BINS + np.minimum((p * BINS).astype(int), BINS - 1)
+    bin_n = np.bincount(cell, minlength=size * BINS).reshape(size, BINS)
+    bin_p = np.bincount(cell, p, size * BINS).reshape(size, BINS)
+    bin_y = np.bincount(cell, y, size * BINS).reshape(size, BINS)
+
+    out = {}
+    for (key, market), i in groups.items():
+        out.setdefault(key, {})[market] = {
+            "n": int(n[i]), "brier": float(brier[i]), "log_loss": float(logloss[i]),
+            "p": float(sum_p[i]), "y": float(sum_y[i]),
+            "bins": [[int(bin_n[i, b]), float(bin_p[i, b]), float(bin_y[i, b])] for b in range(BINS)],
+        }
+    return out
+
+
+def refresh_partials(conn, backfill=False):
+    """Re-score days whose content hash changed (all days with `backfill`)."""
+    conn.executescript(CALIBRATION_SCHEMA)
+    if backfill:
+        conn.execute("DELETE FROM day_calibration")
+    changed = 0
+    for file, (_, table) in RESULTS_FILES.items():
+        stored = {(d, u): h for d, u, h in conn.execute(
+            "SELECT date, dup, hash FROM day_calibration WHERE file = ?", (file,))}
+        current = {(d, u): f"{h}/v{CALIBRATION_VERSION}" for d, u, h in conn.execute(
+            "SELECT date, dup, hash FROM days WHERE file = ?", (file,))}
+        stale = [k for k, h in current.items() if stored.get(k) != h]
+        for date, dup in set(stored) - set(current):
+            conn.execute("DELETE FROM day_calibration WHERE file = ? AND date = ? AND dup = ?",
+                         (file, date, dup))
+        if not stale:
+            continue
+        # Backfill (or a fresh store) reads the whole file in one query
+        sums = score(_select(conn, file, table, None if len(stale) == len(current) else stale))
+        conn.executemany(
+            "INSERT OR REPLACE INTO day_calibration (file, date, dup, hash, data) VALUES (?, ?, ?, ?, ?)",
+            [(file, date, dup, current[(date, dup)],
+              json.dumps(sums.get((date, dup), {}), separators=(",", ":"))) for date, dup in stale])
+        changed += len(stale)
+    return changed
+
+
+# ── Report ───────────────────────────────────────────────────────
+
+
+def _add(into, part):
+    for k in ("n", "brier", "log_loss", "p", "y"):
+        into[k] = into.get(k, 0) + part[k]
+    bins = into.setdefault("bins", [[0, 0.0, 0.0] for _ in range(BINS)])
+    for b, (bn, bp, by) in zip(bins, part["bins"]):
+        b[0] += bn
+        b[1] += bp
+        b[2] += by
+
+
+def _summary(s):
+    n = s.get("n", 0)
+    if not n:
+        return {"n": 0}
+    return {"n": n, "brier": round(s["brier"] / n, 4), "log_loss": round(s["log_loss"] / n, 4),
+            "mean_prob": round(s["p"] / n * 100, 1), "hit_rate": round(s["y"] / n * 100, 1)}
+
+
+def build_report(conn):
+    doc = {"updated": datetime.now().isoformat(timespec="seconds"), "games": {}, "props": {}}
+    for file, (sport, table) in RESULTS_FILES.items():
+        days = [(date, json.loads(data)) for date, data in conn.execute(
+            "SELECT date, data FROM day_calibration WHERE file = ? AND date != '' ORDER BY date, dup",
+            (file,))]
+        if not days:
+            continue
+        start = (datetime.strptime(days[-1][0], "%Y-%m-%d")
+                 - timedelta(days=RECENT_DAYS - 1)).strftime("%Y-%m-%d")
+        total, recent = {}, {}
+        for date, markets in days:
+            for market, part in markets.items():
+                _add(total.setdefault(market, {}), part)
+                if date >= start:
+                    _add(recent.setdefault(market, {}), part)
+        section = {}
+        for market in sorted(total):
+            s = total[market]
+            cal = _summary(s)
+            cal["bins"] = [{"lo": b / BINS, "hi": (b + 1) / BINS, "n": bn,
+                            "mean_prob": round(bp / bn * 100, 1), "hit_rate": round(by / bn * 100, 1)}
+                           for b, (bn, bp, by) in enumerate(s["bins"]) if bn]
+            cal["recent"] = {f"{RECENT_DAYS}d": _summary(recent.get(market, {}))}
+            section[market] = cal
+        if section:
+            doc["games" if table == "picks" else "props"][sport] = section
+    return doc
+
+
+def update_calibration(root=REPO_ROOT, db_path=DB_PATH, out=None, backfill=False, quiet=False):
+    """Re-score changed days and write calibration.json. Returns True if the file changed."""
+    t0 = time.time()
+    sync(root=root, db_path=db_path, quiet=True)
+    conn = connect(db_path)
+    try:
+        with conn:
+            changed = refresh_partials(conn, backfill)
+        doc = build_report(conn)
+    finally:
+        conn.close()
+    path = out or os.path.join(root, OUTPUT_FILE)
+    written = write_compact(path, doc)
+    if not quiet:
+        print(f"  Calibration: {changed} day(s) re-scored → {os.path.basename(path)} "
+              f"{'written' if written else 'unchanged'} [{time.time() - t0:.2f}s]")
+    return written
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Probabilistic scoring / calibration report")
+    ap.add_argument("--backfill", action="store_true", help="re-score all history in one pass")
+    ap.add_argument("--out", help="write here instead of the repo file")
+    args = ap.parse_args(argv)
+    update_calibration(out=args.out, backfill=args.backfill)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
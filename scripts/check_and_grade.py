@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 """check_and_grade.py — Fetch scores via ESPN (free) and grade all 3 sports.
 
-Self-contained script (no cross-repo imports) designed to run in GitHub Actions
-every 15 minutes during game windows. Uses ESPN scoreboards exclusively —
-zero Odds API calls, saving the entire quota for odds fetching.
+Designed to run in GitHub Actions every 15 minutes during game windows (no
+cross-repo imports). Uses ESPN scoreboards exclusively — zero Odds API calls,
+saving the entire quota for odds fetching.
+
+Requires requests and NumPy (requirements.txt): bootstrap intervals, calibration,
+live probabilities and the history index are vectorized. orjson is optional
+(json_codec.py falls back to the stdlib).
 
 ESPN endpoints (free, unlimited, near real-time):
   NBA:   https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard
@@ -11,73 +15,85 @@ ESPN endpoints (free, unlimited, near real-time):
   NCAAB: https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard
 
 Usage:
-    python scripts/check_and_grade.py
+    python scripts/check_and_grade.py [--profile [DIR]]
 """
 
-import json
+import argparse
 import os
 import sys
 import time
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from grade_journal import prop_key, record_game_finals, record_prop_results, record_score_picks  # noqa: E402
+import grade_latency  # noqa: E402
+import grade_metrics  # noqa: E402
+import json_codec  # noqa: E402
+from grade_io import _make_stat, _sum_cat, _tally, load_json, save_json, tag_best_bets  # noqa: E402
+import live_prob  # noqa: E402
+from results_store import RESULTS_FILES, sync as sync_results_store  # noqa: E402
+from bootstrap_ci import attach_game_intervals, attach_prop_intervals  # noqa: E402
+from analytics_rollups import OUTPUT_FILE as ROLLUPS_FILE, update_rollups  # noqa: E402
+from calibration import OUTPUT_FILE as CALIBRATION_FILE, update_calibration  # noqa: E402
+from stage_dag import PipelineHalt, format_timing, run_stages, stage  # noqa: E402
+from profiling import PhaseProfiler  # noqa: E402
+from sports import SPORTS, ending_soon, scoreboard_dates  # noqa: E402
 
 # ── Configuration ────────────────────────────────────────────────
 
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-ESPN_ENDPOINTS = {
-    "NBA": "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard",
-    "NHL": "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/scoreboard",
-    "NCAAB": "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard",
-    "MLB": "https://site.api.espn.com/apis/site/v2/sports/baseball/mlb/scoreboard",
-}
+# Per-stage input fingerprints for the DAG executor (local, not committed)
+DAG_STATE_PATH = os.path.join(REPO_ROOT, ".grade_cache", "dag_state.json")
+
+# League tables come from the sport registry (sports.py)
+ESPN_ENDPOINTS = {label: spec["scoreboard_url"] for label, spec in SPORTS.items()}
 
-ESPN_NHL_SUMMARY = "https://site.api.espn.com/apis/site/v2/sports/hockey/nhl/summary"
-ESPN_NBA_SUMMARY = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/summary"
+ESPN_NHL_SUMMARY = SPORTS["NHL"]["summary_url"]
+ESPN_NBA_SUMMARY = SPORTS["NBA"]["summary_url"]
 
 # ESPN sometimes uses non-standard abbreviations — map to our projection format
 # Sport-specific because some abbreviations conflict (WSH = WAS in NBA, WSH in NHL)
-ESPN_ABBR_FIX_NBA = {
-    "GS": "GSW", "SA": "SAS", "NY": "NYK", "NO": "NOP",
-    "UTAH": "UTA", "WSH": "WAS",
-}
-ESPN_ABBR_FIX_NHL = {
-    "TB": "TBL", "SJ": "SJS", "LA": "LAK", "NJ": "NJD",
-    "MON": "MTL", "CLB": "CBJ", "NASH": "NSH",
-}
-ESPN_ABBR_FIX_BY_SPORT = {
-    "NBA": ESPN_ABBR_FIX_NBA,
-    "NHL": ESPN_ABBR_FIX_NHL,
-    "NCAAB": {},
-    "MLB": {},
-}
+ESPN_ABBR_FIX_BY_SPORT = {label: spec["abbr_fix"] for label, spec in SPORTS.items()}
 # Combined map for backwards compat with scoreboard grading (game-level)
-ESPN_ABBR_FIX = {**ESPN_ABBR_FIX_NBA, **ESPN_ABBR_FIX_NHL}
+ESPN_ABBR_FIX = {k: v for fix in ESPN_ABBR_FIX_BY_SPORT.values() for k, v in fix.items()}
 
 
 # ── ESPN Score Fetching ──────────────────────────────────────────
 
 
+def _espn_get(url, endpoint, **kwargs):
+    """requests.get, counted and timed under `endpoint` in grade_metrics."""
+    t0 = time.perf_counter()
+    status = "error"
+    try:
+        resp = requests.get(url, **kwargs)
+        status = str(resp.status_code)
+        return resp
+    finally:
+        grade_metrics.ESPN_LATENCY.observe(time.perf_counter() - t0, endpoint=endpoint)
+        grade_metrics.ESPN_REQUESTS.inc(endpoint=endpoint, status=status)
+
+
 def fetch_espn_scores(sport, date_str=None):
     """Fetch scores from ESPN scoreboard for any sport.
 
     Args:
-        sport: "NBA", "NHL", or "NCAAB"
+        sport: a label registered in sports.py ("NBA", "NHL", "NCAAB", ...)
         date_str: Optional date in 'YYYY-MM-DD' format (defaults to today)
 
     Returns dict: {"AWAY@HOME": {away_score, home_score, completed}}
     """
     url = ESPN_ENDPOINTS[sport]
-    params = {}
+    params = dict(SPORTS[sport]["scoreboard_params"])
     if date_str:
         params["dates"] = date_str.replace("-", "")
-    if sport == "NCAAB":
-        params["limit"] = 300
-        params["groups"] = 50
 
     try:
-        resp = requests.get(url, params=params, timeout=30)
+        resp = _espn_get(url, f"scoreboard:{sport}", params=params, timeout=30)
         resp.raise_for_status()
         data = resp.json()
 
@@ -157,7 +173,7 @@ def _parse_clock_seconds(clock_str):
 def _games_ending_soon(score_map):
     """Check if any in-progress game across all sports is near ending.
 
-    Thresholds:
+    Thresholds are each sport's fast-poll profile in sports.py, e.g.
       NBA:   period >= 4, clock < 3:00
       NHL:   period >= 3, clock < 5:00 (or OT period > 3)
       NCAAB: period >= 2, clock < 3:00
@@ -169,16 +185,7 @@ def _games_ending_soon(score_map):
         for key, sc in scores.items():
             if not sc.get("in_progress"):
                 continue
-            period = sc.get("period", 0)
-            clock_secs = _parse_clock_seconds(sc.get("clock", ""))
-
-            if sport == "NBA" and period >= 4 and clock_secs < 180:
-                return True
-            elif sport == "NHL" and ((period >= 3 and clock_secs < 300) or period > 3):
-                return True
-            elif sport == "NCAAB" and period >= 2 and clock_secs < 180:
-                return True
-            elif sport == "MLB" and period >= 9:
+            if ending_soon(sport, sc.get("period", 0), _parse_clock_seconds(sc.get("clock", ""))):
                 return True
     return False
 
@@ -195,8 +202,7 @@ def has_ungraded_games(proj_path):
         return False, 0, 0
 
     try:
-        with open(proj_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = json_codec.load(proj_path)
         games = data.get("games", [])
         if not games:
             return False, 0, 0
@@ -285,79 +291,33 @@ def _hit_from_result(r):
     return None  # P or None
 
 
-def _tally(picks_list):
-    w = sum(1 for p in picks_list if p.get("hit") is True)
-    l = sum(1 for p in picks_list if p.get("hit") is False)
-    ps = sum(1 for p in picks_list if p.get("hit") is None)
-    return w, l, ps
-
-
-def _make_stat(w, l, ps=0):
-    t = w + l
-    pct_val = round(w / t * 100, 1) if t > 0 else 0
-    record = f"{w}-{l}-{ps}" if ps else f"{w}-{l}"
-    return {"wins": w, "losses": l, "pushes": ps, "record": record, "pct": pct_val}
-
-
-def _sum_cat(days_list, cat):
-    """Sum a category across all days and compute allTime stats with ROI."""
-    w = sum(d.get(cat, {}).get("wins", 0) for d in days_list)
-    l = sum(d.get(cat, {}).get("losses", 0) for d in days_list)
-    p = sum(d.get(cat, {}).get("pushes", 0) for d in days_list)
-    t = w + l
-    pct_val = round(w / t * 100, 1) if t > 0 else 0
-    profit = w * 90.91 - l * 100
-    roi = round(profit / (t * 100) * 100, 1) if t > 0 else 0
-    return {"wins": w, "losses": l, "pushes": p, "pct": pct_val, "roi": roi}
+def _prop_pricing(p):
+    """Model probability and price of a prop, for results picks (calibration, ROI)."""
+    out = {}
+    if p.get("model_probability") is not None:
+        out["model_probability"] = p["model_probability"]
+    odds = p.get("odds", p.get("market_odds"))
+    if odds is not None:
+        out["odds"] = odds
+    return out
 
 
 # ── Core Grading Pipeline ───────────────────────────────────────
 
 
-def load_json(path):
-    if not os.path.exists(path):
-        return None
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, ValueError) as e:
-        print(f"  Warning: invalid JSON in {path}: {e}")
-        return None
+def load_live_scores(live_path, game_date):
+    """Read a live-score sidecar: {"AWAY@HOME": {away_score, home_score, period, clock}}.
 
-
-def _sanitize_nans(obj):
-    """Recursively replace float NaN/Inf with None for JSON safety."""
-    if isinstance(obj, float):
-        if obj != obj or obj == float('inf') or obj == float('-inf'):
-            return None
-        return obj
-    if isinstance(obj, dict):
-        return {k: _sanitize_nans(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [_sanitize_nans(v) for v in obj]
-    return obj
-
-
-def save_json(path, data):
-    # Safety guard: never reduce game count in projection files
-    if "games" in data and os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                existing = json.load(f)
-            old_count = len(existing.get("games", []))
-            new_count = len(data.get("games", []))
-            if new_count < old_count:
-                print(f"  WARNING: Refusing to save {os.path.basename(path)} — "
-                      f"would reduce games from {old_count} to {new_count}")
-                return False
-        except Exception:
-            pass  # can't read existing file, proceed with save
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(_sanitize_nans(data), f, indent=2)
-    return True
+    Returns {} when missing or written for a different date.
+    """
+    data = load_json(live_path)
+    if not data or data.get("date") != game_date:
+        return {}
+    return data.get("live", {})
 
 
-def grade_sport(sport_label, proj_filename, results_filename, scores, is_nba=False):
+def grade_sport(sport_label, proj_filename, results_filename, scores, results_schema="games",
+                live_filename=None):
     """Grade a single sport's projections against scores.
 
     Args:
@@ -365,12 +325,19 @@ def grade_sport(sport_label, proj_filename, results_filename, scores, is_nba=Fal
         proj_filename: Projection JSON filename in repo root
         results_filename: Results JSON filename in repo root
         scores: Dict of {"AWAY@HOME": {away_score, home_score, completed}}
-        is_nba: If True, use NBA-specific results merge (preserve props)
+        results_schema: Key into RESULTS_WRITERS ("nba" keeps the prop picks
+            that share results.json days)
+        live_filename: Optional live-score sidecar JSON. When given, in-progress
+            scores/period/clock (and live pick probabilities, see live_prob.py)
+            go only to the sidecar; the projection file is rewritten when a
+            game starts (status "live", no scores) or goes final, the results
+            file only when a game goes final.
 
     Returns (changed: bool, summary: str)
     """
     proj_path = os.path.join(REPO_ROOT, proj_filename)
     results_path = os.path.join(REPO_ROOT, results_filename)
+    live_path = os.path.join(REPO_ROOT, live_filename) if live_filename else None
 
     proj_data = load_json(proj_path)
     if not proj_data or not proj_data.get("games"):
@@ -388,7 +355,13 @@ def grade_sport(sport_label, proj_filename, results_filename, scores, is_nba=Fal
     # so locked projections stay intact through grading.
     changed = False
     graded_games = []
+    newly_final = []
+    live_keys = []
     live_updates = 0
+    old_live = load_live_scores(live_path, game_date) if live_path else {}
+    live_games = {}
+    live_pairs = []
+    started = False
 
     for g in games:
         key = f"{g['away_team']}@{g['home_team']}"
@@ -419,6 +392,7 @@ def grade_sport(sport_label, proj_filename, results_filename, scores, is_nba=Fal
 
             matchup = f"{g['away_team']} {away_score} - {g['home_team']} {home_score}"
             graded_games.append(matchup)
+            newly_final.append(g)
             changed = True
 
         else:
@@ -426,6 +400,22 @@ def grade_sport(sport_label, proj_filename, results_filename, scores, is_nba=Fal
             # ESPN returns score=0 for scheduled games; skip those to avoid
             # prematurely marking games as "live" (None != 0 was triggering updates)
             if g.get("status") != "final" and (sc.get("in_progress") or away_score > 0 or home_score > 0):
+                live_keys.append(key)
+                if live_path:
+                    live_games[key] = {
+                        "away_score": away_score, "home_score": home_score,
+                        "period": sc.get("period", 0), "clock": sc.get("clock", ""),
+                    }
+                    live_pairs.append((g, live_games[key]))
+                    if g.get("status") != "live":
+                        # once per game, so pages that never read the sidecar
+                        # (dashboard-home.html) stop offering its picks
+                        g["status"] = "live"
+                        started = True
+                    prev = old_live.get(key, {})
+                    if prev.get("away_score") != away_score or prev.get("home_score") != home_score:
+                        live_updates += 1
+                    continue
                 old_away = g.get("away_score")
                 if old_away != away_score or g.get("home_score") != home_score:
                     g["away_score"] = away_score
@@ -434,19 +424,36 @@ def grade_sport(sport_label, proj_filename, results_filename, scores, is_nba=Fal
                     live_updates += 1
                     changed = True
 
-    if changed:
+    if changed or started:
         proj_data["updated"] = datetime.now().isoformat(timespec="seconds")
         save_json(proj_path, proj_data)
-
-        if is_nba:
-            update_nba_results(proj_data, results_path)
-        else:
-            update_results(sport_label, proj_data, results_path)
+    if changed:
+        RESULTS_WRITERS[results_schema](build_game_picks(games, game_date), game_date, results_path)
+
+    grade_latency.games_live(sport_label, game_date, live_keys)
+    if newly_final:
+        record_game_finals(sport_label, game_date, newly_final,
+                           build_game_picks(newly_final, game_date))
+        grade_latency.games_graded(sport_label, game_date, newly_final)
+
+    live_prob.attach(sport_label, live_pairs)
+    if live_path and live_games != old_live:
+        save_json(live_path, {
+            "sport": sport_label, "date": game_date,
+            "updated": datetime.now().isoformat(timespec="seconds"),
+            "live": live_games,
+        })
+        changed = True
 
     # Build summary
     final_count = sum(1 for g in games if g.get("status") == "final")
-    live_count = sum(1 for g in games if g.get("status") == "live")
-    sched_count = sum(1 for g in games if g.get("status") not in ("live", "final"))
+    if live_path:
+        live_count = len(live_games)
+    else:
+        live_count = sum(1 for g in games if g.get("status") == "live")
+    sched_count = len(games) - final_count - live_count
+    for status, n in (("final", final_count), ("live", live_count), ("scheduled", sched_count)):
+        grade_metrics.GAMES.set(n, sport=sport_label, status=status)
 
     parts = []
     if graded_games:
@@ -467,11 +474,8 @@ def grade_sport(sport_label, proj_filename, results_filename, scores, is_nba=Fal
     return changed, summary
 
 
-def update_results(sport_label, proj_data, results_path):
-    """Update results JSON for NHL/NCAAB (no props to preserve)."""
-    games = proj_data.get("games", [])
-    game_date = proj_data.get("date", datetime.now().strftime("%Y-%m-%d"))
-
+def build_game_picks(games, game_date):
+    """Build spread/total/ML pick entries for every final game (no best_bet tags)."""
     picks = []
     for g in games:
         if g.get("status") != "final" or g.get("away_score") is None:
@@ -518,13 +522,36 @@ def update_results(sport_label, proj_data, results_path):
                 pick_entry["away_win_prob"] = g["away_win_prob"]
             picks.append(pick_entry)
 
+    return picks
+
+
+def _score_only_picks(picks, old_picks):
+    """Catch-up score-only entries (catchup_grade_previous_day) to keep when a
+    day's game picks are replaced: those in `picks` or already in the day, one
+    per game, except games the new picks grade."""
+    graded = {p.get("game") for p in picks if p.get("type") != "score"}
+    kept = {}
+    for p in list(old_picks) + list(picks):
+        if p.get("type") == "score" and p.get("game") not in graded:
+            kept.setdefault(p.get("game"), p)
+    return list(kept.values())
+
+
+def write_game_picks(picks, game_date, results_path):
+    """Replace one day's game picks + stats in a results file and recompute allTime.
+
+    Score-only catch-up entries of the day are kept (see _score_only_picks).
+    """
     if not picks:
         return
 
-    # Tag top 5 by confidence as best bets
-    by_conf = sorted(picks, key=lambda p: p.get("confidence") or 0, reverse=True)
-    for p in by_conf[:5]:
-        p["best_bet"] = True
+    # Load or create results
+    results = load_json(results_path) or {"updated": "", "allTime": {}, "days": []}
+    old_day = next((d for d in results.get("days", []) if d.get("date") == game_date), {})
+    score_picks = _score_only_picks(picks, old_day.get("picks", []))
+    picks = [p for p in picks if p.get("type") != "score"]
+
+    tag_best_bets(picks)
 
     # Tally per category
     spread_picks = [p for p in picks if p["type"] == "spread"]
@@ -537,16 +564,13 @@ def update_results(sport_label, proj_data, results_path):
     mw, ml_l, mp = _tally(ml_picks)
     bw, bl, bp = _tally(bb_picks)
 
-    # Load or create results
-    results = load_json(results_path) or {"updated": "", "allTime": {}, "days": []}
-
     day_entry = {
         "date": game_date,
         "spreads": _make_stat(sw, sl, sp),
         "totals": _make_stat(tw, tl, tp),
         "moneylines": _make_stat(mw, ml_l, mp),
         "best_bets": _make_stat(bw, bl, bp),
-        "picks": picks,
+        "picks": picks + score_picks,
     }
 
     # Replace or append day
@@ -569,71 +593,18 @@ def update_results(sport_label, proj_data, results_path):
         "moneylines": _sum_cat(days, "moneylines"),
         "best_bets": _sum_cat(days, "best_bets"),
     }
+    attach_game_intervals(results["allTime"], days)
     results["updated"] = datetime.now().isoformat(timespec="seconds")
 
     save_json(results_path, results)
 
 
-def update_nba_results(proj_data, results_path):
-    """Update NBA results.json, preserving existing props data."""
-    games = proj_data.get("games", [])
-    game_date = proj_data.get("date", datetime.now().strftime("%Y-%m-%d"))
-
-    # Build game picks (spread/total/ML only — no props)
-    game_picks = []
-    for g in games:
-        if g.get("status") != "final" or g.get("away_score") is None:
-            continue
-
-        matchup = f"{g['away_team']} @ {g['home_team']}"
-        result_str = f"{g['away_score']}-{g['home_score']}"
-
-        proj_score = g.get("proj_score")
-
-        if g.get("spread_result") in ("W", "L", "P"):
-            pick_entry = {
-                "date": game_date, "type": "spread", "game": matchup,
-                "pick": g.get("spread_pick", ""), "result": result_str,
-                "hit": _hit_from_result(g["spread_result"]),
-                "confidence": g.get("spread_conf", 0),
-            }
-            if proj_score:
-                pick_entry["proj_score"] = proj_score
-            game_picks.append(pick_entry)
-        if g.get("total_result") in ("W", "L", "P"):
-            pick_label = f"{g.get('total_pick', '')} {g.get('total_line', '')}"
-            pick_entry = {
-                "date": game_date, "type": "total", "game": matchup,
-                "pick": pick_label, "result": result_str,
-                "hit": _hit_from_result(g["total_result"]),
-                "confidence": g.get("total_conf", 0),
-            }
-            if proj_score:
-                pick_entry["proj_score"] = proj_score
-            game_picks.append(pick_entry)
-        if g.get("ml_result") in ("W", "L"):
-            pick_entry = {
-                "date": game_date, "type": "ml", "game": matchup,
-                "pick": g.get("ml_pick", ""), "result": result_str,
-                "hit": _hit_from_result(g["ml_result"]),
-                "confidence": g.get("ml_conf", 0),
-            }
-            if proj_score:
-                pick_entry["proj_score"] = proj_score
-            if g.get("home_win_prob") is not None:
-                pick_entry["home_win_prob"] = g["home_win_prob"]
-            if g.get("away_win_prob") is not None:
-                pick_entry["away_win_prob"] = g["away_win_prob"]
-            game_picks.append(pick_entry)
-
+def write_nba_game_picks(game_picks, game_date, results_path):
+    """Replace one day's NBA game picks in results.json, keeping prop picks/stats
+    and score-only catch-up entries."""
     if not game_picks:
         return
 
-    # Tag top 5 game picks by confidence as best bets
-    by_conf = sorted(game_picks, key=lambda p: p.get("confidence") or 0, reverse=True)
-    for p in by_conf[:5]:
-        p["best_bet"] = True
-
     # Load existing results
     results = load_json(results_path) or {"updated": "", "allTime": {}, "days": []}
     days = results.get("days", [])
@@ -647,11 +618,15 @@ def update_nba_results(proj_data, results_path):
             existing_idx = i
             break
 
+    score_picks = _score_only_picks(game_picks, (existing_day or {}).get("picks", []))
+    game_picks = [p for p in game_picks if p.get("type") != "score"]
+    tag_best_bets(game_picks)
+
     if existing_day:
         # Merge: keep existing prop picks, replace game picks
         existing_picks = existing_day.get("picks", [])
         prop_picks = [p for p in existing_picks if p.get("type") == "prop"]
-        merged_picks = prop_picks + game_picks
+        merged_picks = prop_picks + game_picks + score_picks
         existing_day["picks"] = merged_picks
 
         # Recalculate game stats only (spreads, totals, moneylines, best_bets)
@@ -690,7 +665,7 @@ def update_nba_results(proj_data, results_path):
             "totals": _make_stat(tw, tl, tp),
             "moneylines": _make_stat(mw, ml_l, mp),
             "best_bets": _make_stat(bw, bl, bp),
-            "picks": game_picks,
+            "picks": game_picks + score_picks,
         }
         days.append(day_entry)
 
@@ -711,6 +686,7 @@ def update_nba_results(proj_data, results_path):
     for key in ("best_prop_type", "best_prop_pct"):
         if key in results.get("allTime", {}):
             all_time[key] = results["allTime"][key]
+    attach_game_intervals(all_time, days)
 
     results["allTime"] = all_time
     results["updated"] = datetime.now().isoformat(timespec="seconds")
@@ -718,18 +694,22 @@ def update_nba_results(proj_data, results_path):
     save_json(results_path, results)
 
 
+# Sport results_schema → writer for one day's game picks
+RESULTS_WRITERS = {
+    "games": write_game_picks,
+    "nba": write_nba_game_picks,
+}
+
+
 def _fetch_espn_event_ids(sport, date_str):
     """Fetch ESPN event IDs mapped by team matchup for a given date.
 
     Returns dict: {"AWAY@HOME": espn_event_id, ...}
     """
     url = ESPN_ENDPOINTS[sport]
-    params = {"dates": date_str.replace("-", "")}
-    if sport == "NCAAB":
-        params["limit"] = 300
-        params["groups"] = 50
+    params = {**SPORTS[sport]["scoreboard_params"], "dates": date_str.replace("-", "")}
     try:
-        resp = requests.get(url, params=params, timeout=30)
+        resp = _espn_get(url, f"events:{sport}", params=params, timeout=30)
         resp.raise_for_status()
         data = resp.json()
         result = {}
@@ -764,48 +744,124 @@ def _fetch_espn_event_ids(sport, date_str):
         return {}
 
 
-def _fetch_box_score(summary_url, event_id):
+# Summary statuses with a meaningful (partial) box score for live tracking
+LIVE_BOX_STATUSES = {"STATUS_IN_PROGRESS", "STATUS_HALFTIME", "STATUS_END_PERIOD", "STATUS_FINAL"}
+
+# GRADE_BOX_PARITY=1: also run the full box-score parse and report any cell the
+# targeted (pending-props-only) parse decodes differently; the full parse wins.
+BOX_PARITY = os.environ.get("GRADE_BOX_PARITY", "0") == "1"
+
+
+def _decode_stat(val):
+    """ESPN stat cell → float ("7/12" made/attempted → 7.0); non-numeric kept as is."""
+    try:
+        if isinstance(val, str) and "/" in val:
+            return float(val.split("/", 1)[0])
+        return float(val)
+    except (ValueError, TypeError):
+        return val
+
+
+def _player_matcher(players):
+    """Predicate accepting box-score names that _match_player would pair with `players`."""
+    exact = set()
+    fuzzy = set()
+    for name in players:
+        parts = name.split()
+        if not parts:
+            continue
+        exact.add(name.lower())
+        fuzzy.add((parts[-1].lower(), parts[0][0].lower()))
+
+    def wanted(name):
+        parts = name.split()
+        return name.lower() in exact or (parts[-1].lower(), parts[0][0].lower()) in fuzzy
+    return wanted
+
+
+def _parse_box_score(data, needs=None):
+    """Box score stats from an ESPN summary payload.
+
+    needs: optional (player names, stat labels). When given, only columns in
+    those labels are decoded (label → column index resolved once per stat
+    section), and only for athletes matching one of the players.
+
+    Returns dict: {"Player Name": {"stat_key": value, ...}, ...}
+    """
+    wanted = labels = None
+    if needs is not None:
+        wanted = _player_matcher(needs[0])
+        labels = set(needs[1])
+
+    stats = {}
+    for team_data in data.get("boxscore", {}).get("players", []):
+        for stat_section in team_data.get("statistics", []):
+            section_labels = stat_section.get("labels", [])
+            if labels is None:
+                columns = list(enumerate(section_labels))
+            else:
+                columns = [(i, key) for i, key in enumerate(section_labels) if key in labels]
+                if not columns:
+                    continue
+            for athlete_data in stat_section.get("athletes", []):
+                name = athlete_data.get("athlete", {}).get("displayName", "")
+                if not name or (wanted is not None and not wanted(name)):
+                    continue
+                stat_values = athlete_data.get("stats", [])
+                n = len(stat_values)
+                player_stats = stats.setdefault(name, {})
+                for i, key in columns:
+                    if i < n:
+                        player_stats[key] = _decode_stat(stat_values[i])
+    return stats
+
+
+def _box_score_parity(data, needs):
+    """Compare the targeted parse against the full parse for the needed cells.
+
+    Returns a list of (player, label, targeted, full) mismatches.
+    """
+    full = _parse_box_score(data)
+    targeted = _parse_box_score(data, needs)
+    mismatches = []
+    for player in needs[0]:
+        f = _match_player(player, full) or {}
+        t = _match_player(player, targeted) or {}
+        for label in needs[1]:
+            if f.get(label) != t.get(label):
+                mismatches.append((player, label, t.get(label), f.get(label)))
+    return mismatches
+
+
+def _fetch_box_score(summary_url, event_id, live=False, needs=None):
     """Fetch box score stats from ESPN summary API.
 
+    Only final games are returned unless live=True, which also accepts
+    in-progress box scores (stats so far). With `needs` (player names, stat
+    labels) only those cells are decoded — see _parse_box_score.
+
     Returns dict: {"Player Name": {"stat_key": value, ...}, ...} or None
     """
     try:
-        resp = requests.get(f"{summary_url}?event={event_id}", timeout=15)
+        resp = _espn_get(f"{summary_url}?event={event_id}",
+                         "summary:" + summary_url.rstrip("/").split("/")[-2].upper(), timeout=15)
         if resp.status_code != 200:
             return None
         data = resp.json()
 
         status = (data.get("header", {}).get("competitions", [{}])[0]
                   .get("status", {}).get("type", {}).get("name", ""))
-        if status != "STATUS_FINAL":
+        if status != "STATUS_FINAL" and not (live and status in LIVE_BOX_STATUSES):
             return None
 
-        stats = {}
-        for team_data in data.get("boxscore", {}).get("players", []):
-            for stat_section in team_data.get("statistics", []):
-                labels = stat_section.get("labels", [])
-                for athlete_data in stat_section.get("athletes", []):
-                    player = athlete_data.get("athlete", {})
-                    name = player.get("displayName", "")
-                    if not name:
-                        continue
-                    stat_values = athlete_data.get("stats", [])
-                    player_stats = {}
-                    for i, key in enumerate(labels):
-                        if i < len(stat_values):
-                            try:
-                                val = stat_values[i]
-                                if "/" in str(val):
-                                    parts = str(val).split("/")
-                                    player_stats[key] = float(parts[0])
-                                else:
-                                    player_stats[key] = float(val)
-                            except (ValueError, IndexError):
-                                player_stats[key] = val
-                    if name not in stats:
-                        stats[name] = {}
-                    stats[name].update(player_stats)
+        if needs is not None and BOX_PARITY:
+            mismatches = _box_score_parity(data, needs)
+            for player, label, got, want in mismatches[:5]:
+                print(f"    Box score {event_id} parity: {player} {label} targeted={got!r} full={want!r}")
+            if mismatches:
+                needs = None
 
+        stats = _parse_box_score(data, needs)
         return stats if stats else None
     except Exception as e:
         print(f"    Box score {event_id} error: {e}")
@@ -823,6 +879,11 @@ def _match_player(player_name, box_score_stats):
     return None
 
 
+def _needs_grading(p):
+    """Ungraded, or settled early from a live box score and awaiting its final actual."""
+    return not p.get("result") or bool(p.get("settled_early"))
+
+
 def _grade_prop(direction, line, actual_value):
     """Grade OVER/UNDER prop. Returns (result, actual_float)."""
     actual_value = float(actual_value)
@@ -833,6 +894,84 @@ def _grade_prop(direction, line, actual_value):
     return result, actual_value
 
 
+# ── Prop Stat Extractors ─────────────────────────────────────────
+#
+# Each (sport, prop type) compiles once into an extractor: a tuple of
+# components, each a tuple of alternative box-score labels (first present
+# wins), plus a combine op over the component values. Props without a
+# registration read the box-score label equal to the prop type itself.
+
+_STAT_REGISTRY = {}    # (sport, prop type lowercased) -> (components, op)
+_STAT_EXTRACTORS = {}  # (sport, prop type as given) -> (labels, extract fn)
+
+
+def register_stat(sport, prop_type, *components, op=sum):
+    """Register how a prop type is read from a box score.
+
+    Each component is a label or a tuple of alternative labels, e.g.
+    register_stat("NHL", "shots", ("S", "SOG")) or
+    register_stat("NBA", "pra", "PTS", "REB", "AST").
+    """
+    comps = tuple((c,) if isinstance(c, str) else tuple(c) for c in components)
+    _STAT_REGISTRY[(sport, prop_type.lower())] = (comps, op)
+    _STAT_EXTRACTORS.clear()
+
+
+def _compile_extractor(components, op):
+    """Build the extract fn for one registration (numeric cells only)."""
+    if len(components) == 1 and len(components[0]) == 1:
+        label = components[0][0]
+
+        def extract(stats):
+            v = stats.get(label)
+            return float(v) if isinstance(v, (int, float)) else None
+        return extract
+
+    def extract(stats):
+        values = []
+        for labels in components:
+            for label in labels:
+                v = stats.get(label)
+                if v is not None:
+                    break
+            if not isinstance(v, (int, float)):
+                return None  # missing, or "--" and other non-numeric cells
+            values.append(v)
+        return float(op(values))
+    return extract
+
+
+def _stat_extractor(sport, prop_type):
+    key = (sport, prop_type)
+    ex = _STAT_EXTRACTORS.get(key)
+    if ex is None:
+        comps, op = _STAT_REGISTRY.get((sport, str(prop_type).lower())) or (((prop_type,),), sum)
+        ex = _STAT_EXTRACTORS[key] = ([label for labels in comps for label in labels],
+                                      _compile_extractor(comps, op))
+    return ex
+
+
+def extract_stat(sport, actual_stats, prop_type):
+    """A player's value for a prop from their box-score stats, or None."""
+    ex = _STAT_EXTRACTORS.get((sport, prop_type)) or _stat_extractor(sport, prop_type)
+    return ex[1](actual_stats)
+
+
+def _prop_stat_labels(sport, prop_type):
+    """Box-score labels extract_stat may read for a prop."""
+    return _stat_extractor(sport, prop_type)[0]
+
+
+# Each sport's prop stat map (sports.py): "PTS", ("PTS", "REB", "AST"), (("S", "SOG"),)
+for _label, _spec in SPORTS.items():
+    for _prop, _stat in ((_spec["props"] or {}).get("stats") or {}).items():
+        register_stat(_label, _prop, *((_stat,) if isinstance(_stat, str) else _stat))
+
+
+_get_nba_stat = partial(extract_stat, "NBA")
+_get_nhl_stat = partial(extract_stat, "NHL")
+
+
 def grade_nhl_props():
     """Grade NHL player props against actual box score stats.
 
@@ -854,15 +993,14 @@ def grade_nhl_props():
         print("  NHL Props: no nhl_player_props.json found")
         return False
 
-    with open(props_path, "r", encoding="utf-8") as f:
-        props_data = json.load(f)
+    props_data = json_codec.load(props_path)
 
     props = props_data.get("projections", [])
     if not props:
         print("  NHL Props: no projections to grade")
         return False
 
-    ungraded = [p for p in props if not p.get("result")]
+    ungraded = [p for p in props if _needs_grading(p)]
     if not ungraded:
         print("  NHL Props: all props already graded")
         return False
@@ -873,8 +1011,7 @@ def grade_nhl_props():
     nhl_proj_path = os.path.join(REPO_ROOT, "nhl_game_projections.json")
     valid_matchups = set()
     if os.path.exists(nhl_proj_path):
-        with open(nhl_proj_path, "r", encoding="utf-8") as f:
-            nhl_proj = json.load(f)
+        nhl_proj = json_codec.load(nhl_proj_path)
         for g in nhl_proj.get("games", []):
             away = g.get("away_team", "")
             home = g.get("home_team", "")
@@ -927,7 +1064,8 @@ def grade_nhl_props():
         print("  NHL Props: no games FINAL for today's matchups — skipping")
         return False
 
-    # Fetch box scores for matching final games
+    # Fetch box scores for matching final games (decoding only the needed cells)
+    needs = _box_score_needs("NHL", ungraded)
     box_scores = {}  # keyed by (team, opponent)
     fetched_events = set()
     for team, opponent in matchups_needed:
@@ -946,7 +1084,7 @@ def grade_nhl_props():
             continue
         fetched_events.add(eid)
 
-        stats = _fetch_box_score(ESPN_NHL_SUMMARY, eid)
+        stats = _fetch_box_score(ESPN_NHL_SUMMARY, eid, needs=needs.get(frozenset((team, opponent))))
         if stats:
             stats["_eid"] = eid
             box_scores[(team, opponent)] = stats
@@ -958,74 +1096,7 @@ def grade_nhl_props():
         print("  NHL Props: no finished games with box scores")
         return False
 
-    graded = 0
-    wins = 0
-    losses = 0
-
-    # ESPN NHL labels: G, A, SOG, S, BS, HT, TK, SV, SA, etc.
-    # "points" in NHL = Goals + Assists (computed)
-    NHL_STAT_MAP = {
-        "shots": ["S", "SOG"],
-        "goals": ["G"],
-        "assists": ["A"],
-        "saves": ["SV"],
-        "blocked_shots": ["BS"],
-        "hits": ["HT"],
-    }
-
-    def _get_nhl_stat(actual_stats, prop_type):
-        """Get NHL stat value, handling 'points' as G + A."""
-        pt = prop_type.lower()
-        if pt == "points":
-            g = None
-            a = None
-            for key in ["G"]:
-                if key in actual_stats:
-                    g = float(actual_stats[key])
-                    break
-            for key in ["A"]:
-                if key in actual_stats:
-                    a = float(actual_stats[key])
-                    break
-            if g is not None and a is not None:
-                return g + a
-            return None
-        for key in NHL_STAT_MAP.get(pt, [prop_type]):
-            if key in actual_stats:
-                return float(actual_stats[key])
-        return None
-
-    for p in props:
-        if p.get("result"):
-            continue
-        team = p.get("team", "")
-        opponent = p.get("opponent", "")
-        bs = box_scores.get((team, opponent))
-        if not bs:
-            continue
-        player_name = p.get("player", "")
-        prop_type = p.get("prop", "")
-        line = p.get("line")
-        direction = str(p.get("direction", "OVER")).upper()
-        if line is None:
-            continue
-
-        actual_stats = _match_player(player_name, {k: v for k, v in bs.items() if k != "_eid"})
-        if actual_stats is None:
-            continue
-
-        actual_value = _get_nhl_stat(actual_stats, prop_type)
-        if actual_value is None:
-            continue
-
-        result, actual_value = _grade_prop(direction, line, actual_value)
-        p["result"] = result
-        p["actual"] = actual_value
-        graded += 1
-        if result == "WIN":
-            wins += 1
-        elif result == "LOSS":
-            losses += 1
+    graded, wins, losses = _grade_props_list(props, box_scores, _get_nhl_stat)
 
     if graded == 0:
         print("  NHL Props: no props could be graded")
@@ -1033,6 +1104,10 @@ def grade_nhl_props():
 
     print(f"  NHL Props: graded {graded} props ({wins}W-{losses}L)")
     save_json(props_path, props_data)
+    record_prop_results("NHL", "nhl_player_props.json", props_date,
+                        [p for p in ungraded if p.get("result")])
+    grade_latency.props_graded("NHL", "nhl_player_props.json", props_date,
+                               [p for p in ungraded if p.get("result")])
     _update_nhl_props_results(props, props_data.get("date", datetime.now().strftime("%Y-%m-%d")), results_path)
     return True
 
@@ -1082,7 +1157,9 @@ def _update_nhl_props_results(props, game_date, results_path):
                     "actual": p.get("actual"), "result": p.get("result"),
                     "hit": True if p.get("result") == "WIN" else (False if p.get("result") == "LOSS" else None),
                     "confidence": p.get("confidence"), "ev": p.get("ev"),
-                    "edge": p.get("edge")} for p in graded],
+                    "edge": p.get("edge"),
+                    **_prop_pricing(p),
+                    **({"settled_early": True} if p.get("settled_early") else {})} for p in graded],
     }
 
     found = False
@@ -1101,18 +1178,21 @@ def _update_nhl_props_results(props, game_date, results_path):
     results["all_time"]["losses"] = all_l
     results["all_time"]["pushes"] = all_p
     results["all_time"]["pct"] = round(all_w / (all_w + all_l) * 100, 1) if (all_w + all_l) > 0 else 0
+    attach_prop_intervals(results["all_time"], results["days"])
 
     results["updated"] = datetime.now().isoformat(timespec="seconds")
     save_json(results_path, results)
     print(f"  Updated nhl_props_results.json")
 
 
-def _fetch_nba_box_scores(matchups_needed, target_date):
+def _fetch_nba_box_scores(matchups_needed, target_date, needs=None):
     """Fetch ESPN box scores for NBA final games matching the given matchups.
 
     Args:
         matchups_needed: set of (team, opponent) tuples
         target_date: date string YYYY-MM-DD to match events against
+        needs: optional {frozenset({team, opponent}): (players, labels)} from
+            _box_score_needs; limits decoding to those cells
 
     Returns:
         box_scores dict keyed by (team, opponent) tuples
@@ -1151,7 +1231,8 @@ def _fetch_nba_box_scores(matchups_needed, target_date):
             continue
         fetched_events.add(eid)
 
-        stats = _fetch_box_score(ESPN_NBA_SUMMARY, eid)
+        game_needs = needs.get(frozenset((team, opponent))) if needs is not None else None
+        stats = _fetch_box_score(ESPN_NBA_SUMMARY, eid, needs=game_needs)
         if stats:
             stats["_eid"] = eid
             box_scores[(team, opponent)] = stats
@@ -1161,52 +1242,20 @@ def _fetch_nba_box_scores(matchups_needed, target_date):
     return box_scores
 
 
-# ESPN NBA box score labels: MIN, PTS, FG, 3PT, FT, REB, AST, TO, STL, BLK, ...
-_NBA_STAT_MAP = {
-    "pts": ["PTS"],
-    "reb": ["REB"],
-    "ast": ["AST"],
-    "stl": ["STL"],
-    "blk": ["BLK"],
-    "to": ["TO"],
-    "3pm": ["3PT"],
-}
-
-
-def _get_nba_stat(actual_stats, prop_type):
-    """Get NBA stat value, handling compound stats like PRA."""
-    prop_lower = prop_type.lower()
+def _box_score_needs(sport, props):
+    """Per-game (player names, stat labels) still needed by ungraded props.
 
-    if prop_lower == "pra":
-        pts = _get_nba_stat(actual_stats, "PTS")
-        reb = _get_nba_stat(actual_stats, "REB")
-        ast = _get_nba_stat(actual_stats, "AST")
-        if pts is not None and reb is not None and ast is not None:
-            return pts + reb + ast
-        return None
-    if prop_lower == "pr":
-        pts = _get_nba_stat(actual_stats, "PTS")
-        reb = _get_nba_stat(actual_stats, "REB")
-        if pts is not None and reb is not None:
-            return pts + reb
-        return None
-    if prop_lower == "pa":
-        pts = _get_nba_stat(actual_stats, "PTS")
-        ast = _get_nba_stat(actual_stats, "AST")
-        if pts is not None and ast is not None:
-            return pts + ast
-        return None
-    if prop_lower == "ra":
-        reb = _get_nba_stat(actual_stats, "REB")
-        ast = _get_nba_stat(actual_stats, "AST")
-        if reb is not None and ast is not None:
-            return reb + ast
-        return None
-
-    for key in _NBA_STAT_MAP.get(prop_lower, [prop_type]):
-        if key in actual_stats:
-            return actual_stats[key]
-    return None
+    Keyed by frozenset({team, opponent}) so both teams' props share one entry.
+    """
+    needs = {}
+    for p in props:
+        team, opponent = p.get("team", ""), p.get("opponent", "")
+        if not (team and opponent and p.get("player")):
+            continue
+        players, labels = needs.setdefault(frozenset((team, opponent)), (set(), set()))
+        players.add(p["player"])
+        labels.update(_prop_stat_labels(sport, p.get("prop", "")))
+    return needs
 
 
 def _grade_props_list(props_list, box_scores, get_stat_fn):
@@ -1218,7 +1267,7 @@ def _grade_props_list(props_list, box_scores, get_stat_fn):
     wins = 0
     losses = 0
     for p in props_list:
-        if p.get("result"):
+        if not _needs_grading(p):
             continue
         team = p.get("team", "")
         opponent = p.get("opponent", "")
@@ -1241,6 +1290,7 @@ def _grade_props_list(props_list, box_scores, get_stat_fn):
             continue
 
         result, actual_value = _grade_prop(direction, line, actual_value)
+        p.pop("settled_early", None)
         p["result"] = result
         p["actual"] = actual_value
         graded += 1
@@ -1251,17 +1301,94 @@ def _grade_props_list(props_list, box_scores, get_stat_fn):
     return graded, wins, losses
 
 
+def _ledger_key(p):
+    return (p.get("player"), p.get("prop"), p.get("line"), str(p.get("direction", "OVER")).upper())
+
+
+def build_prop_ledger(*prop_lists):
+    """Index props from several files by (player, prop, line, direction).
+
+    Returns {key: [prop dicts]} — every file's copy of the same prop, in
+    the order the lists were given.
+    """
+    ledger = {}
+    for props in prop_lists:
+        for p in props:
+            ledger.setdefault(_ledger_key(p), []).append(p)
+    return ledger
+
+
+def _grade_ledger(ledger, box_scores, get_stat_fn):
+    """Grade each distinct prop once (from the first copy that grades) and copy
+    the outcome to all its copies.
+
+    A copy already graded from a final box score is reused without another
+    stat lookup. Returns (graded, wins, losses) counted per distinct prop.
+    """
+    graded = wins = losses = 0
+    for members in ledger.values():
+        todo = [p for p in members if _needs_grading(p)]
+        if not todo:
+            continue
+        done = next((p for p in members if not _needs_grading(p)), None)
+        if done is None:
+            # copies can differ in team/opponent or name spelling: try each until one grades
+            done = next((p for p in todo if _grade_props_list([p], box_scores, get_stat_fn)[0]), None)
+            if done is None:
+                continue
+        for p in todo:
+            p.pop("settled_early", None)
+            p["result"] = done["result"]
+            p["actual"] = done.get("actual")
+        graded += 1
+        if done["result"] == "WIN":
+            wins += 1
+        elif done["result"] == "LOSS":
+            losses += 1
+    return graded, wins, losses
+
+
+def _write_nba_props_results(all_props_data=None, proj_props_data=None):
+    """Write all_props_results.json once from both NBA props files.
+
+    Graded props from all_props.json and projections.json for the same date
+    are de-duplicated by ledger key (all_props.json copy first) into a single
+    day record. Either document is loaded from disk when not given.
+    """
+    results_path = os.path.join(REPO_ROOT, "all_props_results.json")
+    if all_props_data is None:
+        all_props_data = load_json(os.path.join(REPO_ROOT, "all_props.json")) or {}
+    if proj_props_data is None:
+        proj_props_data = load_json(os.path.join(REPO_ROOT, "projections.json")) or {}
+    today = datetime.now().strftime("%Y-%m-%d")
+    all_date = all_props_data.get("_date") or all_props_data.get("date") or today
+    proj_date = proj_props_data.get("date", today)
+    all_graded = [p for p in all_props_data.get("props", []) if p.get("result")]
+    proj_graded = [p for p in proj_props_data.get("projections", []) if p.get("result")]
+
+    if all_date == proj_date:
+        union = [members[0] for members in build_prop_ledger(all_graded, proj_graded).values()]
+        _update_nba_props_results(union, all_date, results_path)
+        return
+    # Different slates: each file's results belong to its own day
+    if all_graded:
+        _update_nba_props_results(all_graded, all_date, results_path)
+    if proj_graded:
+        _merge_proj_results_into_all_props_results(proj_graded, proj_date, results_path)
+
+
 def grade_nba_props():
     """Grade NBA player props against actual box score stats via ESPN.
 
-    Grades both all_props.json (comprehensive props) and projections.json
-    (top picks with betting lines) using shared ESPN box score data.
+    all_props.json (comprehensive props) and projections.json (top picks with
+    betting lines) share one prop ledger: each distinct prop is graded once
+    against the shared ESPN box scores, the outcome is copied to both files,
+    and all_props_results.json is written once from the union.
     """
     any_changes = False
 
     # ── Load both prop files ──
     all_props_path = os.path.join(REPO_ROOT, "all_props.json")
-    all_props_results_path = os.path.join(REPO_ROOT, "all_props_results.json")
     proj_props_path = os.path.join(REPO_ROOT, "projections.json")
 
     all_props_data = load_json(all_props_path)
@@ -1270,8 +1397,8 @@ def grade_nba_props():
     all_props = (all_props_data.get("props", []) if all_props_data else [])
     proj_props = (proj_props_data.get("projections", []) if proj_props_data else [])
 
-    all_ungraded = [p for p in all_props if not p.get("result")]
-    proj_ungraded = [p for p in proj_props if not p.get("result")]
+    all_ungraded = [p for p in all_props if _needs_grading(p)]
+    proj_ungraded = [p for p in proj_props if _needs_grading(p)]
 
     if not all_ungraded and not proj_ungraded:
         print("  NBA Props: all props already graded")
@@ -1283,8 +1410,7 @@ def grade_nba_props():
     nba_proj_path = os.path.join(REPO_ROOT, "game_projections.json")
     valid_matchups = set()
     if os.path.exists(nba_proj_path):
-        with open(nba_proj_path, "r", encoding="utf-8") as f:
-            nba_proj = json.load(f)
+        nba_proj = json_codec.load(nba_proj_path)
         for g in nba_proj.get("games", []):
             away = g.get("away_team", "")
             home = g.get("home_team", "")
@@ -1310,51 +1436,44 @@ def grade_nba_props():
     # ── Fetch box scores (shared across both files) ──
     today = datetime.now().strftime("%Y-%m-%d")
     proj_date = proj_props_data.get("date", today) if proj_props_data else today
+    all_props_date = (all_props_data.get("_date") or all_props_data.get("date") or today) if all_props_data else today
     print(f"  NBA Props: target date = {proj_date}")
 
     # Fetch box scores for today's date only (cross-ref prevents yesterday contamination)
-    box_scores = _fetch_nba_box_scores(matchups_needed, proj_date)
+    box_scores = _fetch_nba_box_scores(matchups_needed, proj_date,
+                                       needs=_box_score_needs("NBA", all_ungraded + proj_ungraded))
     if not box_scores:
         print("  NBA Props: no finished games with box scores")
         return False
 
-    # ── Grade all_props.json ──
-    if all_ungraded:
-        g, w, l = _grade_props_list(all_props, box_scores, _get_nba_stat)
+    # ── Grade each distinct prop once (one ledger when both files are the same slate) ──
+    if all_props_date == proj_date:
+        ledgers = [build_prop_ledger(all_props, proj_props)]
+    else:
+        ledgers = [build_prop_ledger(all_props), build_prop_ledger(proj_props)]
+    for ledger in ledgers:
+        g, w, l = _grade_ledger(ledger, box_scores, _get_nba_stat)
         if g > 0:
-            print(f"  NBA all_props: graded {g} props ({w}W-{l}L)")
-            all_props_data["updated_at"] = datetime.now().isoformat(timespec="seconds")
-            save_json(all_props_path, all_props_data)
-            _update_nba_props_results(
-                all_props,
-                (all_props_data.get("_date") or all_props_data.get("date") or today),
-                all_props_results_path,
-            )
-            any_changes = True
-        else:
-            print("  NBA all_props: no props could be graded (likely roster-only without lines)")
-
-    # ── Grade projections.json ──
-    proj_graded = 0
-    if proj_ungraded:
-        proj_graded, w, l = _grade_props_list(proj_props, box_scores, _get_nba_stat)
-        if proj_graded > 0:
-            print(f"  NBA projections: graded {proj_graded} props ({w}W-{l}L)")
-            proj_props_data["updated"] = datetime.now().isoformat(timespec="seconds")
-            save_json(proj_props_path, proj_props_data)
-            any_changes = True
-        else:
-            print("  NBA projections: no props could be graded")
-
-    # ── Write projections.json results to all_props_results.json too ──
-    # This gives the frontend a second data path via the merge function,
-    # so results show even if the CDN serves a cached projections.json.
-    proj_with_results = [p for p in proj_props if p.get("result")]
-    if proj_with_results:
-        _merge_proj_results_into_all_props_results(
-            proj_with_results, proj_date, all_props_results_path
-        )
+            print(f"  NBA Props: graded {g} distinct props ({w}W-{l}L)")
+
+    # ── Fan out: save whichever files changed, then one results write ──
+    now = datetime.now().isoformat(timespec="seconds")
+    for data, path, src, date, ungraded, stamp in (
+            (all_props_data, all_props_path, "all_props.json", all_props_date, all_ungraded, "updated_at"),
+            (proj_props_data, proj_props_path, "projections.json", proj_date, proj_ungraded, "updated")):
+        newly = [p for p in ungraded if p.get("result") and not p.get("settled_early")]
+        if not newly:
+            continue
+        data[stamp] = now
+        save_json(path, data)
+        record_prop_results("NBA", src, date, newly)
+        grade_latency.props_graded("NBA", src, date, newly)
+        any_changes = True
+    if not any_changes:
+        print("  NBA Props: no props could be graded (likely roster-only without lines)")
+        return False
 
+    _write_nba_props_results(all_props_data, proj_props_data)
     return any_changes
 
 
@@ -1390,17 +1509,23 @@ def _merge_proj_results_into_all_props_results(proj_graded, game_date, results_p
         day_idx = len(days) - 1
 
     # Build set of existing pick keys to avoid duplicates
-    existing_keys = set()
-    for pick in day.get("picks", []):
+    existing_keys = {}
+    for i, pick in enumerate(day.get("picks", [])):
         key = f"{pick.get('player')}|{pick.get('prop')}|{pick.get('direction')}|{pick.get('line')}"
-        existing_keys.add(key)
+        existing_keys[key] = i
 
-    # Add projections results that aren't already present
+    # Add projections results that aren't already present (or replace an
+    # early-settled entry once the final actual is in)
     added = 0
     for p in proj_graded:
         key = f"{p.get('player')}|{p.get('prop')}|{p.get('direction')}|{p.get('line')}"
         if key in existing_keys:
-            continue
+            prev = day["picks"][existing_keys[key]]
+            if not prev.get("settled_early") or p.get("settled_early"):
+                continue
+            del day["picks"][existing_keys[key]]
+            existing_keys = {k: (i - 1 if i > existing_keys[key] else i)
+                             for k, i in existing_keys.items() if k != key}
         day["picks"].append({
             "player": p.get("player"),
             "prop": p.get("prop"),
@@ -1414,6 +1539,8 @@ def _merge_proj_results_into_all_props_results(proj_graded, game_date, results_p
             "confidence": p.get("confidence"),
             "ev": p.get("ev"),
             "edge": p.get("edge"),
+            **_prop_pricing(p),
+            **({"settled_early": True} if p.get("settled_early") else {}),
         })
         added += 1
 
@@ -1459,6 +1586,7 @@ def _merge_proj_results_into_all_props_results(proj_graded, game_date, results_p
         "total": all_w + all_l + all_p,
         "win_pct": round(all_w / (all_w + all_l) * 100, 1) if (all_w + all_l) > 0 else 0,
     }
+    attach_prop_intervals(results["cumulative"], days)
     results["days"] = days
     save_json(results_path, results)
     print(f"  Merged {added} projections results into all_props_results.json")
@@ -1504,7 +1632,9 @@ def _update_nba_props_results(props, game_date, results_path):
                     "line": p.get("line"), "projection": p.get("projection"),
                     "actual": p.get("actual"), "result": p.get("result"),
                     "confidence": p.get("confidence"), "ev": p.get("ev"),
-                    "edge": p.get("edge")} for p in graded],
+                    "edge": p.get("edge"),
+                    **_prop_pricing(p),
+                    **({"settled_early": True} if p.get("settled_early") else {})} for p in graded],
     }
 
     found = False
@@ -1525,11 +1655,176 @@ def _update_nba_props_results(props, game_date, results_path):
         "total": all_w + all_l + all_p,
         "win_pct": round(all_w / (all_w + all_l) * 100, 1) if (all_w + all_l) > 0 else 0,
     }
+    attach_prop_intervals(results["cumulative"], results["days"])
 
     save_json(results_path, results)
     print(f"  Updated all_props_results.json")
 
 
+# ── Live Prop Progress ───────────────────────────────────────────
+
+# Settle props decided by an in-progress box score (an OVER past its line,
+# an UNDER already over it). GRADE_PROPS_SETTLE_EARLY=0 only tracks progress.
+SETTLE_EARLY = os.environ.get("GRADE_PROPS_SETTLE_EARLY", "1") != "0"
+
+PROPS_LIVE_CONFIG = {
+    label: {
+        "live_file": spec["props"]["live_file"],
+        "proj_file": spec["proj_file"],
+        "summary_url": spec["summary_url"],
+        "get_stat": partial(extract_stat, label),
+        "sources": spec["props"]["sources"],
+        "workers": spec["box_score_workers"],
+    }
+    for label, spec in SPORTS.items() if spec["props"]
+}
+
+
+def _save_graded_props(sport, src, data, props, date, newly_graded):
+    """Persist a props file and fold its results into the props results file."""
+    save_json(os.path.join(REPO_ROOT, src), data)
+    record_prop_results(sport, src, date, newly_graded)
+    grade_latency.props_graded(sport, src, date, newly_graded)
+    if src == "nhl_player_props.json":
+        _update_nhl_props_results(props, date, os.path.join(REPO_ROOT, "nhl_props_results.json"))
+    elif src == "all_props.json":
+        _write_nba_props_results(all_props_data=data)
+    else:
+        _write_nba_props_results(proj_props_data=data)
+
+
+def track_live_props(sport, scores):
+    """Track current stat values for pending props in in-progress games.
+
+    Only games with pending props are fetched, and a game's summary is only
+    refetched when its scoreboard state (score, period, clock) changed since
+    the last cycle; otherwise the previous values are reused. Writes
+    <sport>_props_live.json:
+
+        {"sport", "date", "updated",
+         "events": {"AWAY@HOME": {"id", "state"}},
+         "props": {"player|prop|direction|line": {"game", "current", "line",
+                                                   "direction", "cleared"}}}
+
+    `cleared` means the line has already been passed (a won OVER or a lost
+    UNDER). With SETTLE_EARLY those props are graded right away and flagged
+    `settled_early`; the final box score later refreshes their actual.
+
+    Returns True if any file changed.
+    """
+    cfg = PROPS_LIVE_CONFIG[sport]
+    live_path = os.path.join(REPO_ROOT, cfg["live_file"])
+    game_date = (load_json(os.path.join(REPO_ROOT, cfg["proj_file"])) or {}).get("date")
+    if not game_date:
+        return False
+
+    sources = []
+    for src, list_key in cfg["sources"]:
+        data = load_json(os.path.join(REPO_ROOT, src))
+        # Only today's props (same guard as grading: no cross-day contamination)
+        if data and data.get(list_key) and (data.get("_date") or data.get("date")) == game_date:
+            sources.append((src, data, data[list_key]))
+
+    in_progress = {}
+    for key, sc in (scores or {}).items():
+        if sc.get("in_progress"):
+            away, home = key.split("@")
+            in_progress[(away, home)] = in_progress[(home, away)] = key
+
+    pending = {}  # game key -> [(src, prop)]
+    for src, _, props in sources:
+        for p in props:
+            if p.get("result") or p.get("line") is None:
+                continue
+            if str(p.get("direction", "OVER")).upper() not in ("OVER", "UNDER"):
+                continue
+            key = in_progress.get((p.get("team", ""), p.get("opponent", "")))
+            if key:
+                pending.setdefault(key, []).append((src, p))
+
+    prev = load_json(live_path) or {}
+    if prev.get("date") != game_date:
+        prev = {}
+    prev_events = prev.get("events", {})
+    prev_props = prev.get("props", {})
+    if not pending and not prev_props:
+        return False
+
+    events = {}
+    to_fetch = []
+    for key in pending:
+        sc = scores[key]
+        state = [sc["away_score"], sc["home_score"], sc.get("period", 0), sc.get("clock", "")]
+        old = prev_events.get(key, {})
+        events[key] = {"id": old.get("id"), "state": state}
+        known = all(prop_key(p) in prev_props for _, p in pending[key])
+        if old.get("state") != state or not old.get("id") or not known:
+            to_fetch.append(key)
+
+    if any(not events[k]["id"] for k in to_fetch):
+        next_day = (datetime.strptime(game_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+        espn_events = {}
+        for d in (game_date, next_day):
+            espn_events.update(_fetch_espn_event_ids(sport, d))
+        for k in to_fetch:
+            if not events[k]["id"] and k in espn_events:
+                events[k]["id"] = espn_events[k]["id"]
+
+    box_scores = {}
+    fetch_keys = [k for k in to_fetch if events[k]["id"]]
+    needs = _box_score_needs(sport, [p for k in fetch_keys for _, p in pending[k]])
+    if fetch_keys:
+        with ThreadPoolExecutor(max_workers=cfg["workers"]) as executor:
+            futs = {executor.submit(_fetch_box_score, cfg["summary_url"], events[k]["id"], True,
+                                    needs.get(frozenset(k.split("@")))): k  # None: full parse
+                    for k in fetch_keys}
+            for fut in as_completed(futs):
+                if fut.result():
+                    box_scores[futs[fut]] = fut.result()
+        print(f"  {sport} Props live: {len(box_scores)}/{len(pending)} in-progress game(s) refetched")
+    grade_metrics.LIVE_BOX_SCORES.inc(len(fetch_keys), sport=sport, source="fetched")
+    grade_metrics.LIVE_BOX_SCORES.inc(len(pending) - len(to_fetch), sport=sport, source="reused")
+
+    live_props = {}
+    settled = {}  # src -> [props]
+    for key, entries in pending.items():
+        bs = box_scores.get(key)
+        for src, p in entries:
+            pk = prop_key(p)
+            if bs is None:
+                if key not in to_fetch and pk in prev_props:
+                    live_props[pk] = prev_props[pk]
+                continue
+            actual_stats = _match_player(p.get("player", ""), bs)
+            current = cfg["get_stat"](actual_stats, p.get("prop", "")) if actual_stats else None
+            if current is None:
+                continue
+            line = float(p["line"])
+            direction = str(p.get("direction", "OVER")).upper()
+            current = float(current)
+            live_props[pk] = {"game": key, "current": current, "line": line,
+                              "direction": direction, "cleared": current > line}
+            if SETTLE_EARLY and current > line:
+                p["result"] = "WIN" if direction == "OVER" else "LOSS"
+                p["actual"] = current
+                p["settled_early"] = True
+                settled.setdefault(src, []).append(p)
+
+    for src, data, props in sources:
+        if src in settled:
+            date = data.get("_date") or data.get("date")
+            print(f"  {sport} Props live: settled {len(settled[src])} prop(s) early in {src}")
+            _save_graded_props(sport, src, data, props, date, settled[src])
+
+    doc = {"sport": sport, "date": game_date,
+           "updated": datetime.now().isoformat(timespec="seconds"),
+           "events": events, "props": live_props}
+    if doc["events"] == prev_events and doc["props"] == prev_props and not settled:
+        return False
+    save_json(live_path, doc)
+    return True
+
+
 # ── Catch-Up Grading (late games from previous day) ─────────────
 
 
@@ -1539,8 +1834,10 @@ def catchup_grade_previous_day():
     the daily pipeline already replaced projections with the next day's data.
 
     Since the model's predictions are lost (projections overwritten), we
-    add entries with just the scores. The frontend uses selfGradeFromScores()
-    to grade tracked bets from the score using the bet's own pick details.
+    add entries with just the scores (journaled like graded picks, and kept
+    when the day's game picks are rewritten). The frontend uses selfGradeFromScores()
+    (and scripts/grade_bets.py, in batch) to grade tracked bets from the score
+    using the bet's own pick details.
     """
     today = datetime.now().strftime("%Y-%m-%d")
     yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
@@ -1604,108 +1901,73 @@ def catchup_grade_previous_day():
             results["days"].sort(key=lambda d: d.get("date", ""), reverse=True)
             results["updated"] = datetime.now().isoformat(timespec="seconds")
             save_json(results_path, results)
+            record_score_picks(cfg["label"], yesterday, day["picks"][-added:])
             print(f"  {cfg['label']}: Added {added} score-only result(s) from {yesterday}")
 
 
-SPORT_CONFIG = [
-    {
-        "label": "NBA",
-        "proj_file": "game_projections.json",
-        "results_file": "results.json",
-        "is_nba": True,
-    },
-    {
-        "label": "NHL",
-        "proj_file": "nhl_game_projections.json",
-        "results_file": "nhl_results.json",
-        "is_nba": False,
-    },
-    {
-        "label": "NCAAB",
-        "proj_file": "ncaab_projections.json",
-        "results_file": "ncaab_results.json",
-        "is_nba": False,
-    },
-    {
-        "label": "MLB",
-        "proj_file": "mlb_game_projections.json",
-        "results_file": "mlb_results.json",
-        "is_nba": False,
-    },
-]
+# One entry per registered sport (sports.py): label, proj_file, live_file,
+# results_file, results_schema, ...
+SPORT_CONFIG = list(SPORTS.values())
 
 
 def _fetch_scores_for_sport(cfg, today, yesterday):
     """Fetch ESPN scores for a single sport (designed for parallel execution)."""
     sport = cfg["label"]
     scores = {}
-    if sport == "NCAAB":
-        scores.update(fetch_espn_scores("NCAAB", yesterday))
-        scores.update(fetch_espn_scores("NCAAB", today))
-    else:
-        scores.update(fetch_espn_scores(sport, today))
-        scores.update(fetch_espn_scores(sport, yesterday))
+    for d in scoreboard_dates(sport, today, yesterday):
+        scores.update(fetch_espn_scores(sport, d))
     return sport, scores
 
 
-def main():
-    t_start = time.time()
-    print(f"\n{'=' * 60}")
-    print(f"  Score Check & Auto-Grade — {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}")
-    print(f"  Source: ESPN (free, 0 Odds API calls)")
-    print(f"{'=' * 60}\n")
-
-    today = datetime.now().strftime("%Y-%m-%d")
-    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-
-    # ── Phase 1: Check which sports need grading ──
-    t_phase1 = time.time()
+def _stage_check(ctx):
+    """Stage: find sports whose projection files still have ungraded games."""
     print("Checking for ungraded games...")
     sports_to_check = []
     for cfg in SPORT_CONFIG:
         proj_path = os.path.join(REPO_ROOT, cfg["proj_file"])
         has_ungraded, total, ungraded = has_ungraded_games(proj_path)
         if has_ungraded:
-            sports_to_check.append(cfg)
+            sports_to_check.append(cfg["label"])
             print(f"  {cfg['label']}: {ungraded}/{total} ungraded — will check")
         else:
             if total == 0:
                 print(f"  {cfg['label']}: no games today — skipping")
             else:
                 print(f"  {cfg['label']}: all {total} games graded — skipping")
-    t_phase1_end = time.time()
 
     if not sports_to_check:
-        elapsed = time.time() - t_start
-        print(f"\n{'=' * 60}")
-        print(f"  SUMMARY: All games graded. Nothing to do. [{elapsed:.1f}s]")
-        print(f"  Signaling loop to stop (exit 2)")
-        print(f"{'=' * 60}")
-        return 2  # all graded — tells workflow loop to stop early
-
-    # ── Phase 2: Fetch scores from ESPN (parallel for all sports) ──
-    t_phase2 = time.time()
+        raise PipelineHalt(2, "All games graded. Nothing to do.")
     print(f"\nFetching ESPN scores for {len(sports_to_check)} sport(s) (parallel)...")
-    score_map = {}
-    with ThreadPoolExecutor(max_workers=len(sports_to_check)) as executor:
-        futures = {
-            executor.submit(_fetch_scores_for_sport, cfg, today, yesterday): cfg
-            for cfg in sports_to_check
-        }
-        for future in as_completed(futures):
-            sport, scores = future.result()
-            score_map[sport] = scores
-    t_phase2_end = time.time()
-
-    # ── Quick check: any newly final games? ──
-    has_new_finals = False
-    for cfg in sports_to_check:
+    return {"sports_to_check": sports_to_check}
+
+
+def _make_fetch_stage(cfg, today, yesterday):
+    """Stage: fetch one sport's scoreboards (None when the sport is skipped)."""
+    sport = cfg["label"]
+
+    def run(ctx):
+        if sport not in ctx["sports_to_check"]:
+            return {f"scoreboard:{sport}": None}
+        _, scores = _fetch_scores_for_sport(cfg, today, yesterday)
+        grade_latency.polled(sport)
+        return {f"scoreboard:{sport}": scores}
+    return run
+
+
+def _has_score_changes(score_map):
+    """Quick check: any newly final games or live score changes?"""
+    for cfg in SPORT_CONFIG:
         sport = cfg["label"]
-        scores = score_map.get(sport, {})
-        proj_path = os.path.join(REPO_ROOT, cfg["proj_file"])
-        proj_data = load_json(proj_path)
+        if sport not in score_map:
+            continue
+        scores = score_map[sport]
+        proj_data = load_json(os.path.join(REPO_ROOT, cfg["proj_file"]))
         if not proj_data:
             continue
+        live = None
+        if cfg.get("live_file"):
+            live = load_live_scores(os.path.join(REPO_ROOT, cfg["live_file"]),
+                                    proj_data.get("date", datetime.now().strftime("%Y-%m-%d")))
         for g in proj_data.get("games", []):
             key = f"{g['away_team']}@{g['home_team']}"
             sc = scores.get(key)
@@ -1713,101 +1975,249 @@ def main():
                 continue
             # New final: ESPN says completed but we haven't graded yet
             if sc["completed"] and g.get("status") != "final":
-                has_new_finals = True
-                break
-            # Live score change
+                return True
+            # Live score change (treated as worth processing)
             if sc.get("in_progress") and g.get("status") != "final":
-                old_a = g.get("away_score")
-                old_h = g.get("home_score")
-                if old_a != sc["away_score"] or old_h != sc["home_score"]:
-                    has_new_finals = True  # treat live updates as worth processing
-                    break
-        if has_new_finals:
-            break
+                if live is not None:
+                    prev = live.get(key, {})
+                    if (prev.get("away_score"), prev.get("home_score"), prev.get("period"), prev.get("clock")) != \
+                            (sc["away_score"], sc["home_score"], sc.get("period", 0), sc.get("clock", "")):
+                        return True
+                elif g.get("away_score") != sc["away_score"] or g.get("home_score") != sc["home_score"]:
+                    return True
+    return False
+
+
+def _stage_detect(ctx):
+    """Stage: stop early when nothing changed since the files were written."""
+    score_map = {}
+    for cfg in SPORT_CONFIG:
+        scores = ctx[f"scoreboard:{cfg['label']}"]
+        if scores is not None:
+            score_map[cfg["label"]] = scores
 
-    if not has_new_finals:
-        elapsed = time.time() - t_start
-        api_time = t_phase2_end - t_phase2
+    if not _has_score_changes(score_map):
         print(f"\n  No new finals or score changes detected.")
         if _games_ending_soon(score_map):
-            print(f"\n{'=' * 60}")
-            print(f"  SUMMARY: No changes but games ending soon — fast poll (exit 3) [{elapsed:.1f}s total, API: {api_time:.1f}s]")
-            print(f"{'=' * 60}")
-            return 3
-        print(f"\n{'=' * 60}")
-        print(f"  SUMMARY: No changes [{elapsed:.1f}s total, API: {api_time:.1f}s]")
-        print(f"{'=' * 60}")
-        return 0
-
-    # ── Phase 3: Grade (isolated per sport) ──
-    t_phase3 = time.time()
+            raise PipelineHalt(3, "No changes but games ending soon — fast poll (exit 3)")
+        raise PipelineHalt(0, "No changes")
     print("\nGrading...")
-    any_changes = False
-    summaries = []
-    for cfg in sports_to_check:
-        sport = cfg["label"]
-        try:
-            changed, summary = grade_sport(
-                sport, cfg["proj_file"], cfg["results_file"],
-                score_map.get(sport, {}), is_nba=cfg["is_nba"]
-            )
-            any_changes |= changed
-            summaries.append(summary)
-        except Exception as e:
-            print(f"  ERROR grading {sport} (non-fatal): {e}")
-            summaries.append(f"{sport}: ERROR — {e}")
-    t_phase3_end = time.time()
-
-    # ── Phase 3b: Catch-up grade late games from previous day ──
-    try:
-        catchup_grade_previous_day()
-    except Exception as e:
-        print(f"  Catch-up grading error (non-fatal): {e}")
+    return {"score_map": score_map, "proceed": True}
 
-    # ── Phase 4: Grade player props (isolated per sport) ──
-    t_phase4 = time.time()
-    print("\nGrading player props...")
-    try:
-        nhl_props_changed = grade_nhl_props()
-        any_changes |= nhl_props_changed
-    except Exception as e:
-        print(f"  ERROR grading NHL props (non-fatal): {e}")
 
-    try:
-        nba_props_changed = grade_nba_props()
-        any_changes |= nba_props_changed
-    except Exception as e:
-        print(f"  ERROR grading NBA props (non-fatal): {e}")
-    t_phase4_end = time.time()
+def _make_grade_stage(cfg):
+    """Stage: grade one sport's games against its scoreboard."""
+    sport = cfg["label"]
 
-    # Add skipped sports to summary
-    checked_labels = {cfg["label"] for cfg in sports_to_check}
-    for cfg in SPORT_CONFIG:
-        if cfg["label"] not in checked_labels:
-            summaries.append(f"{cfg['label']}: skipped (all graded)")
-
-    # ── Summary with timing ──
-    t_end = time.time()
-    total_time = t_end - t_start
-    check_time = t_phase1_end - t_phase1
-    api_time = t_phase2_end - t_phase2
-    grade_time = t_phase3_end - t_phase3
-    props_time = t_phase4_end - t_phase4
-
-    # ── Check if all games are now graded (for loop exit signal) ──
+    def run(ctx):
+        scores = ctx[f"scoreboard:{sport}"]
+        if scores is None:
+            return {f"summary:{sport}": f"{sport}: skipped (all graded)", f"changed:{sport}": False}
+        changed, summary = grade_sport(
+            sport, cfg["proj_file"], cfg["results_file"], scores,
+            results_schema=cfg["results_schema"], live_filename=cfg.get("live_file"),
+        )
+        return {f"summary:{sport}": summary, f"changed:{sport}": changed}
+    return run
+
+
+def _stage_catchup(ctx):
+    catchup_grade_previous_day()
+
+
+def _make_props_live_stage(sport):
+    """Stage: live prop progress for one sport's in-progress games."""
+    def run(ctx):
+        scores = ctx[f"scoreboard:{sport}"]
+        if scores is None:
+            return {f"changed:{sport} props live": False}
+        return {f"changed:{sport} props live": track_live_props(sport, scores)}
+    return run
+
+
+def _stage_nhl_props(ctx):
+    return {"changed:NHL props": grade_nhl_props()}
+
+
+def _stage_nba_props(ctx):
+    return {"changed:NBA props": grade_nba_props()}
+
+
+def _stage_store(ctx):
+    """Stage: re-index changed results days into the SQLite results store."""
+    sync_results_store()
+
+
+def _stage_rollups(ctx):
+    """Stage: refresh the dashboard rollups from the changed days' partials."""
+    update_rollups()
+
+
+def _stage_calibration(ctx):
+    """Stage: re-score changed days for Brier / log loss / reliability bins."""
+    update_calibration()
+
+
+def _stage_final(ctx):
+    """Stage: check if all games are now graded (for loop exit signal)."""
     all_graded = True
     for cfg in SPORT_CONFIG:
-        proj_path = os.path.join(REPO_ROOT, cfg["proj_file"])
-        has_ungraded, total, ungraded = has_ungraded_games(proj_path)
+        has_ungraded, _, _ = has_ungraded_games(os.path.join(REPO_ROOT, cfg["proj_file"]))
         if has_ungraded:
             all_graded = False
             break
+    return {"all_graded": all_graded, "ending_soon": _games_ending_soon(ctx["score_map"])}
+
+
+def build_stages(today, yesterday):
+    """Declare the grading pipeline as a stage DAG.
+
+    check → fetch:<sport> (parallel) → detect → grade:<sport> (parallel)
+    → catchup / props-live:<sport> / props:NHL / props:NBA (ordered by the
+    files they share) → store → rollups → calibration → final
+    """
+    def path(name):
+        return os.path.join(REPO_ROOT, name)
+
+    proj_files = [path(cfg["proj_file"]) for cfg in SPORT_CONFIG]
+    results_files = [path(cfg["results_file"]) for cfg in SPORT_CONFIG]
+    scoreboards = [f"scoreboard:{cfg['label']}" for cfg in SPORT_CONFIG]
+
+    stages = [stage("check", _stage_check, provides=["sports_to_check"],
+                    reads=proj_files, timeout=30, cache=False)]
+    for cfg in SPORT_CONFIG:
+        stages.append(stage(
+            f"fetch:{cfg['label']}", _make_fetch_stage(cfg, today, yesterday),
+            needs=["sports_to_check"], provides=[f"scoreboard:{cfg['label']}"],
+            timeout=90, cache=False,
+        ))
+    stages.append(stage("detect", _stage_detect, needs=scoreboards,
+                        provides=["score_map", "proceed"], reads=proj_files,
+                        timeout=30, cache=False))
+    for cfg in SPORT_CONFIG:
+        sport = cfg["label"]
+        stages.append(stage(
+            f"grade:{sport}", _make_grade_stage(cfg),
+            needs=["proceed", f"scoreboard:{sport}"],
+            provides=[f"summary:{sport}", f"changed:{sport}"],
+            reads=[path(cfg["proj_file"]), path(cfg["results_file"]), path(cfg["live_file"])],
+            writes=[path(cfg["proj_file"]), path(cfg["results_file"]), path(cfg["live_file"])],
+        ))
+    stages.append(stage("catchup", _stage_catchup, needs=["proceed"],
+                        reads=results_files, writes=results_files,
+                        timeout=180, cache=False))
+    # Live prop progress: refetches only games whose scoreboard state changed
+    for sport, cfg in PROPS_LIVE_CONFIG.items():
+        props_files = [path(src) for src, _ in cfg["sources"]]
+        props_results = [path("nhl_props_results.json" if sport == "NHL" else "all_props_results.json")]
+        stages.append(stage(
+            f"props-live:{sport}", _make_props_live_stage(sport),
+            needs=["proceed", f"scoreboard:{sport}"], provides=[f"changed:{sport} props live"],
+            reads=props_files + [path(cfg["proj_file"]), path(cfg["live_file"])],
+            writes=props_files + props_results + [path(cfg["live_file"])],
+            timeout=180,
+        ))
+    # Props depend on the scoreboard (a new final changes it); the TTL forces
+    # a periodic retry because ESPN box scores can lag the scoreboard.
+    stages.append(stage(
+        "props:NHL", _stage_nhl_props,
+        needs=["proceed", "scoreboard:NHL"], provides=["changed:NHL props"],
+        reads=[path("nhl_player_props.json"), path("nhl_game_projections.json")],
+        writes=[path("nhl_player_props.json"), path("nhl_props_results.json")],
+        timeout=300, ttl=600,
+    ))
+    stages.append(stage(
+        "props:NBA", _stage_nba_props,
+        needs=["proceed", "scoreboard:NBA"], provides=["changed:NBA props"],
+        reads=[path("all_props.json"), path("projections.json"), path("game_projections.json")],
+        writes=[path("all_props.json"), path("projections.json"), path("all_props_results.json")],
+        timeout=300, ttl=600,
+    ))
+    # Skipped (cached) whenever no results file changed this cycle
+    stages.append(stage("store", _stage_store, needs=["proceed"],
+                        reads=[path(f) for f in RESULTS_FILES], timeout=60))
+    stages.append(stage("rollups", _stage_rollups, needs=["proceed"],
+                        reads=[path(f) for f in RESULTS_FILES], writes=[path(ROLLUPS_FILE)],
+                        after=["store"], timeout=60))
+    stages.append(stage("calibration", _stage_calibration, needs=["proceed"],
+                        reads=[path(f) for f in RESULTS_FILES], writes=[path(CALIBRATION_FILE)],
+                        after=["rollups"], timeout=60))
+    stages.append(stage("final", _stage_final, needs=["score_map"],
+                        provides=["all_graded", "ending_soon"], reads=proj_files,
+                        after=["catchup", "props:NHL", "props:NBA"],
+                        timeout=30, cache=False))
+    return stages
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fetch ESPN scores and grade projections")
+    ap.add_argument("--profile", nargs="?", const="", metavar="DIR",
+                    help="profile each stage (cProfile + tracemalloc) into DIR "
+                         "(default .grade_cache/profile/<timestamp>); runs stages serially, uncached")
+    args = ap.parse_args(argv)
+
+    t_start = time.time()
+    print(f"\n{'=' * 60}")
+    print(f"  Score Check & Auto-Grade — {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    print(f"  Source: ESPN (free, 0 Odds API calls)")
+    print(f"{'=' * 60}\n")
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+
+    stages = build_stages(today, yesterday)
+    profiler = None
+    if args.profile is not None:
+        profiler = PhaseProfiler(args.profile or os.path.join(
+            REPO_ROOT, ".grade_cache", "profile", datetime.now().strftime("%Y%m%d-%H%M%S")))
+        profiler.start()
+        for st in stages:
+            st["fn"] = profiler.wrap(st["name"], st["fn"])
+        artifacts, report, halt = run_stages(stages, serial=True)
+        print(f"  Profile: {len(profiler.phases)} stage(s) → {profiler.write_summary()}")
+    else:
+        artifacts, report, halt = run_stages(stages, DAG_STATE_PATH)
+    # Log what the last heartbeat committed; keep this cycle's stamps for the next one
+    grade_latency.checkpoint()
+    for name, r in report.items():
+        if r["status"] != "not_run":
+            grade_metrics.STAGE_RUNS.inc(stage=name, status=r["status"])
+    total_time = time.time() - t_start
+
+    if halt is not None:
+        print(f"\n{'=' * 60}")
+        print(f"  SUMMARY: {halt.message} [{total_time:.1f}s total]")
+        print(f"  Timing: {format_timing(report)}")
+        if halt.code == 2:
+            print(f"  Signaling loop to stop (exit 2)")
+        print(f"{'=' * 60}")
+        return halt.code
+
+    # Only stages that actually ran this cycle count as changes
+    changed_keys = {f"grade:{cfg['label']}": f"changed:{cfg['label']}" for cfg in SPORT_CONFIG}
+    changed_keys.update({"props:NHL": "changed:NHL props", "props:NBA": "changed:NBA props"})
+    changed_keys.update({f"props-live:{s}": f"changed:{s} props live" for s in PROPS_LIVE_CONFIG})
+    any_changes = any(artifacts.get(key) for name, key in changed_keys.items()
+                      if report[name]["status"] == "ok")
+
+    summaries = []
+    for cfg in SPORT_CONFIG:
+        sport = cfg["label"]
+        r = report[f"grade:{sport}"]
+        if r["status"] == "cached":
+            summaries.append(f"{sport}: unchanged since last cycle (skipped)")
+        elif r["status"] in ("error", "timeout", "blocked"):
+            summaries.append(f"{sport}: ERROR — {r['error']}")
+        else:
+            summaries.append(artifacts.get(f"summary:{sport}", f"{sport}: no summary"))
+
+    all_graded = artifacts.get("all_graded", False)
 
     print(f"\n{'=' * 60}")
     print(f"  SUMMARY {'(files updated)' if any_changes else '(no changes)'}")
     for s in summaries:
         print(f"    {s}")
-    print(f"  Timing: {total_time:.1f}s total (check: {check_time:.1f}s, API: {api_time:.1f}s, grade: {grade_time:.1f}s, props: {props_time:.1f}s)")
+    print(f"  Timing: {total_time:.1f}s total ({format_timing(report)})")
     if all_graded:
         print(f"  All games graded — signaling loop to stop (exit 2)")
     print(f"{'=' * 60}")
@@ -1816,7 +2226,7 @@ def main():
     # Exit code 3 = games ending soon (tells workflow loop to fast poll 30s)
     if all_graded:
         return 2
-    if _games_ending_soon(score_map):
+    if artifacts.get("ending_soon"):
         print(f"  Games ending soon — fast poll (exit 3)")
         return 3
     return 0
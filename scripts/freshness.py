@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""freshness.py — Header-only freshness and integrity check for every published file.
+
+health-check.yml used to json.load each projection file in full just to
+read its `date` and count its games. This reads only what it needs:
+
+  head   the first HEAD_BYTES, walked key by key with a bounded streaming
+         parse — leading scalars (date, updated, locked_at ...) are decoded,
+         containers are skipped with a bracket/string tokenizer and their
+         elements counted when they close inside the window (otherwise just
+         "non-empty"). Parsing stops at the window edge; nothing past it is
+         read or decoded.
+  tail   the last TAIL_BYTES: the document must close the way it opened
+         (a truncated write fails here), trailing scalars like mlb_results'
+         `updated` are picked up, and the newest day date of an ascending
+         `days` list is found.
+
+The file list is the File Manifest in PIPELINE.md (every backticked file in
+its tables), so results, recommended-picks and props files are covered along
+with the projections, and a file added there is checked without touching
+this script. Files are checked concurrently.
+
+Rules per manifest section:
+  Prediction / Recommended Picks   date must be today (EST), records non-empty
+                                   (recommended files may legitimately be empty)
+  Results                          reported with the newest graded day and its age
+  Live Score                       optional (only present on game days)
+
+Only the files health-check has always watched decide whether to re-trigger
+daily-predictions (needs_regen) or the NBA props refresh (needs_props).
+
+Usage:
+    python scripts/freshness.py [--today YYYY-MM-DD] [--out report.json] [--json] [--github-output]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST_DOC = "PIPELINE.md"
+HEAD_BYTES = 64 * 1024
+TAIL_BYTES = 64 * 1024
+EST = timezone(timedelta(hours=-5))
+
+REGEN_FILES = {
+    "game_projections.json": "NBA",
+    "nhl_game_projections.json": "NHL",
+    "ncaab_projections.json": "NCAAB",
+    "mlb_game_projections.json": "MLB",
+    "nba_player_projections.json": "NBA Players",
+    "projections.json": "NBA Props",
+}
+PROPS_FILES = {"projections.json"}
+
+# Manifest section → checks applied to its files
+SECTION_RULES = {
+    "Prediction Files": {"dated": True},
+    "Recommended Picks Files": {"dated": True, "allow_empty": True},
+    "Results Files": {"dated": False},
+    "Live Score Files": {"dated": False, "optional": True},
+}
+DATE_KEYS = ("date", "_date", "updated_at", "generated_at", "updated")
+UPDATED_KEYS = ("updated", "updated_at", "generated_at", "locked_at")
+RECORD_KEYS = ("games", "predictions", "projections", "props", "recommendations",
+               "picks", "teams", "days", "live")
+
+_WS = re.compile(r"\s*")
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{},]')
+_DAY_DATE = re.compile(r'"date"\s*:\s*"(\d{4}-\d{2}-\d{2})"')
+_TAIL_SCALAR = re.compile(r'"(\w+)"\s*:\s*("(?:[^"\\]|\\.)*"|-?\d[\d.eE+-]*|true|false|null)\s*\}\s*$')
+_MANIFEST_FILE = re.compile(r"`([^`/]+\.jsonl?)`")
+_DECODER = json.JSONDecoder()
+
+
+# ── Bounded streaming parse ──────────────────────────────────────
+
+
+def _skip_container(text, pos):
+    """Skip the array/object opening at text[pos].
+
+    Returns (end, count) with `end` just past the closing bracket, or
+    (None, None) if it doesn't close inside `text`.
+    """
+    empty = _first_char(text, pos + 1) in "]}"
+    depth, commas = 0, 0
+    for m in _TOKEN.finditer(text, pos):
+        tok = m.group()
+        if tok in "[{":
+            depth += 1
+        elif tok in "]}":
+            depth -= 1
+            if depth == 0:
+                return m.end(), (0 if empty else commas + 1)
+        elif tok == "," and depth == 1:
+            commas += 1
+    return None, None
+
+
+def _first_char(text, pos):
+    pos = _WS.match(text, pos).end()
+    return text[pos] if pos < len(text) else ""
+
+
+def read_header(text):
+    """Top-level keys of a JSON object prefix, in order.
+
+    Scalars map to their value; containers to {"type": "list"|"dict",
+    "count": n | None, "non_empty": bool | None}. Stops quietly at the end of
+    the window; raises ValueError if the prefix isn't a JSON object.
+    """
+    pos = _WS.match(text).end()
+    if not text.startswith("{", pos):
+        raise ValueError("not a JSON object")
+    pos += 1
+    fields = {}
+    while True:
+        pos = _WS.match(text, pos).end()
+        if pos >= len(text) or text[pos] == "}":
+            return fields
+        if text[pos] == ",":
+            pos += 1
+            continue
+        try:
+            key, pos = json.decoder.scanstring(text, pos + 1)
+        except (ValueError, IndexError):
+            if pos + 1 < len(text) and text.find('"', pos + 1) != -1:
+                raise ValueError(f"bad key at byte {pos}")
+            return fields  # key cut by the window edge
+        pos = _WS.match(text, pos).end()
+        if pos >= len(text):
+            return fields
+        if text[pos] != ":":
+            raise ValueError(f"expected ':' after {key!r}")
+        pos = _WS.match(text, pos + 1).end()
+        if pos >= len(text):
+            return fields
+        if text[pos] in "[{":
+            close = "]" if text[pos] == "[" else "}"
+            end, count = _skip_container(text, pos)
+            first = _first_char(text, pos + 1)
+            fields[key] = {"type": "list" if close == "]" else "dict", "count": count,
+                           "non_empty": (count > 0) if count is not None
+                           else (first != close if first else None)}
+            if end is None:
+                return fields
+            pos = end
+        else:
+            try:
+                fields[key], pos = _DECODER.raw_decode(text, pos)
+            except ValueError:
+                if len(text) - pos < 64:
+                    return fields  # scalar cut by the window edge
+                raise ValueError(f"bad value for {key!r}")
+
+
+def _read_window(path):
+    """(size, head text, tail text) — at most HEAD_BYTES + TAIL_BYTES read."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        head = f.read(HEAD_BYTES)
+        if size > HEAD_BYTES:
+            f.seek(max(HEAD_BYTES, size - TAIL_BYTES))
+            tail = f.read()
+        else:
+            tail = head
+    # A window may split a multi-byte character; that can only garble the edge
+    return size, head.decode("utf-8", "replace"), tail.decode("utf-8", "replace")
+
+
+# ── Checks ───────────────────────────────────────────────────────
+
+
+def _age_days(date, today):
+    try:
+        return (datetime.strptime(today, "%Y-%m-%d") - datetime.strptime(date[:10], "%Y-%m-%d")).days
+    except (TypeError, ValueError):
+        return None
+
+
+def _check_jsonl(path, report):
+    size, _, tail = _read_window(path)
+    report["bytes"] = size
+    lines = [ln for ln in tail.splitlines() if ln.strip()]
+    if size and lines:
+        try:
+            last = json.loads(lines[-1])
+        except ValueError:
+            report["issues"].append("last line is not valid JSON (truncated append?)")
+            return
+        stamp = next((last.get(k) for k in ("ts", "at", *UPDATED_KEYS) if isinstance(last, dict) and last.get(k)), None)
+        if stamp:
+            report["updated"] = stamp
+
+
+def check_file(path, section, today):
+    """Freshness/integrity report for one manifest file."""
+    name = os.path.basename(path)
+    rules = SECTION_RULES.get(section, {"dated": False})
+    report = {"file": name, "section": section, "exists": os.path.exists(path), "issues": []}
+    if not report["exists"]:
+        if not rules.get("optional") and not name.endswith(".jsonl"):
+            report["issues"].append("missing")
+        report["ok"] = not report["issues"]
+        return report
+    try:
+        if name.endswith(".jsonl"):
+            _check_jsonl(path, report)
+            report["ok"] = not report["issues"]
+            return report
+
+        size, head, tail = _read_window(path)
+        report["bytes"] = size
+        fields = read_header(head)
+        if size > len(head.encode("utf-8", "replace")):
+            m = _TAIL_SCALAR.search(tail)
+            if m and m.group(1) not in fields:
+                fields[m.group(1)] = json.loads(m.group(2))
+        if not tail.rstrip().endswith("}"):
+            report["issues"].append("truncated: document does not close")
+    except (OSError, ValueError) as e:
+        report["issues"].append(f"unreadable: {e}")
+        report["ok"] = False
+        return report
+
+    updated = next((fields[k] for k in UPDATED_KEYS if isinstance(fields.get(k), str)), None)
+    if updated:
+        report["updated"] = updated
+    rec_key = next((k for k in RECORD_KEYS if isinstance(fields.get(k), dict) and "type" in fields[k]), None)
+    if rec_key:
+        info = fields[rec_key]
+        report["records_key"] = rec_key
+        report["records"] = info["count"] if info["count"] is not None else (
+            "non-empty" if info["non_empty"] else info["non_empty"])
+
+    if rules["dated"]:
+        date = next((fields[k] for k in DATE_KEYS if isinstance(fields.get(k), str)), "")
+        report["date"] = date[:10]
+        if report["date"] != today:
+            report["issues"].append(f"date={report['date'] or None}, expected={today}")
+        elif rec_key is None:
+            report["issues"].append("no records")
+        elif report["records"] in (0, False) and not rules.get("allow_empty"):
+            report["issues"].append(f"0 {rec_key}")
+    elif "days" in fields:
+        days = _DAY_DATE.findall(head) + _DAY_DATE.findall(tail)
+        if days:
+            report["latest_day"] = max(days)
+    age_from = report.get("latest_day") or report.get("updated")
+    if age_from:
+        report["age_days"] = _age_days(age_from, today)
+    report["ok"] = not report["issues"]
+    return report
+
+
+def manifest(root=REPO_ROOT):
+    """[(file, section)] from the File Manifest tables in PIPELINE.md."""
+    out, section, seen = [], None, set()
+    in_manifest = False
+    with open(os.path.join(root, MANIFEST_DOC), "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("## "):
+                in_manifest = line.strip() == "## File Manifest"
+            elif in_manifest and line.startswith("### "):
+                section = line[4:].split("(")[0].strip()
+            elif in_manifest and line.startswith("|"):
+                first_cell = line.split("|")[1]
+                for name in _MANIFEST_FILE.findall(first_cell):
+                    if "YYYY" not in name and name not in seen:
+                        seen.add(name)
+                        out.append((name, section))
+    return out
+
+
+def run(root=REPO_ROOT, today=None, workers=8):
+    """Check every manifest file concurrently; returns the freshness report."""
+    today = today or datetime.now(EST).strftime("%Y-%m-%d")
+    files = manifest(root)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda fs: check_file(os.path.join(root, fs[0]), fs[1], today), files))
+    stale = [r["file"] for r in results if not r["ok"]]
+    return {
+        "checked_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "today": today,
+        "ok": not stale,
+        "needs_regen": any(f in REGEN_FILES for f in stale),
+        "needs_props": any(f in PROPS_FILES for f in stale),
+        "stale": stale,
+        "files": {r.pop("file"): r for r in results},
+    }
+
+
+def _print_summary(report):
+    for name, r in report["files"].items():
+        label = REGEN_FILES.get(name, name)
+        if r["ok"]:
+            if not r["exists"]:
+                continue
+            what = f"{r['records']} {r.get('records_key', '')}".strip() if "records" in r else ""
+            when = r.get("date") or r.get("latest_day") or r.get("updated", "")
+            print(f"OK: {label} — {what} {when}".rstrip())
+        else:
+            print(f"STALE: {label} — {'; '.join(r['issues'])}")
+    print("\nAll files current." if report["ok"] else
+          f"\n{len(report['stale'])} file(s) stale or invalid"
+          f"{' — regeneration needed' if report['needs_regen'] else ''}.")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Header-only freshness/integrity check of published files")
+    ap.add_argument("--today", help="expected date (default: today in EST)")
+    ap.add_argument("--root", default=REPO_ROOT)
+    ap.add_argument("--out", help="write the JSON report here")
+    ap.add_argument("--json", action="store_true", help="print the JSON report instead of a summary")
+    ap.add_argument("--github-output", action="store_true",
+                    help="append needs_regen/needs_props to $GITHUB_OUTPUT")
+    args = ap.parse_args(argv)
+
+    report = run(args.root, args.today)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        _print_summary(report)
+    if args.github_output:
+        with open(os.environ.get("GITHUB_OUTPUT", os.devnull), "a") as f:
+            f.write(f"needs_regen={'true' if report['needs_regen'] else 'false'}\n")
+            f.write(f"needs_props={'true' if report['needs_props'] else 'false'}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
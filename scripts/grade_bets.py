@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""grade_bets.py — Batch-grade user-tracked bets against one score map.
+
+The dashboards grade each user's pending bets in the browser
+(selfGradeFromScores / autoGradeHomeTrackedBets), re-deriving the same scores
+from every results file on every page load. This script does that work once:
+it builds a single in-memory index of final scores and prop actuals, then
+grades an entire bet export in one pass with O(1) lookups per bet.
+
+Score map (matchup "AWAY @ HOME", date) → (away_score, home_score), from:
+  - results files: graded picks and catch-up score-only entries ("110-105")
+  - projection files: games with status final/closed
+  - grade_journal.jsonl: game_final events
+
+Prop map (date, player, stat) → actual, from the props results files, prop
+picks in results.json, today's props files and journal prop_result events.
+Props settled early from a live box score are skipped: their actual is not
+final, so a bet on a different line could be misgraded.
+
+Bets are graded with their own pick details (a bet on the other side of the
+model's pick grades correctly). Game bets fall back to ±1 day like the
+frontend; props match the exact date only. Parlays grade leg by leg: any
+losing leg loses, pushed legs drop out, any pending leg keeps it pending.
+
+Input (JSON), any of:
+  [bet, ...]                                   a plain export
+  {"bets": [bet, ...]}
+  {"users": {uid: {"trackedBets": [...]}}}     Firestore users collection stand-in
+
+Usage:
+    python scripts/grade_bets.py BETS.json [--out GRADED.json] [--in-place] [--regrade]
+"""
+
+import argparse
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+from check_and_grade import (REPO_ROOT, SPORT_CONFIG, grade_ml, grade_spread, grade_total,
+                             load_json, save_json)
+from grade_journal import read_events
+
+SCORE_RE = re.compile(r"^(\d+)-(\d+)$")
+PROP_PICK_RE = re.compile(r"^(?:(.+?)\s+)?([A-Z0-9+]+)\s+(OVER|UNDER)\s+([\d.]+)$", re.I)
+
+# Frontend prop_type / market spellings → the stat labels the grader writes
+STAT_ALIASES = {
+    "POINTS": "PTS", "PLAYER_POINTS": "PTS", "REBOUNDS": "REB", "ASSISTS": "AST",
+    "PLAYER_ASSISTS": "AST", "THREES": "3PM", "STEALS": "STL", "BLOCKS": "BLK",
+    "TURNOVERS": "TO", "P+R": "PR", "P+A": "PA", "SHOTS_ON_GOAL": "SOG", "SHOTS": "SOG",
+    "PLAYER_SHOTS_ON_GOAL": "SOG", "GOALS": "GOALS", "PLAYER_GOALS": "GOALS",
+    "SAVES": "SAVES", "PLAYER_BLOCKED_SHOTS": "BLOCKED_SHOTS",
+    "PLAYER_POWER_PLAY_POINTS": "PPP",
+}
+
+PROPS_FILES = {"nhl_player_props.json": "projections", "all_props.json": "props",
+               "projections.json": "projections"}
+PROPS_RESULTS_FILES = ("all_props_results.json", "nhl_props_results.json")
+
+
+def _stat(s):
+    s = str(s or "").strip().upper().replace(" ", "_")
+    return STAT_ALIASES.get(s, s)
+
+
+def _shift(date, days):
+    return (datetime.strptime(date, "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+# ── Score / prop index ───────────────────────────────────────────
+
+
+class ScoreMap:
+    """Final scores and prop actuals indexed for constant-time lookups."""
+
+    def __init__(self):
+        self.games = {}  # (matchup, date) -> (away_score, home_score)
+        self.props = {}  # (date, player_lower, stat) -> actual
+
+    def add_game(self, matchup, date, away_score, home_score):
+        if matchup and date and away_score is not None and home_score is not None:
+            self.games[(matchup, date)] = (away_score, home_score)
+
+    def add_prop(self, date, player, stat, actual):
+        if date and player and stat and actual is not None:
+            try:
+                self.props[(date, player.strip().lower(), _stat(stat))] = float(actual)
+            except (TypeError, ValueError):
+                pass
+
+    def score(self, matchup, date):
+        """Exact date first, then ±1 day (late games land on the next day's file)."""
+        if not date:
+            return None
+        for d in (date, _shift(date, -1), _shift(date, 1)):
+            sc = self.games.get((matchup, d))
+            if sc:
+                return sc
+        return None
+
+    def prop_actual(self, date, player, stat):
+        if not (date and player):
+            return None
+        return self.props.get((date, player.strip().lower(), _stat(stat)))
+
+
+def build_score_map(root=REPO_ROOT):
+    """Load every scores source once into a ScoreMap."""
+    sm = ScoreMap()
+
+    for cfg in SPORT_CONFIG:
+        results = load_json(os.path.join(root, cfg["results_file"])) or {}
+        for day in results.get("days", []):
+            for p in day.get("picks", []):
+                date = p.get("date") or day.get("date")
+                if p.get("type") == "prop":
+                    m = PROP_PICK_RE.match(p.get("pick") or "")
+                    if m and isinstance(p.get("result"), (int, float)):
+                        sm.add_prop(date, p.get("player"), m.group(2), p["result"])
+                    continue
+                m = SCORE_RE.match(str(p.get("result") or ""))
+                if m and p.get("game"):
+                    sm.add_game(p["game"], date, int(m.group(1)), int(m.group(2)))
+
+        proj = load_json(os.path.join(root, cfg["proj_file"])) or {}
+        for g in proj.get("games", []):
+            if g.get("status") in ("final", "closed"):
+                sm.add_game(f"{g['away_team']} @ {g['home_team']}", proj.get("date"),
+                            g.get("away_score"), g.get("home_score"))
+
+    for fname in PROPS_RESULTS_FILES:
+        data = load_json(os.path.join(root, fname)) or {}
+        for day in data.get("days", []):
+            for p in day.get("picks", []):
+                if not p.get("settled_early"):
+                    sm.add_prop(p.get("date") or day.get("date"), p.get("player"), p.get("prop"),
+                                p.get("actual"))
+
+    for fname, list_key in PROPS_FILES.items():
+        data = load_json(os.path.join(root, fname)) or {}
+        date = data.get("_date") or data.get("date")
+        for p in data.get(list_key, []):
+            if p.get("result") and not p.get("settled_early"):
+                sm.add_prop(date, p.get("player"), p.get("prop"), p.get("actual"))
+
+    for e in read_events(os.path.join(root, "grade_journal.jsonl")):
+        if e["kind"] == "game_final":
+            away, _, home = e["key"].partition("@")
+            sm.add_game(f"{away} @ {home}", e["date"], e.get("away_score"), e.get("home_score"))
+        elif e["kind"] == "prop_result" and not e.get("settled_early"):
+            player, stat = e["key"].split("|")[:2]
+            sm.add_prop(e["date"], player, stat, e.get("actual"))
+    return sm
+
+
+# ── Grading ──────────────────────────────────────────────────────
+
+
+def bet_date(bet):
+    return bet.get("date") or (bet.get("placed_at") or "")[:10] or None
+
+
+def _fmt_actual(actual):
+    """Actual as the frontend stores it: "110-105" for games, "39" for props."""
+    if isinstance(actual, float) and actual.is_integer():
+        actual = int(actual)
+    return None if actual is None else str(actual)
+
+
+def _letter_to_status(r):
+    return {"W": "win", "L": "loss", "P": "push"}.get(r)
+
+
+def grade_game_bet(bet, sm, date):
+    """Grade a spread/total/ml bet from the final score. Returns (status, actual)."""
+    teams = (bet.get("game") or "").split(" @ ")
+    if len(teams) != 2:
+        return None, None
+    sc = sm.score(bet["game"], date)
+    if not sc:
+        return None, None
+    away_score, home_score = sc
+    game = {"away_team": teams[0], "home_team": teams[1]}
+    pick = (bet.get("pick") or "").strip()
+    btype = bet.get("type")
+
+    if btype == "spread":
+        m = re.match(r"^(\S+)\s*([+-]?\d+\.?\d*)$", pick)
+        if not m or m.group(1) not in teams:
+            return None, None
+        game["spread_pick"] = f"{m.group(1)} {m.group(2)}"
+        r = grade_spread(game, away_score, home_score)
+    elif btype == "total":
+        m = re.match(r"^(OVER|UNDER)\s+([\d.]+)", pick, re.I)
+        if not m:
+            return None, None
+        game.update(total_pick=m.group(1).upper(), total_line=float(m.group(2)))
+        r = grade_total(game, away_score, home_score)
+    elif btype == "ml":
+        team = pick.split()[0] if pick else ""
+        if team not in teams:
+            return None, None
+        game["ml_pick"] = team
+        r = "P" if away_score == home_score else grade_ml(game, away_score, home_score)
+    else:
+        return None, None
+    return _letter_to_status(r), f"{away_score}-{home_score}"
+
+
+def grade_prop_bet(bet, sm, date):
+    """Grade a player prop from the indexed actual (exact date only)."""
+    player, stat = bet.get("player"), bet.get("prop_type") or bet.get("market") or bet.get("stat_type")
+    direction, line = (bet.get("direction") or "").upper(), bet.get("line")
+    m = PROP_PICK_RE.match((bet.get("pick") or "").strip())
+    if m:
+        player = player or (m.group(1) or "").strip()
+        stat = stat or m.group(2)
+        direction = direction or m.group(3).upper()
+        line = line if line is not None else m.group(4)
+    try:
+        line = float(line)
+    except (TypeError, ValueError):
+        return None, None
+    if direction not in ("OVER", "UNDER"):
+        return None, None
+    actual = sm.prop_actual(date, player, stat)
+    if actual is None:
+        return None, None
+    if actual == line:
+        return "push", actual
+    won = actual > line if direction == "OVER" else actual < line
+    return ("win" if won else "loss"), actual
+
+
+def _decimal_odds(odds):
+    o = int(odds)
+    return 1 + (o / 100 if o > 0 else 100 / abs(o))
+
+
+def calc_profit(odds, units):
+    """Same payout math as the dashboards' calcProfit (American odds)."""
+    try:
+        return round(units * (_decimal_odds(odds) - 1), 2)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return 0
+
+
+def grade_parlay(bet, sm, date):
+    """All legs must win; pushes drop out; any pending leg keeps it pending."""
+    legs = bet.get("legs") or []
+    if not legs:
+        return None, None, None
+    statuses = []
+    for leg in legs:
+        status, actual = grade_single(leg, sm, bet_date(leg) or date)
+        leg_status = status or "pending"
+        if leg.get("status") != leg_status:
+            leg["status"] = leg_status
+            leg["actual"] = _fmt_actual(actual)
+        statuses.append(leg_status)
+    if "loss" in statuses:
+        return "loss", None, None
+    if "pending" in statuses:
+        return None, None, None
+    live = [leg for leg, s in zip(legs, statuses) if s == "win"]
+    if not live:
+        return "push", None, None
+    if all(leg.get("odds") not in (None, "") for leg in live):
+        try:
+            price = 1.0
+            for leg in live:
+                price *= _decimal_odds(leg["odds"])
+            return "win", None, price - 1
+        except (TypeError, ValueError, ZeroDivisionError):
+            pass
+    return "win", None, None
+
+
+def grade_single(bet, sm, date):
+    if bet.get("type") == "prop":
+        return grade_prop_bet(bet, sm, date)
+    return grade_game_bet(bet, sm, date)
+
+
+def grade_bet(bet, sm, graded_at):
+    """Grade one bet in place. Returns True if it changed."""
+    date = bet_date(bet)
+    payout = None
+    if bet.get("type") == "parlay":
+        status, actual, payout = grade_parlay(bet, sm, date)
+    else:
+        status, actual = grade_single(bet, sm, date)
+    if status is None:
+        return False
+    units = float(bet.get("units") or 1)
+    if status == "win":
+        profit = round(units * payout, 2) if payout is not None else calc_profit(bet.get("odds") or -110, units)
+    elif status == "loss":
+        profit = -units
+    else:
+        profit = 0
+    actual = _fmt_actual(actual)
+    if (bet.get("status"), bet.get("actual"), bet.get("profit_units")) == (status, actual, profit):
+        return False
+    bet.update(status=status, actual=actual, profit_units=profit, graded_at=graded_at)
+    return True
+
+
+def iter_bet_lists(export):
+    """Yield (owner, bets list) for each supported export shape."""
+    if isinstance(export, list):
+        yield None, export
+    elif isinstance(export, dict) and isinstance(export.get("bets"), list):
+        yield None, export["bets"]
+    elif isinstance(export, dict) and isinstance(export.get("users"), dict):
+        for uid, doc in export["users"].items():
+            if isinstance(doc, dict) and isinstance(doc.get("trackedBets"), list):
+                yield uid, doc["trackedBets"]
+
+
+def grade_export(export, sm, regrade=False):
+    """Grade every pending (or, with regrade, every) bet in the export in place."""
+    graded_at = datetime.now().isoformat(timespec="seconds")
+    counts = {"users": 0, "bets": 0, "graded": 0, "win": 0, "loss": 0, "push": 0, "pending": 0}
+    for _, bets in iter_bet_lists(export):
+        counts["users"] += 1
+        for bet in bets:
+            if not isinstance(bet, dict):
+                continue
+            counts["bets"] += 1
+            if bet.get("status", "pending") != "pending" and not regrade:
+                continue
+            if grade_bet(bet, sm, graded_at):
+                counts["graded"] += 1
+            counts[bet.get("status") if bet.get("status") in counts else "pending"] += 1
+    return counts
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch-grade user-tracked bets")
+    ap.add_argument("bets", help="bet export JSON (list, {bets}, or {users:{uid:{trackedBets}}})")
+    ap.add_argument("--out", help="write the graded export here")
+    ap.add_argument("--in-place", action="store_true", help="overwrite the input file")
+    ap.add_argument("--regrade", action="store_true", help="regrade already-settled bets too")
+    args = ap.parse_args()
+
+    export = load_json(args.bets)
+    if export is None:
+        print(f"  Cannot read bet export {args.bets}")
+        return 1
+    sm = build_score_map()
+    print(f"  Score map: {len(sm.games)} final game(s), {len(sm.props)} prop actual(s)")
+    counts = grade_export(export, sm, regrade=args.regrade)
+    print(f"  Bets: {counts['bets']} across {counts['users']} list(s), {counts['graded']} newly graded "
+          f"({counts['win']}W-{counts['loss']}L-{counts['push']}P, {counts['pending']} still pending)")
+
+    out = args.bets if args.in_place else args.out
+    if out:
+        save_json(out, export)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""grade_io.py — Shared read/write and tally helpers for the graded JSON files.
+
+Used by the grader (check_and_grade.py), the git merge driver (merge_json.py)
+and the results store, so the driver can run without the grader's network
+and NumPy dependencies:
+
+  load_json / save_json   read and (canonically, diff-minimally) write a file
+  _tally / _make_stat     W-L-P of a pick list and its day stat block
+  _sum_cat                allTime stats (with flat -110 ROI) of one category
+  tag_best_bets           flag a day's top game picks by confidence
+
+Stdlib only (orjson used through json_codec when installed).
+"""
+
+import json
+import os
+
+import grade_metrics
+import json_codec
+from json_canonical import canonicalize
+
+# Canonical (diff-minimal) JSON writes: keep on-disk key/record order and
+# timestamps unless content changed. GRADE_CANONICAL_JSON=0 writes plain dumps.
+CANONICAL_JSON = os.environ.get("GRADE_CANONICAL_JSON", "1") != "0"
+
+BEST_BETS_PER_DAY = 5
+
+
+# ── Stats ────────────────────────────────────────────────────────
+
+
+def _tally(picks_list):
+    w = sum(1 for p in picks_list if p.get("hit") is True)
+    l = sum(1 for p in picks_list if p.get("hit") is False)
+    ps = sum(1 for p in picks_list if p.get("hit") is None)
+    return w, l, ps
+
+
+def _make_stat(w, l, ps=0):
+    t = w + l
+    pct_val = round(w / t * 100, 1) if t > 0 else 0
+    record = f"{w}-{l}-{ps}" if ps else f"{w}-{l}"
+    return {"wins": w, "losses": l, "pushes": ps, "record": record, "pct": pct_val}
+
+
+def _sum_cat(days_list, cat):
+    """Sum a category across all days and compute allTime stats with ROI."""
+    w = sum(d.get(cat, {}).get("wins", 0) for d in days_list)
+    l = sum(d.get(cat, {}).get("losses", 0) for d in days_list)
+    p = sum(d.get(cat, {}).get("pushes", 0) for d in days_list)
+    t = w + l
+    pct_val = round(w / t * 100, 1) if t > 0 else 0
+    profit = w * 90.91 - l * 100
+    roi = round(profit / (t * 100) * 100, 1) if t > 0 else 0
+    return {"wins": w, "losses": l, "pushes": p, "pct": pct_val, "roi": roi}
+
+
+def tag_best_bets(game_picks):
+    """Flag the top BEST_BETS_PER_DAY game picks by confidence (ties keep list
+    order) as best_bet and clear the flag on the rest, in place."""
+    by_conf = sorted(game_picks, key=lambda p: p.get("confidence") or 0, reverse=True)
+    for i, p in enumerate(by_conf):
+        if i < BEST_BETS_PER_DAY:
+            p["best_bet"] = True
+        else:
+            p.pop("best_bet", None)
+    return game_picks
+
+
+# ── Files ────────────────────────────────────────────────────────
+
+
+def load_json(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        return json_codec.load(path)
+    except (json.JSONDecodeError, ValueError) as e:
+        print(f"  Warning: invalid JSON in {path}: {e}")
+        return None
+
+
+def save_json(path, data, canonical=None, compact=False):
+    """Write a JSON output file. Returns False if the write was refused.
+
+    In canonical mode (default) the document is made diff-minimal against the
+    copy on disk (see json_canonical.py) and not rewritten at all when nothing
+    but timestamps would change. NaN/Inf are written as null (json_codec);
+    compact=True drops the indentation, for files only machines read.
+    """
+    if canonical is None:
+        canonical = CANONICAL_JSON
+    existing = None
+    if os.path.exists(path) and ("games" in data or canonical):
+        try:
+            existing = json_codec.load(path)
+        except Exception:
+            pass  # can't read existing file, proceed with save
+
+    # Safety guard: never reduce game count in projection files
+    if "games" in data and isinstance(existing, dict):
+        old_count = len(existing.get("games", []))
+        new_count = len(data.get("games", []))
+        if new_count < old_count:
+            print(f"  WARNING: Refusing to save {os.path.basename(path)} — "
+                  f"would reduce games from {old_count} to {new_count}")
+            grade_metrics.FILE_WRITES.inc(file=os.path.basename(path), result="refused")
+            return False
+
+    if canonical and existing is not None:
+        data = canonicalize(data, existing)
+        if data == existing:
+            # nothing material changed — keep the file (and its diff) untouched
+            grade_metrics.FILE_WRITES.inc(file=os.path.basename(path), result="unchanged")
+            return True
+    size = json_codec.dump(data, path, compact=compact)
+    grade_metrics.FILE_WRITES.inc(file=os.path.basename(path), result="written")
+    grade_metrics.BYTES_WRITTEN.inc(size, file=os.path.basename(path))
+    return True
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""grade_journal.py — Append-only journal of grading outcomes.
+
+Every outcome the grader produces is appended to grade_journal.jsonl as one
+compact JSON line with a stable content ID and the time it was journaled ("at",
+Unix seconds):
+
+  game_final   {sport, date, key: "AWAY@HOME", away_score, home_score, *_result}
+  pick_result  {sport, date, key: "spread|DAL @ BOS", pick: {...results entry}}
+               (also "score|DAL @ BOS" for catch-up score-only entries)
+  prop_result  {sport, src: "all_props.json", date, key: "player|prop|dir|line",
+                result, actual, settled_early?}
+
+Appending an outcome that is already the latest for its key is a no-op (same
+ID); going back to an earlier value is journaled again, with a new "at". The
+latest event per key (by "at", then journal order) supersedes earlier ones
+(e.g. a corrected final score).
+
+`materialize()` replays the journal onto the projection, props and results
+files. It is offline (no ESPN calls) and idempotent: a second run finds
+nothing to change and writes nothing. After a lost push or
+`git reset --hard`, merging the local journal back and materializing
+restores every grade without a regrade.
+
+`compact()` keeps the journal bounded: it rewrites it with only the latest
+event per key of the last KEEP_DAYS days (GRADE_JOURNAL_DAYS, default 7).
+Older days are settled — the results files and the daily archive snapshots
+hold their outcomes — so replaying them would change nothing. The grading
+workflow compacts once per run.
+
+Usage:
+    python scripts/grade_journal.py materialize
+    python scripts/grade_journal.py merge OTHER_JOURNAL   # union + materialize
+    python scripts/grade_journal.py compact [DAYS]
+    python scripts/grade_journal.py stats
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOURNAL_PATH = os.path.join(REPO_ROOT, "grade_journal.jsonl")
+KEEP_DAYS = int(os.environ.get("GRADE_JOURNAL_DAYS", "7"))
+
+# Props files the grader writes → key of their props list
+PROP_SOURCES = {
+    "nhl_player_props.json": "projections",
+    "all_props.json": "props",
+    "projections.json": "projections",
+}
+
+_lock = threading.Lock()
+_cache = {}  # journal path -> {"sig": (size, mtime), "seen": {(id, at)}, "latest": {key: (at, id)}}
+
+
+# ── Events ───────────────────────────────────────────────────────
+
+
+def _event(kind, sport, date, key, payload, src=None):
+    ident = [kind, sport, src, date, key, payload]
+    blob = json.dumps(ident, sort_keys=True, default=str, separators=(",", ":"))
+    event = {"id": hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16], "at": round(time.time(), 3),
+             "kind": kind, "sport": sport, "date": date, "key": key}
+    if src:
+        event["src"] = src
+    event.update(payload)
+    return event
+
+
+def prop_key(p):
+    """Same identity the results files use: player|prop|direction|line."""
+    return f"{p.get('player')}|{p.get('prop')}|{p.get('direction')}|{p.get('line')}"
+
+
+def game_final_event(sport, date, g):
+    return _event("game_final", sport, date, f"{g['away_team']}@{g['home_team']}", {
+        "away_score": g.get("away_score"), "home_score": g.get("home_score"),
+        "spread_result": g.get("spread_result"), "total_result": g.get("total_result"),
+        "ml_result": g.get("ml_result"),
+    })
+
+
+def pick_result_event(sport, date, pick):
+    entry = {k: v for k, v in pick.items() if k != "best_bet"}
+    return _event("pick_result", sport, date, f"{pick['type']}|{pick['game']}", {"pick": entry})
+
+
+def prop_result_event(sport, src, date, p):
+    payload = {"result": p.get("result"), "actual": p.get("actual")}
+    if p.get("settled_early"):
+        payload["settled_early"] = True  # graded from a live box score
+    return _event("prop_result", sport, date, prop_key(p), payload, src=src)
+
+
+# ── Journal I/O ──────────────────────────────────────────────────
+
+
+def read_events(path=JOURNAL_PATH):
+    """Return all well-formed events in journal order."""
+    events = []
+    if not os.path.exists(path):
+        return events
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                e = json.loads(line)
+            except ValueError:
+                continue  # torn write or merge debris — skip
+            if isinstance(e, dict) and "id" in e and "kind" in e:
+                events.append(e)
+    return events
+
+
+def _event_key(e):
+    return (e["kind"], e["sport"], e.get("src"), e["date"], e["key"])
+
+
+def _file_sig(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _journal_index(path):
+    """Cached (id, at) pairs and latest (at, id) per key of the journal at
+    `path`, re-read whenever the file changed under us (git reset, a pull, a
+    merge, another process)."""
+    sig = _file_sig(path)
+    cached = _cache.get(path)
+    if cached is None or cached["sig"] != sig:
+        seen, latest = set(), {}
+        for e in read_events(path):
+            at = e.get("at", 0)
+            seen.add((e["id"], at))
+            k = _event_key(e)
+            if k not in latest or at >= latest[k][0]:
+                latest[k] = (at, e["id"])
+        cached = _cache[path] = {"sig": sig, "seen": seen, "latest": latest}
+    return cached
+
+
+def append_events(events, path=JOURNAL_PATH):
+    """Append events that change their key's latest outcome (and are not
+    already journaled with the same time). Returns count written."""
+    if not events:
+        return 0
+    with _lock:
+        index = _journal_index(path)
+        seen, latest = index["seen"], index["latest"]
+        new = []
+        for e in sorted(events, key=lambda e: e.get("at", 0)):
+            at = e.get("at", 0)
+            k = _event_key(e)
+            cur = latest.get(k)
+            if (e["id"], at) in seen or (cur is not None and cur[1] == e["id"]):
+                continue  # same line already on disk, or already the latest outcome
+            seen.add((e["id"], at))
+            if cur is None or at >= cur[0]:
+                latest[k] = (at, e["id"])
+            new.append(e)
+        if new:
+            with open(path, "a", encoding="utf-8") as f:
+                for e in new:
+                    f.write(json.dumps(e, separators=(",", ":"), default=str) + "\n")
+            index["sig"] = _file_sig(path)
+    return len(new)
+
+
+def record_game_finals(sport, date, games, picks, path=JOURNAL_PATH):
+    """Journal newly final games and the picks graded from them."""
+    events = [game_final_event(sport, date, g) for g in games]
+    events += [pick_result_event(sport, date, p) for p in picks]
+    return append_events(events, path)
+
+
+def record_prop_results(sport, src, date, props, path=JOURNAL_PATH):
+    """Journal newly graded props from one props file."""
+    events = [prop_result_event(sport, src, date, p) for p in props if p.get("result")]
+    return append_events(events, path)
+
+
+def record_score_picks(sport, date, picks, path=JOURNAL_PATH):
+    """Journal catch-up score-only entries (no game_final: the projection is gone)."""
+    return append_events([pick_result_event(sport, date, p) for p in picks], path)
+
+
+def compact(path=JOURNAL_PATH, keep_days=KEEP_DAYS, today=None):
+    """Rewrite the journal with the latest event per key of the last
+    `keep_days` days, in journal order. Returns (events before, after)."""
+    today = today or datetime.now().strftime("%Y-%m-%d")
+    cutoff = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=keep_days)).strftime("%Y-%m-%d")
+    with _lock:
+        events = read_events(path)
+        order = {id(e): i for i, e in enumerate(events)}
+        keep = sorted((e for e in _latest(events).values() if (e.get("date") or "") >= cutoff),
+                      key=lambda e: order[id(e)])
+        if len(keep) < len(events):
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for e in keep:
+                    f.write(json.dumps(e, separators=(",", ":"), default=str) + "\n")
+            os.replace(tmp, path)
+            _cache.pop(path, None)
+    return len(events), len(keep)
+
+
+# ── Materialization ──────────────────────────────────────────────
+
+
+def _latest(events):
+    """Latest event per (kind, sport, src, date, key): highest "at", then the
+    last in journal order (events from before "at" count as 0)."""
+    latest = {}
+    for e in sorted(events, key=lambda e: e.get("at", 0)):
+        latest[_event_key(e)] = e
+    return latest
+
+
+def _materialize_games(cg, latest):
+    """Apply game_final events to the current projection files."""
+    changed_files = 0
+    for cfg in cg.SPORT_CONFIG:
+        proj_path = os.path.join(REPO_ROOT, cfg["proj_file"])
+        proj_data = cg.load_json(proj_path)
+        if not proj_data or not proj_data.get("games"):
+            continue
+        date = proj_data.get("date")
+        changed = False
+        for g in proj_data["games"]:
+            e = latest.get(("game_final", cfg["label"], None, date, f"{g['away_team']}@{g['home_team']}"))
+            if not e:
+                continue
+            update = {"status": "final"}
+            for k in ("away_score", "home_score", "spread_result", "total_result", "ml_result"):
+                update[k] = e.get(k)
+            if any(g.get(k) != v for k, v in update.items()):
+                g.update(update)
+                changed = True
+        if changed:
+            cg.save_json(proj_path, proj_data)
+            changed_files += 1
+    return changed_files
+
+
+def _materialize_results(cg, latest):
+    """Rebuild results days that the journal has picks for."""
+    by_day = {}
+    for (kind, sport, _, date, key), e in latest.items():
+        if kind == "pick_result":
+            by_day.setdefault((sport, date), {})[key] = e["pick"]
+
+    cfg_by_sport = {cfg["label"]: cfg for cfg in cg.SPORT_CONFIG}
+    rebuilt = 0
+    for (sport, date), journal_picks in sorted(by_day.items()):
+        cfg = cfg_by_sport.get(sport)
+        if not cfg:
+            continue
+        results_path = os.path.join(REPO_ROOT, cfg["results_file"])
+        results = cg.load_json(results_path) or {}
+        existing = {}
+        for d in results.get("days", []):
+            if d.get("date") == date:
+                for p in d.get("picks", []):
+                    if p.get("type") in ("spread", "total", "ml", "score"):
+                        existing[f"{p['type']}|{p['game']}"] = {k: v for k, v in p.items() if k != "best_bet"}
+                break
+        merged = dict(existing)
+        for key, pick in journal_picks.items():
+            merged[key] = {**existing.get(key, {}), **pick}
+        graded = {p.get("game") for p in merged.values() if p.get("type") != "score"}
+        merged = {k: p for k, p in merged.items()
+                  if p.get("type") != "score" or p.get("game") not in graded}  # superseded catch-up
+        if merged == existing:
+            continue
+        picks = [dict(p) for p in merged.values()]
+        cg.RESULTS_WRITERS[cfg["results_schema"]](picks, date, results_path)
+        rebuilt += 1
+    return rebuilt
+
+
+def _props_date(src, data):
+    if src == "all_props.json":
+        return data.get("_date") or data.get("date")
+    return data.get("date")
+
+
+def _materialize_props(cg, latest):
+    """Apply prop_result events to today's props files and their results."""
+    changed_files = 0
+    for src, list_key in PROP_SOURCES.items():
+        path = os.path.join(REPO_ROOT, src)
+        data = cg.load_json(path)
+        if not data or not data.get(list_key):
+            continue
+        props = data[list_key]
+        date = _props_date(src, data)
+        sport = "NHL" if src.startswith("nhl_") else "NBA"
+        changed = False
+        for p in props:
+            e = latest.get(("prop_result", sport, src, date, prop_key(p)))
+            if e and (p.get("result") != e.get("result") or p.get("actual") != e.get("actual")
+                      or bool(p.get("settled_early")) != bool(e.get("settled_early"))):
+                p["result"] = e.get("result")
+                p["actual"] = e.get("actual")
+                if e.get("settled_early"):
+                    p["settled_early"] = True
+                else:
+                    p.pop("settled_early", None)
+                changed = True
+        if not changed:
+            continue
+        cg.save_json(path, data)
+        changed_files += 1
+        if src == "nhl_player_props.json":
+            cg._update_nhl_props_results(props, date, os.path.join(REPO_ROOT, "nhl_props_results.json"))
+        elif src == "all_props.json":
+            cg._write_nba_props_results(all_props_data=data)
+        else:
+            cg._write_nba_props_results(proj_props_data=data)
+    return changed_files
+
+
+def materialize(path=JOURNAL_PATH):
+    """Replay the journal onto projection, props and results files (offline).
+
+    Returns dict of counts; all zero when files already reflect the journal.
+    """
+    import check_and_grade as cg  # deferred: check_and_grade imports this module
+
+    latest = _latest(read_events(path))
+    summary = {
+        "events": len(latest),
+        "projection_files": _materialize_games(cg, latest),
+        "results_days": _materialize_results(cg, latest),
+        "props_files": _materialize_props(cg, latest),
+    }
+    print(f"  Journal: {summary['events']} outcomes → {summary['projection_files']} projection file(s), "
+          f"{summary['results_days']} results day(s), {summary['props_files']} props file(s) updated")
+    return summary
+
+
+def main(argv):
+    cmd = argv[1] if len(argv) > 1 else "materialize"
+    if cmd == "materialize":
+        materialize()
+        return 0
+    if cmd == "merge" and len(argv) > 2:
+        added = append_events(read_events(argv[2]))
+        print(f"  Journal: merged {added} new event(s) from {argv[2]}")
+        materialize()
+        return 0
+    if cmd == "compact":
+        before, after = compact(keep_days=int(argv[2]) if len(argv) > 2 else KEEP_DAYS)
+        print(f"  Journal: compacted {before} → {after} event(s)")
+        return 0
+    if cmd == "stats":
+        counts = {}
+        for e in read_events():
+            counts[(e["kind"], e["sport"])] = counts.get((e["kind"], e["sport"]), 0) + 1
+        for (kind, sport), n in sorted(counts.items()):
+            print(f"  {sport:6s} {kind:12s} {n}")
+        return 0
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""grade_latency.py — Time-to-grade tracking, from ESPN final to committed result.
+
+Four moments are stamped for every game, and for every batch of props
+graded together from one game:
+
+  live     last poll that still saw the game in progress
+  final    first poll that saw STATUS_FINAL (ESPN went final in (live, final])
+  graded   grade_sport / the props graders wrote the result
+  done     the heartbeat after that iteration's commit + push
+
+In-flight stamps live in .grade_cache/latency_pending.json (local, survives
+the loop's `git reset --hard`). The heartbeat step stamps `done`; the next
+grading cycle (or the end of the loop) moves completed entries into the
+committed rolling log grade_latency.jsonl, one compact line each:
+
+  {"kind": "game", "sport", "date", "key": "AWAY@HOME", "final": ISO-Z,
+   "poll_s", "grade_s", "commit_s"}
+  {"kind": "props", ..., "key": "AWAY@HOME", "src", "n", "early"?}
+
+poll_s = final - live (polling gap), grade_s = graded - final,
+commit_s = done - graded. Props settled early from a live box score have no
+final yet and are counted but left out of the lag percentiles. Days older
+than ROLLING_DAYS are dropped from the log.
+
+Usage:
+    python scripts/grade_latency.py report [--days 7] [--json]   # p50/p95/p99 per sport
+    python scripts/grade_latency.py stamp                         # heartbeat: mark graded entries done
+    python scripts/grade_latency.py flush                         # move done entries into the log
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import grade_metrics
+import json_codec
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_PATH = os.path.join(REPO_ROOT, "grade_latency.jsonl")
+PENDING_PATH = os.environ.get("GRADE_LATENCY_PENDING",
+                              os.path.join(REPO_ROOT, ".grade_cache", "latency_pending.json"))
+ROLLING_DAYS = 30
+PENDING_DAYS = 2  # entries (and logged games kept for prop lookups) older than this are dropped
+PERCENTILES = (50, 95, 99)
+LAGS = ("poll_s", "grade_s", "commit_s", "total_s")
+
+_lock = threading.Lock()
+_state = None
+_polled = {}  # sport -> time of this cycle's scoreboard fetch
+
+
+def _load():
+    global _state
+    if _state is None:
+        try:
+            with open(PENDING_PATH, "r", encoding="utf-8") as f:
+                _state = json.load(f)
+        except (OSError, ValueError):
+            _state = {}
+        _state.setdefault("games", {})
+        _state.setdefault("props", {})
+        _state.setdefault("seen", {})
+    return _state
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# ── Stamps (called from check_and_grade) ─────────────────────────
+
+
+def polled(sport, at=None):
+    """Remember when this cycle's scoreboard for `sport` was fetched."""
+    _polled[sport] = int(at or time.time())
+
+
+def games_live(sport, date, keys):
+    """Stamp the in-progress games seen on this cycle's scoreboard."""
+    if not keys:
+        return
+    at = _polled.get(sport, int(time.time()))
+    with _lock:
+        games = _load()["games"]
+        for key in keys:
+            g = games.setdefault(f"{sport}|{date}|{key}", {})
+            if "final" not in g:
+                g["live"] = at
+
+
+def games_graded(sport, date, games_list):
+    """Stamp games that went final and were written to the results file."""
+    now = int(time.time())
+    at = _polled.get(sport, now)
+    with _lock:
+        games = _load()["games"]
+        for g in games_list:
+            entry = games.setdefault(f"{sport}|{date}|{g['away_team']}@{g['home_team']}", {})
+            entry.setdefault("final", at)
+            if "graded" not in entry:
+                entry["graded"] = now
+                grade_metrics.GRADE_LAG.observe(now - entry["final"], sport=sport, kind="game")
+
+
+def _game_for(sport, date, team, opponent):
+    for key in (f"{team}@{opponent}", f"{opponent}@{team}"):
+        if f"{sport}|{date}|{key}" in _state["games"]:
+            return key
+    return f"{team}@{opponent}" if team and opponent else ""
+
+
+def props_graded(sport, src, date, props):
+    """Stamp a batch of props written by a props grader (first grade of each prop only)."""
+    now = int(time.time())
+    with _lock:
+        state = _load()
+        seen = set(state["seen"].get(f"{sport}|{src}|{date}", []))
+        for p in props:
+            pk = f"{p.get('player')}|{p.get('prop')}|{p.get('direction')}|{p.get('line')}"
+            if pk in seen:
+                continue
+            seen.add(pk)
+            game = _game_for(sport, date, p.get("team", ""), p.get("opponent", ""))
+            early = 1 if p.get("settled_early") else 0
+            final = state["games"].get(f"{sport}|{date}|{game}", {}).get("final")
+            if final and not early:
+                grade_metrics.GRADE_LAG.observe(now - final, sport=sport, kind="props")
+            entry = state["props"].setdefault(f"{sport}|{src}|{date}|{game}|{now}|{early}",
+                                              {"graded": now, "n": 0})
+            entry["n"] += 1
+        state["seen"][f"{sport}|{src}|{date}"] = sorted(seen)
+
+
+# ── Heartbeat / log ──────────────────────────────────────────────
+
+
+def _save():
+    os.makedirs(os.path.dirname(PENDING_PATH), exist_ok=True)
+    tmp = PENDING_PATH + ".tmp"
+    json_codec.dump(_state, tmp, compact=True)
+    os.replace(tmp, PENDING_PATH)
+
+
+def stamp(at=None):
+    """Heartbeat: mark every graded, not-yet-done entry as committed now."""
+    at = int(at or time.time())
+    with _lock:
+        state = _load()
+        n = 0
+        for entry in list(state["games"].values()) + list(state["props"].values()):
+            if "graded" in entry and "done" not in entry:
+                entry["done"] = at
+                n += 1
+        _save()
+    return n
+
+
+def _log_lines(state):
+    """Pop completed entries from `state` as log records."""
+    out = []
+    for ident, g in state["games"].items():
+        if "done" in g and not g.get("logged"):
+            sport, date, key = ident.split("|", 2)
+            out.append({"kind": "game", "sport": sport, "date": date, "key": key,
+                        "final": _iso(g["final"]),
+                        "poll_s": g["final"] - g["live"] if "live" in g else None,
+                        "grade_s": g["graded"] - g["final"], "commit_s": g["done"] - g["graded"]})
+            g["logged"] = 1  # kept until pruned: later prop batches look up its final
+    for ident in [i for i, e in state["props"].items() if "done" in e]:
+        e = state["props"].pop(ident)
+        sport, src, date, game, _, early = ident.split("|")
+        g = state["games"].get(f"{sport}|{date}|{game}", {})
+        rec = {"kind": "props", "sport": sport, "date": date, "key": game, "src": src, "n": e["n"]}
+        if early == "1":
+            rec["early"] = 1
+        elif "final" in g:
+            rec.update(final=_iso(g["final"]), grade_s=e["graded"] - g["final"],
+                       commit_s=e["done"] - e["graded"])
+        else:
+            rec["commit_s"] = e["done"] - e["graded"]
+        out.append(rec)
+    return out
+
+
+def _prune(state, today):
+    cutoff = (today - timedelta(days=PENDING_DAYS)).strftime("%Y-%m-%d")
+    for section in ("games", "props", "seen"):
+        for ident in [i for i in state[section] if i.split("|")[1 + (section != "games")] < cutoff]:
+            del state[section][ident]
+
+
+def read_log(path=LOG_PATH):
+    rows = []
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue  # torn write or merge debris
+    return rows
+
+
+def flush(path=LOG_PATH, today=None):
+    """Move done entries into the rolling log; returns the number of new lines."""
+    today = today or datetime.now()
+    with _lock:
+        state = _load()
+        new = _log_lines(state)
+        _prune(state, today)
+        _save()
+    if not new:
+        return 0
+    cutoff = (today - timedelta(days=ROLLING_DAYS)).strftime("%Y-%m-%d")
+    rows = [r for r in read_log(path) if r.get("date", "") >= cutoff] + new
+    rows.sort(key=lambda r: (r["date"], r["sport"], r.get("final") or "", r["kind"], r["key"]))
+    lines = dict.fromkeys(  # de-duplicates lines a union merge may have doubled
+        json.dumps({k: v for k, v in r.items() if v is not None}, separators=(",", ":")) for r in rows)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(line + "\n" for line in lines)
+    os.replace(tmp, path)
+    return len(new)
+
+
+def checkpoint():
+    """End of a grading cycle: log what the last heartbeat completed, persist the rest."""
+    if _state is None and not os.path.exists(PENDING_PATH):
+        return 0
+    return flush()
+
+
+# ── Report ───────────────────────────────────────────────────────
+
+
+def _percentile(weighted, q):
+    """Nearest-rank percentile of [(value, weight)]."""
+    weighted = sorted(weighted)
+    total = sum(w for _, w in weighted)
+    rank = max(1, math.ceil(q / 100 * total))
+    seen = 0
+    for v, w in weighted:
+        seen += w
+        if seen >= rank:
+            return v
+    return None
+
+
+def report(rows, days=None, today=None):
+    """{sport: {"game"|"props": {"n", "early"?, lag: {"p50", "p95", "p99"}}}}."""
+    if days:
+        cutoff = ((today or datetime.now()) - timedelta(days=days)).strftime("%Y-%m-%d")
+        rows = [r for r in rows if r.get("date", "") >= cutoff]
+    groups = {}
+    for r in rows:
+        w = r.get("n", 1)
+        g = groups.setdefault(r["sport"], {}).setdefault(r["kind"], {"n": 0, "lags": {}})
+        g["n"] += w
+        if r.get("early"):
+            g["early"] = g.get("early", 0) + w
+            continue
+        lags = dict(r)
+        if r.get("grade_s") is not None and r.get("commit_s") is not None:
+            lags["total_s"] = r["grade_s"] + r["commit_s"]
+        for lag in LAGS:
+            if lags.get(lag) is not None:
+                g["lags"].setdefault(lag, []).append((lags[lag], w))
+    out = {}
+    for sport, kinds in sorted(groups.items()):
+        for kind, g in sorted(kinds.items()):
+            entry = {"n": g["n"]}
+            if g.get("early"):
+                entry["early"] = g["early"]
+            for lag in LAGS:
+                if lag in g["lags"]:
+                    entry[lag] = {f"p{q}": _percentile(g["lags"][lag], q) for q in PERCENTILES}
+            out.setdefault(sport, {})[kind] = entry
+    return out
+
+
+def _fmt(p):
+    return "/".join("-" if p is None else str(p[f"p{q}"]) for q in PERCENTILES) if p else "-"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Time-to-grade latency log and percentiles")
+    sub = ap.add_subparsers(dest="cmd")
+    r = sub.add_parser("report", help="p50/p95/p99 per sport")
+    r.add_argument("--days", type=int, help="only the last N days")
+    r.add_argument("--json", action="store_true")
+    sub.add_parser("stamp", help="heartbeat: mark graded entries committed")
+    sub.add_parser("flush", help="move committed entries into grade_latency.jsonl")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "stamp":
+        print(f"  Latency: {stamp()} entr(ies) marked committed")
+    elif args.cmd == "flush":
+        print(f"  Latency: {flush()} line(s) added to {os.path.basename(LOG_PATH)}")
+    elif args.cmd == "report":
+        rep = report(read_log(), args.days)
+        if args.json:
+            json.dump(rep, sys.stdout, indent=2)
+            print()
+            return 0
+        if not rep:
+            print(f"  Latency: no entries in {os.path.basename(LOG_PATH)}")
+            return 0
+        print("  p50/p95/p99 seconds")
+        print(f"  {'sport':6s} {'kind':5s} {'n':>14s} {'poll gap':>14s} {'final→graded':>14s} "
+              f"{'graded→pushed':>14s} {'total':>14s}")
+        for sport, kinds in rep.items():
+            for kind, e in kinds.items():
+                n = f"{e['n']}" + (f" ({e['early']} early)" if e.get("early") else "")
+                print(f"  {sport:6s} {kind:5s} {n:>14s} " + " ".join(f"{_fmt(e.get(lag)):>14s}" for lag in LAGS))
+    else:
+        ap.print_help()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""grade_loop.py — Persistent grading loop with a Prometheus /metrics endpoint.
+
+Runs check_and_grade in-process on the same cadence as the check-scores
+workflow (SLEEP_SECS between cycles, 30s fast poll on exit 3, stop on exit 2
+unless --forever) and serves the metrics recorded by grade_metrics:
+
+  GET /metrics    Prometheus text exposition (see grade_metrics.py for the list)
+  GET /healthz    {"iterations", "last_exit", "last_iteration", "running"}
+
+After each cycle the props files are re-counted into grade_props. With
+--after CMD (e.g. a commit-and-push script) the command runs after every
+cycle; when it exits 0 the cycle's time-to-grade entries are stamped done,
+like the workflow heartbeat.
+
+Alert on stalls with e.g.
+  time() - grade_last_iteration_timestamp_seconds > 600
+
+Usage:
+    python scripts/grade_loop.py [--port 9464] [--interval 90] [--forever] [--after "./push.sh"]
+    python scripts/grade_loop.py --once     # one cycle, then print /metrics and exit
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import check_and_grade as cg
+import grade_latency
+import grade_metrics
+
+FAST_POLL_SECS = 30
+
+
+class Loop:
+    """Grading-cycle state shared with the HTTP handler."""
+
+    def __init__(self):
+        self.iterations = 0
+        self.last_exit = None
+        self.last_iteration = None
+        self.running = False
+
+    def cycle(self, after=None):
+        self.running = True
+        t0 = time.perf_counter()
+        try:
+            code = cg.main([])
+        except Exception as e:  # a crashed cycle is a data point, not the end of the loop
+            print(f"  [loop] cycle failed: {e!r}")
+            code = 1
+        finally:
+            self.running = False
+        grade_metrics.ITERATION_SECONDS.observe(time.perf_counter() - t0)
+        grade_metrics.ITERATIONS.inc(exit_code=code)
+        count_props()
+        if after and subprocess.run(after, shell=True, cwd=cg.REPO_ROOT).returncode == 0:
+            grade_latency.stamp()
+        self.iterations += 1
+        self.last_exit = code
+        self.last_iteration = time.time()
+        grade_metrics.LAST_ITERATION.set(round(self.last_iteration, 3))
+        return code
+
+
+def count_props():
+    """Set grade_props from the props files on disk."""
+    for sport, cfg in cg.PROPS_LIVE_CONFIG.items():
+        for src, list_key in cfg["sources"]:
+            data = cg.load_json(os.path.join(cg.REPO_ROOT, src)) or {}
+            props = data.get(list_key, []) if isinstance(data, dict) else []
+            pending = sum(1 for p in props if cg._needs_grading(p))
+            grade_metrics.PROPS.set(pending, sport=sport, src=src, state="pending")
+            grade_metrics.PROPS.set(len(props) - pending, sport=sport, src=src, state="graded")
+
+
+def make_handler(loop):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, status, ctype, body):
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path == "/metrics":
+                return self._send(200, "text/plain; version=0.0.4; charset=utf-8",
+                                  grade_metrics.render().encode("utf-8"))
+            if path == "/healthz":
+                return self._send(200, "application/json", json.dumps({
+                    "iterations": loop.iterations, "last_exit": loop.last_exit,
+                    "last_iteration": loop.last_iteration, "running": loop.running,
+                }).encode("utf-8"))
+            self._send(404, "application/json", b'{"error": "not found"}')
+
+    return Handler
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Persistent grading loop with Prometheus metrics")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9464)
+    ap.add_argument("--interval", type=float, default=90.0, help="seconds between cycles")
+    ap.add_argument("--max-iters", type=int, default=0, help="stop after N cycles (0 = no limit)")
+    ap.add_argument("--forever", action="store_true",
+                    help="keep polling after exit 2 (all games graded)")
+    ap.add_argument("--after", metavar="CMD", help="shell command to run after each cycle")
+    ap.add_argument("--once", action="store_true", help="one cycle, print the metrics, exit")
+    args = ap.parse_args(argv)
+
+    loop = Loop()
+    if args.once:
+        code = loop.cycle(args.after)
+        sys.stdout.write(grade_metrics.render())
+        return code
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(loop))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"  [loop] metrics on http://{args.host}:{args.port}/metrics "
+          f"(cycle every {args.interval:.0f}s, {FAST_POLL_SECS}s fast poll)")
+    code = 0
+    try:
+        while not args.max_iters or loop.iterations < args.max_iters:
+            code = loop.cycle(args.after)
+            if code == 2 and not args.forever:
+                print("  [loop] all games graded — stopping")
+                break
+            if args.max_iters and loop.iterations >= args.max_iters:
+                break
+            time.sleep(FAST_POLL_SECS if code == 3 else args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
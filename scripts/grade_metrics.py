@@ -0,0 +1,153 @@
+"""grade_metrics.py — In-process metrics for the grader, in Prometheus text format.
+
+check_and_grade and its helpers record into the module-level metrics below
+as they run (a dict update under a lock — cheap enough to leave on in CI).
+A long-running process (scripts/grade_loop.py) serves `render()` at
+GET /metrics:
+
+  grade_espn_requests_total{endpoint,status}      ESPN calls by endpoint ("scoreboard:NBA",
+                                                  "summary:NHL", "events:NBA") and HTTP status
+  grade_espn_request_seconds{endpoint}            ESPN latency histogram
+  grade_stage_runs_total{stage,status}            DAG stage outcomes; status="cached" is a cache hit
+  grade_live_box_scores_total{sport,source}       live box scores "fetched" vs "reused" from last cycle
+  grade_final_to_graded_seconds{sport,kind}       lag from first-seen final to result written
+  grade_games{sport,status}                       final / live / scheduled games
+  grade_props{sport,src,state}                    pending / graded props per props file
+  grade_bytes_written_total{file}                 bytes written per output file
+  grade_file_writes_total{file,result}            written / unchanged / refused saves
+  grade_iteration_duration_seconds                one grading cycle
+  grade_iterations_total{exit_code}
+  grade_last_iteration_timestamp_seconds          alert when this stops moving
+
+Stdlib only.
+"""
+
+import math
+import threading
+
+_registry = []
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, doc, labels=()):
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name}: expected labels {self.labels}, got {sorted(labels)}")
+        return tuple(str(labels[k]) for k in self.labels)
+
+    def _fmt_labels(self, key, extra=()):
+        pairs = list(zip(self.labels, key)) + list(extra)
+        if not pairs:
+            return ""
+        esc = (lambda v: v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pairs) + "}"
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._samples(key, value))
+        return lines
+
+    def _samples(self, key, value):
+        return [f"{self.name}{self._fmt_labels(key)} {_num(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labels=(), buckets=(0.1, 0.5, 1, 5, 10, 60)):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, le in enumerate(self.buckets):
+                if value <= le:
+                    state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self, key, value):
+        counts, total, n = value[0][:], value[1], value[2]
+        out = [f"{self.name}_bucket{self._fmt_labels(key, [('le', _num(le))])} {c}"
+               for le, c in zip(self.buckets, counts)]
+        out.append(f"{self.name}_bucket{self._fmt_labels(key, [('le', '+Inf')])} {n}")
+        out.append(f"{self.name}_sum{self._fmt_labels(key)} {_num(total)}")
+        out.append(f"{self.name}_count{self._fmt_labels(key)} {n}")
+        return out
+
+
+def _num(v):
+    if isinstance(v, float):
+        if math.isinf(v):
+            return "+Inf" if v > 0 else "-Inf"
+        return repr(round(v, 6))
+    return str(v)
+
+
+def render():
+    """Every metric in Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ── Grader metrics ───────────────────────────────────────────────
+
+ESPN_REQUESTS = Counter("grade_espn_requests_total", "ESPN API requests by endpoint and HTTP status",
+                        ("endpoint", "status"))
+ESPN_LATENCY = Histogram("grade_espn_request_seconds", "ESPN API request latency", ("endpoint",),
+                         buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+STAGE_RUNS = Counter("grade_stage_runs_total", "Pipeline stage outcomes (cached = stage cache hit)",
+                     ("stage", "status"))
+LIVE_BOX_SCORES = Counter("grade_live_box_scores_total",
+                          "In-progress box scores refetched vs reused from the previous cycle",
+                          ("sport", "source"))
+GRADE_LAG = Histogram("grade_final_to_graded_seconds", "First-seen ESPN final to result written",
+                      ("sport", "kind"), buckets=(5, 15, 30, 60, 120, 300, 600, 1200, 3600))
+GAMES = Gauge("grade_games", "Games in today's projection files by status", ("sport", "status"))
+PROPS = Gauge("grade_props", "Props in the current props files by grading state", ("sport", "src", "state"))
+BYTES_WRITTEN = Counter("grade_bytes_written_total", "Bytes written per output file", ("file",))
+FILE_WRITES = Counter("grade_file_writes_total", "save_json calls by outcome", ("file", "result"))
+ITERATION_SECONDS = Histogram("grade_iteration_duration_seconds", "Duration of one grading cycle",
+                              buckets=(1, 2, 5, 10, 20, 30, 60, 120, 300))
+ITERATIONS = Counter("grade_iterations_total", "Grading cycles by exit code", ("exit_code",))
+LAST_ITERATION = Gauge("grade_last_iteration_timestamp_seconds", "Unix time the last grading cycle ended")
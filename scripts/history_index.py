@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""history_index.py — Memory-mapped player/team prop history built from the archive.
+
+"How has this player's PRA line and result moved over the last 30 days"
+used to mean parsing dozens of archive snapshots. This keeps every archived
+prop line (player_props / all_props / nhl_player_props sections) and every
+graded prop (nhl_props_results.json / all_props_results.json, via the
+results store) as fixed-width NumPy columns under .grade_cache/history/
+(derived, not committed):
+
+  date i4 (YYYYMMDD) · sport, player, team, opponent, prop i4 (string ids)
+  direction i1 (0 OVER, 1 UNDER, -1) · line, projection, actual f4 (NaN = none)
+  result i1 (1 WIN, 0 LOSS, 2 PUSH, -1) · source i1 (0 archive, 1 results) · unit i4
+
+Strings are interned once in strings.json. Rows are sorted by (player,
+date), and team_order.npy / team_keys.npy hold a (team, date) permutation,
+so a player or team lookup is a binary search over memory-mapped columns —
+no JSON is parsed at query time.
+
+Updates are incremental by unit (one archive snapshot, or one results day):
+manifest.json holds each unit's content hash (blob ids / the results
+store's day hash), and only new or changed units are parsed; their old
+rows are dropped by `unit` and the columns re-sorted.
+
+Usage:
+    python scripts/history_index.py update
+    python scripts/history_index.py player "Austin Reaves" [--prop PRA] [--days 30]
+    python scripts/history_index.py team BOS [--prop PTS] [--days 14]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from archive_store import SNAPSHOT_RE, ArchiveStore
+from results_store import DB_PATH, REPO_ROOT, RESULTS_FILES, connect, sync
+
+INDEX_DIR = os.environ.get("GRADE_HISTORY_DIR") or os.path.join(REPO_ROOT, ".grade_cache", "history")
+
+COLUMNS = {
+    "date": np.int32, "sport": np.int32, "player": np.int32, "team": np.int32,
+    "opponent": np.int32, "prop": np.int32, "direction": np.int8, "line": np.float32,
+    "projection": np.float32, "actual": np.float32, "result": np.int8, "source": np.int8,
+    "unit": np.int32,
+}
+DIRECTIONS = {"OVER": 0, "UNDER": 1}
+RESULTS = {"LOSS": 0, "WIN": 1, "PUSH": 2}
+
+# Archive section → (sport, date field, record list field)
+ARCHIVE_SECTIONS = {
+    "player_props": ("NBA", "date", "projections"),
+    "all_props": ("NBA", "_date", "props"),
+    "nhl_player_props": ("NHL", "date", "projections"),
+}
+PROP_RESULTS_FILES = {f: sport for f, (sport, table) in RESULTS_FILES.items() if table == "prop_results"}
+
+
+def _num(v):
+    return float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else float("nan")
+
+
+def _date_int(s):
+    return int(s[:10].replace("-", "")) if s and len(s) >= 10 else 0
+
+
+class _Strings:
+    """Append-only interned string table (ids stay stable across updates)."""
+
+    def __init__(self, table=()):
+        self.table = list(table)
+        self.ids = {s: i for i, s in enumerate(self.table)}
+
+    def __call__(self, s):
+        s = "" if s is None else str(s)
+        i = self.ids.get(s)
+        if i is None:
+            i = self.ids[s] = len(self.table)
+            self.table.append(s)
+        return i
+
+
+# ── Units ────────────────────────────────────────────────────────
+
+
+def _archive_units(archive_dir):
+    """{unit: (hash, loader)} for every archive snapshot, packed or plain."""
+    store = ArchiveStore(archive_dir)
+    units = {}
+    for snap_id, entry in store.snapshots.items():
+        cids = [entry["sections"].get(k, "") for k in ARCHIVE_SECTIONS]
+        units[f"a:{snap_id}"] = ("/".join(cids), lambda e=entry: {
+            k: store.section(e["sections"][k]) for k in ARCHIVE_SECTIONS if k in e["sections"]})
+    for name in os.listdir(archive_dir):
+        m = SNAPSHOT_RE.match(name)
+        if m and f"a:{m.group(1)}" not in units:
+            path = os.path.join(archive_dir, name)
+            st = os.stat(path)
+            units[f"a:{m.group(1)}"] = (f"{st.st_size}:{st.st_mtime_ns}", lambda p=path: _load_plain(p))
+    return units
+
+
+def _load_plain(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _archive_rows(doc, unit, intern, rows):
+    for key, (sport, date_key, list_key) in ARCHIVE_SECTIONS.items():
+        section = doc.get(key)
+        if not isinstance(section, dict):
+            continue
+        date = _date_int(section.get(date_key))
+        for p in section.get(list_key) or []:
+            if not isinstance(p, dict) or not p.get("player") or not p.get("prop"):
+                continue
+            rows.append((date, intern(sport), intern(p["player"]), intern(p.get("team")),
+                         intern(p.get("opponent")), intern(p["prop"]),
+                         DIRECTIONS.get(p.get("direction"), -1), _num(p.get("line")),
+                         _num(p.get("projection")), float("nan"), -1, 0, unit))
+
+
+def _results_units(conn):
+    units = {}
+    for file in PROP_RESULTS_FILES:
+        for date, dup, digest in conn.execute("SELECT date, dup, hash FROM days WHERE file = ?", (file,)):
+            units[f"r:{file}:{date}:{dup}"] = (digest, (file, date, dup))
+    return units
+
+
+def _results_rows(conn, key, unit, intern, rows):
+    file, date, dup = key
+    sport = intern(PROP_RESULTS_FILES[file])
+    for player, team, opp, prop, direction, line, proj, actual, result in conn.execute(
+            "SELECT player, team, opponent, prop, direction, line, projection, actual, result "
+            "FROM prop_results WHERE file = ? AND date = ? AND dup = ?", (file, date, dup)):
+        if not player or not prop:
+            continue
+        rows.append((_date_int(date), sport, intern(player), intern(team), intern(opp), intern(prop),
+                     DIRECTIONS.get(direction, -1), _num(line), _num(proj), _num(actual),
+                     RESULTS.get(result, -1), 1, unit))
+
+
+# ── Build ────────────────────────────────────────────────────────
+
+
+def _load_columns(index_dir):
+    path = os.path.join(index_dir, "manifest.json")
+    if not os.path.exists(path):
+        return None, _Strings(), {}
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    with open(os.path.join(index_dir, "strings.json"), "r", encoding="utf-8") as f:
+        strings = _Strings(json.load(f))
+    cols = {name: np.load(os.path.join(index_dir, f"{name}.npy")) for name in COLUMNS}
+    return cols, strings, manifest.get("units", {})
+
+
+def _save(index_dir, cols, strings, units):
+    os.makedirs(index_dir, exist_ok=True)
+
+    def put(name, arr):
+        tmp = os.path.join(index_dir, f".{name}.npy")
+        np.save(tmp, arr)
+        os.replace(tmp, os.path.join(index_dir, f"{name}.npy"))
+
+    for name, arr in cols.items():
+        put(name, arr)
+    team_order = np.lexsort((cols["date"], cols["team"])).astype(np.int32)
+    put("team_order", team_order)
+    put("team_keys", cols["team"][team_order])
+    with open(os.path.join(index_dir, "strings.json"), "w", encoding="utf-8") as f:
+        json.dump(strings.table, f, separators=(",", ":"))
+    # Manifest last: an interrupted update just re-parses its units next time
+    with open(os.path.join(index_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"rows": int(len(cols["date"])), "units": units}, f, separators=(",", ":"))
+
+
+def update(root=REPO_ROOT, index_dir=INDEX_DIR, db_path=DB_PATH, quiet=False):
+    """Parse new/changed archive snapshots and results days into the index. Returns units parsed."""
+    t0 = time.time()
+    cols, intern, stored = _load_columns(index_dir)
+
+    sync(root=root, db_path=db_path, quiet=True)
+    conn = connect(db_path)
+    try:
+        archive_dir = os.path.join(root, "archive")
+        current = {}
+        if os.path.isdir(archive_dir):
+            current = {u: (h, ("a", load)) for u, (h, load) in _archive_units(archive_dir).items()}
+        current.update({u: (h, ("r", key)) for u, (h, key) in _results_units(conn).items()})
+        stale = [u for u, (h, _) in current.items() if stored.get(u) != h]
+        dropped = set(stored) - set(current)
+        if not stale and not dropped and cols is not None:
+            return 0
+
+        rows = []
+        for u in stale:
+            kind, src = current[u][1]
+            uid = intern(u)
+            if kind == "a":
+                _archive_rows(src(), uid, intern, rows)
+            else:
+                _results_rows(conn, src, uid, intern, rows)
+    finally:
+        conn.close()
+
+    fresh = {name: np.array([r[i] for r in rows], dtype=dt) for i, (name, dt) in enumerate(COLUMNS.items())}
+    if cols is not None:
+        gone = np.array([intern(u) for u in list(stale) + list(dropped)], dtype=np.int32)
+        keep = ~np.isin(cols["unit"], gone)
+        cols = {name: np.concatenate([cols[name][keep], fresh[name]]) for name in COLUMNS}
+    else:
+        cols = fresh
+    order = np.lexsort((cols["prop"], cols["date"], cols["player"]))
+    cols = {name: arr[order] for name, arr in cols.items()}
+    _save(index_dir, cols, intern, {u: h for u, (h, _) in current.items()})
+    if not quiet:
+        print(f"  History index: {len(stale)} unit(s) parsed, {len(cols['date'])} row(s) "
+              f"[{time.time() - t0:.2f}s]")
+    return len(stale)
+
+
+# ── Queries ──────────────────────────────────────────────────────
+
+
+class HistoryIndex:
+    """Read-only, memory-mapped view of the index."""
+
+    def __init__(self, index_dir=INDEX_DIR):
+        self.cols = {name: np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r")
+                     for name in list(COLUMNS) + ["team_order", "team_keys"]}
+        with open(os.path.join(index_dir, "strings.json"), "r", encoding="utf-8") as f:
+            self.strings = json.load(f)
+        self.ids = {}
+        for i, s in enumerate(self.strings):
+            self.ids.setdefault(s.lower(), i)
+
+    def latest(self, days):
+        """YYYY-MM-DD `days` before the newest indexed date (window start for --days)."""
+        if not len(self.cols["date"]):
+            return None
+        d = str(int(np.max(self.cols["date"])))
+        end = datetime.strptime(d, "%Y%m%d")
+        return (end - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+
+    def _row(self, i):
+        c, s = self.cols, self.strings
+        d = int(c["date"][i])
+
+        def f(name):
+            v = float(c[name][i])
+            return None if v != v else round(v, 2)
+
+        return {
+            "date": f"{d // 10000:04d}-{d // 100 % 100:02d}-{d % 100:02d}",
+            "sport": s[c["sport"][i]], "player": s[c["player"][i]], "team": s[c["team"][i]],
+            "opponent": s[c["opponent"][i]], "prop": s[c["prop"][i]],
+            "direction": {0: "OVER", 1: "UNDER"}.get(int(c["direction"][i])),
+            "line": f("line"), "projection": f("projection"), "actual": f("actual"),
+            "result": {0: "LOSS", 1: "WIN", 2: "PUSH"}.get(int(c["result"][i])),
+            "source": "results" if c["source"][i] else "archive",
+        }
+
+    def _select(self, rows, prop, since):
+        c = self.cols
+        rows = np.asarray(rows)
+        if prop is not None:
+            pid = self.ids.get(prop.lower(), -1)
+            rows = rows[c["prop"][rows] == pid]
+        if since is not None:
+            rows = rows[c["date"][rows] >= _date_int(since)]
+        rows = rows[np.argsort(c["date"][rows], kind="stable")]
+        return [self._row(int(i)) for i in rows]
+
+    def player(self, name, prop=None, since=None):
+        """Rows for one player (rows are stored player-sorted: a single slice)."""
+        pid = self.ids.get(name.lower())
+        if pid is None:
+            return []
+        col = self.cols["player"]
+        lo, hi = np.searchsorted(col, pid, "left"), np.searchsorted(col, pid, "right")
+        return self._select(np.arange(lo, hi), prop, since)
+
+    def team(self, team, prop=None, since=None):
+        tid = self.ids.get(team.lower())
+        if tid is None:
+            return []
+        keys = self.cols["team_keys"]
+        lo, hi = np.searchsorted(keys, tid, "left"), np.searchsorted(keys, tid, "right")
+        return self._select(self.cols["team_order"][lo:hi], prop, since)
+
+
+def coalesce(rows):
+    """One row per (date, sport, player, prop, direction, line): graded fields over archived ones."""
+    out = {}
+    for r in rows:
+        key = (r["date"], r["sport"], r["player"], r["prop"], r["direction"], r["line"])
+        prev = out.get(key)
+        if prev is None:
+            out[key] = dict(r)
+        else:
+            prev.update({k: v for k, v in r.items() if v is not None and (r["source"] == "results" or prev[k] is None)})
+    return list(out.values())
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Player/team prop history index")
+    sub = ap.add_subparsers(dest="cmd")
+    sub.add_parser("update", help="index new archive snapshots and results days")
+    for name in ("player", "team"):
+        q = sub.add_parser(name, help=f"prop history for one {name}")
+        q.add_argument("name")
+        q.add_argument("--prop")
+        q.add_argument("--days", type=int, help="only the last N days of indexed data")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "update":
+        update()
+        return 0
+    if args.cmd not in ("player", "team"):
+        ap.print_help()
+        return 1
+    update(quiet=True)
+    t0 = time.time()
+    index = HistoryIndex()
+    since = index.latest(args.days) if args.days else None
+    rows = coalesce(getattr(index, args.cmd)(args.name, args.prop, since))
+    for r in rows:
+        print(f"{r['date']}  {r['player']:<24} {r['team'] or '':<4} {r['prop']:<8} {r['direction'] or '':<5} "
+              f"line {r['line']!s:>5}  proj {r['projection']!s:>5}  actual {r['actual']!s:>5}  "
+              f"{r['result'] or ''}")
+    print(f"  ({len(rows)} row(s), {(time.time() - t0) * 1000:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""json_canonical.py — Diff-minimal canonical form for committed JSON outputs.
+
+`canonicalize(new, old)` rewrites a document about to be saved so that it
+differs from the version already on disk only where content changed:
+
+  - dict keys keep the order they have on disk; new keys go last
+  - record lists (days, picks, games, props) keep the on-disk order of
+    records matched by identity (see `record_key`); new records go last,
+    except `days`, which follow the date direction already on disk
+  - timestamp fields (`updated`, `graded_at`, ...) keep their old value
+    when nothing else in the same object changed
+  - NaN/Inf compare (and are returned) as None, which is how json_codec
+    writes them
+
+Stdlib only; shared by check_and_grade.save_json and merge_json.
+"""
+
+import math
+
+TIMESTAMP_KEYS = frozenset({"updated", "updated_at", "graded_at", "archived_at", "results_added_at"})
+
+
+def record_key(rec):
+    """Stable identity for a list element in any of our schemas."""
+    if "date" in rec and ("picks" in rec or not ("game" in rec or "player" in rec)):
+        return ("day", rec["date"])
+    if "away_team" in rec and "home_team" in rec:
+        return ("matchup", f"{rec['away_team']}@{rec['home_team']}")
+    if "game" in rec and rec.get("type") != "prop":
+        return ("pick", rec.get("type"), rec["game"])
+    if "player" in rec:
+        return ("prop", rec.get("player"), rec.get("prop"), rec.get("direction"),
+                rec.get("line"), rec.get("pick"))
+    return ("raw", repr(sorted(rec.items(), key=lambda kv: kv[0])))
+
+
+def _is_record_list(v):
+    return isinstance(v, list) and bool(v) and all(isinstance(x, dict) for x in v)
+
+
+def _without_timestamps(obj):
+    if isinstance(obj, dict):
+        return {k: _without_timestamps(v) for k, v in obj.items() if k not in TIMESTAMP_KEYS}
+    if isinstance(obj, list):
+        return [_without_timestamps(v) for v in obj]
+    return obj
+
+
+def _days_direction(days):
+    """+1 ascending, -1 descending, 0 unknown/unsorted (by 'date')."""
+    dates = [d.get("date") or "" for d in days]
+    if len(dates) < 2:
+        return 0
+    if dates == sorted(dates, reverse=True):
+        return -1
+    if dates == sorted(dates):
+        return 1
+    return 0
+
+
+def _canonical_dict(new, old):
+    out = {}
+    for k in old:
+        if k in new:
+            out[k] = canonicalize(new[k], old[k])
+    for k in new:
+        if k not in out:
+            out[k] = new[k]
+    stamps = [k for k in TIMESTAMP_KEYS if k in out and k in old]
+    if stamps and any(out[k] != old[k] for k in stamps):
+        if _without_timestamps(out) == _without_timestamps(old):
+            for k in stamps:
+                out[k] = old[k]
+    return out
+
+
+def _canonical_records(new, old):
+    old_pos = {}
+    old_by_key = {}
+    for i, rec in enumerate(old):
+        k = record_key(rec)
+        if k not in old_by_key:
+            old_pos[k] = i
+            old_by_key[k] = rec
+
+    keyed = []
+    for i, rec in enumerate(new):
+        k = record_key(rec)
+        prev = old_by_key.get(k)
+        rec = canonicalize(rec, prev) if prev is not None else rec
+        keyed.append((old_pos.get(k, len(old) + i), rec))
+    keyed.sort(key=lambda x: x[0])
+    out = [rec for _, rec in keyed]
+
+    if out and record_key(out[0])[0] == "day":
+        direction = _days_direction(old)
+        if direction:
+            out.sort(key=lambda d: d.get("date") or "", reverse=direction < 0)
+    return out
+
+
+def canonicalize(new, old):
+    """Return `new` reshaped to be diff-minimal against `old` (the on-disk copy)."""
+    if isinstance(new, float) and not math.isfinite(new):
+        return None
+    if old is None or new is old:
+        return new
+    if isinstance(new, dict) and isinstance(old, dict):
+        return _canonical_dict(new, old)
+    if _is_record_list(new) and _is_record_list(old):
+        return _canonical_records(new, old)
+    if isinstance(new, list) and isinstance(old, list) and len(new) == len(old):
+        return [canonicalize(n, o) for n, o in zip(new, old)]
+    return new
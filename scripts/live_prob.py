@@ -0,0 +1,212 @@
+"""live_prob.py — In-game win / cover / total probabilities for live games.
+
+For every in-progress game grade_sport writes to the live sidecar, the rest of
+the game is simulated from the pregame projection and the current state:
+
+  remaining   each team's projected score (`proj_score`, "away-home") times
+              the share of regulation left (sports.remaining_fraction, from
+              the scoreboard period and clock)
+  scoring     the sport's `live_model` (sports.py): "normal" draws a rounded
+              normal with variance = dispersion x mean and correlated teams
+              (basketball: NBA 1.0 / 0.33 gives a full-game margin s.d. of
+              ~12.5 and total s.d. of ~17.5 points); "count" draws Poisson
+              (dispersion 1, hockey) or negative binomial (> 1, baseball) by
+              inverse CDF
+  ties        the model's `ties`: "overtime" plays overtime periods from the
+              same scoring model (mean = projection x overtime / regulation,
+              up to MAX_OVERTIMES, basketball); "next_score" gives the winner
+              one more goal or run (sudden-death OT, shootout, extra innings).
+              The winner of a tie that is left goes to the home team with the
+              pregame `home_win_prob` (else 50%)
+
+Each live entry gets
+
+  "prob": {"home_win": 0.731, "spread": 0.412, "total": 0.655, "ml": 0.731}
+
+where spread / total / ml are the probabilities that the game's pick grades W
+(pushes count as not winning); markets without a pick are left out, as are
+games without a parseable proj_score.
+
+All games of a sport are simulated in one NumPy pass over a (games x sims)
+array. The sims share one seeded set of random numbers, so a game's
+probabilities depend only on its own inputs: an unchanged game keeps
+identical numbers (no churn in the sidecar), whatever else changed. A full
+NCAAB slate (~150 games) takes tens of milliseconds.
+GRADE_LIVE_SIMS sets the simulation count (default 10000).
+
+Stdlib + NumPy.
+"""
+
+import functools
+import os
+import re
+
+import numpy as np
+
+from sports import SPORTS, remaining_fraction
+
+N_SIMS = int(os.environ.get("GRADE_LIVE_SIMS", "10000"))
+SEED = 50
+MAX_OVERTIMES = 4
+
+_PROJ_SCORE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)\s*$")
+
+
+def clock_seconds(clock):
+    """ESPN displayClock ("3:42", "0:07.5", "45.3") to seconds, None if unknown."""
+    try:
+        parts = str(clock).split(":")
+        if len(parts) == 2:
+            return int(parts[0]) * 60 + float(parts[1])
+        if len(parts) == 1 and parts[0].strip():
+            return float(parts[0])
+    except ValueError:
+        pass
+    return None
+
+
+def _proj_scores(game):
+    m = _PROJ_SCORE.match(str(game.get("proj_score") or ""))
+    return (float(m.group(1)), float(m.group(2))) if m else None
+
+
+def _spread_pick(game):
+    """(side, line) of the spread pick: side +1 home, -1 away; None if none."""
+    parts = str(game.get("spread_pick") or "").rsplit(" ", 1)
+    if len(parts) < 2:
+        return None
+    try:
+        line = float(parts[1])
+    except ValueError:
+        return None
+    return (1 if parts[0] == game["home_team"] else -1), line
+
+
+@functools.lru_cache(maxsize=None)
+def _random_numbers(n):
+    """Common random numbers: normals for regulation and each overtime (away,
+    home pairs), uniforms for away, home and the tie-break."""
+    rng = np.random.default_rng(SEED)
+    return rng.standard_normal((2 + 2 * MAX_OVERTIMES, n)), rng.random((3, n))
+
+
+def _normal_scores(mean, dispersion, z):
+    sd = np.sqrt(dispersion * mean)
+    return np.maximum(np.rint(mean[:, None] + sd[:, None] * z[None, :]), 0)
+
+
+def _normal_pair(mean_away, mean_home, dispersion, corr, z_away, z_home):
+    """(away, home) rounded-normal scores with correlated teams."""
+    return (_normal_scores(mean_away, dispersion, z_away),
+            _normal_scores(mean_home, dispersion, corr * z_away + np.sqrt(1 - corr * corr) * z_home))
+
+
+def _count_scores(mean, dispersion, u):
+    """Inverse-CDF draws of Poisson (dispersion 1) / negative binomial counts,
+    one row per game, all rows in one searchsorted over offset CDFs."""
+    top = float(mean.max()) if len(mean) else 0.0
+    k = np.arange(int(top + 12 * np.sqrt(dispersion * top)) + 12)
+    if dispersion > 1:
+        n = mean / (dispersion - 1)
+        q = (dispersion - 1) / dispersion
+        ratio = (k[None, 1:] - 1 + n[:, None]) / k[None, 1:] * q
+        first = (1 / dispersion) ** n
+    else:
+        ratio = mean[:, None] / k[None, 1:]
+        first = np.exp(-mean)
+    pmf = np.concatenate([first[:, None], first[:, None] * np.cumprod(ratio, axis=1)], axis=1)
+    cdf = np.cumsum(pmf, axis=1)
+    cdf[:, -1] = 1.0  # truncate the far tail onto the last count
+    offset = 2.0 * np.arange(len(mean))[:, None]  # rows stay sorted once shifted apart
+    idx = np.searchsorted((cdf + offset).ravel(), (u[None, :] + offset).ravel())
+    return (idx.reshape(len(mean), -1) - k.size * np.arange(len(mean))[:, None]).astype(float)
+
+
+def simulate(label, games, states):
+    """Live probabilities for `games` (projection dicts) in `states`
+    ({away_score, home_score, period, clock} live entries), one dict or None
+    per game."""
+    model = SPORTS[label].get("live_model")
+    out = [None] * len(games)
+    if not model:
+        return out
+    rows = [i for i, g in enumerate(games) if _proj_scores(g)]
+    if not rows:
+        return out
+    spec = SPORTS[label]
+
+    proj = np.array([_proj_scores(games[i]) for i in rows])
+    frac = np.array([remaining_fraction(label, states[i].get("period") or 0,
+                                        clock_seconds(states[i].get("clock", "")))
+                     for i in rows])
+    score = np.array([(states[i]["away_score"], states[i]["home_score"]) for i in rows], dtype=float)
+    tie_home = np.array([0.5 if games[i].get("home_win_prob") is None
+                         else games[i]["home_win_prob"] / 100 for i in rows])
+    spreads = [_spread_pick(games[i]) or (0, np.nan) for i in rows]
+    spread_side = np.array([s[0] for s in spreads], dtype=float)
+    spread_line = np.array([s[1] for s in spreads], dtype=float)
+    total_line = np.array([np.nan if games[i].get("total_line") is None or not games[i].get("total_pick")
+                           else games[i]["total_line"] for i in rows], dtype=float)
+    total_over = np.array([games[i].get("total_pick") == "OVER" for i in rows])
+
+    z, u = _random_numbers(N_SIMS)
+    mean_away, mean_home = proj[:, 0] * frac, proj[:, 1] * frac
+    dispersion = model.get("dispersion", 1.0)
+    corr = model.get("corr", 0.0)
+    if model["dist"] == "normal":
+        away, home = _normal_pair(mean_away, mean_home, dispersion, corr, z[0], z[1])
+    else:
+        away = _count_scores(mean_away, dispersion, u[0])
+        home = _count_scores(mean_home, dispersion, u[1])
+    away += score[:, 0:1]
+    home += score[:, 1:2]
+
+    if model.get("ties") == "overtime" and spec["overtime_secs"] and spec["period_secs"]:
+        ot_share = spec["overtime_secs"] / (spec["periods"] * spec["period_secs"])
+        ot_mean = proj * ot_share
+        for j in range(MAX_OVERTIMES):
+            r, c = np.nonzero(away == home)  # only the tied sims play on
+            if not r.size:
+                break
+            z_away, z_home = z[2 + 2 * j][c], z[3 + 2 * j][c]
+            sd = np.sqrt(dispersion * ot_mean[r])
+            away[r, c] += np.maximum(np.rint(ot_mean[r, 0] + sd[:, 0] * z_away), 0)
+            home[r, c] += np.maximum(np.rint(ot_mean[r, 1] + sd[:, 1] * (
+                corr * z_away + np.sqrt(1 - corr * corr) * z_home)), 0)
+
+    tied = away == home
+    home_ot = tied & (u[2][None, :] < tie_home[:, None])
+    away += tied & ~home_ot
+    home += home_ot
+
+    margin = home - away
+    total = home + away
+    home_win = (margin > 0).mean(axis=1)
+    cover = (spread_side[:, None] * margin + spread_line[:, None] > 0).mean(axis=1)
+    over = (total > total_line[:, None]).mean(axis=1)
+    under = (total < total_line[:, None]).mean(axis=1)
+
+    for r, i in enumerate(rows):
+        g = games[i]
+        prob = {"home_win": round(float(home_win[r]), 3)}
+        if spread_side[r]:
+            prob["spread"] = round(float(cover[r]), 3)
+        if not np.isnan(total_line[r]):
+            prob["total"] = round(float(over[r] if total_over[r] else under[r]), 3)
+        if g.get("ml_pick"):
+            prob["ml"] = round(float(home_win[r] if g["ml_pick"] == g["home_team"] else 1 - home_win[r]), 3)
+        out[i] = prob
+    return out
+
+
+def attach(label, pairs):
+    """Set entry["prob"] on [(game, live entry)] pairs; returns how many got one."""
+    if not pairs:
+        return 0
+    games, states = zip(*pairs)
+    n = 0
+    for (_, entry), prob in zip(pairs, simulate(label, list(games), list(states))):
+        if prob is not None:
+            entry["prob"] = prob
+            n += 1
+    return n
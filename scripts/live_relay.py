@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""live_relay.py — Optional live-score fan-out relay over Server-Sent Events.
+
+One poller thread fetches ESPN scoreboards (via check_and_grade's
+fetch_espn_scores parsing) and pushes per-game deltas to every connected
+subscriber, so one upstream poll serves all viewers instead of each tab
+re-fetching static JSON after a commit lands.
+
+Each subscriber has a bounded, coalescing buffer: a newer delta for the same
+game replaces the pending one, and a client that falls more than
+--max-pending games behind gets a single full snapshot instead of a backlog.
+
+Endpoints:
+  GET /events[?sports=NBA,NCAAB]   SSE stream: "snapshot" once, then "score" deltas
+  GET /snapshot[?sports=...]       Current scores as JSON
+  GET /healthz                     Poller status
+
+Usage:
+    python scripts/live_relay.py [--port 8787] [--interval 15] [--sports NBA,NHL]
+    python scripts/live_relay.py --client http://localhost:8787/events   # test client
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from check_and_grade import ESPN_ENDPOINTS, fetch_espn_scores
+from sports import live_dates
+
+ALLOWED_ORIGIN = "https://mtlusa01.github.io"
+HEARTBEAT_SECS = 15
+
+
+# ── Subscribers ──────────────────────────────────────────────────
+
+
+class Subscriber:
+    """Bounded, coalescing per-client event buffer."""
+
+    def __init__(self, sports, max_pending):
+        self.sports = sports
+        self.max_pending = max_pending
+        self.pending = OrderedDict()  # (sport, game) -> delta
+        self.resync = False
+        self.closed = False
+        self.cond = threading.Condition()
+
+    def push(self, sport, game, delta):
+        if self.sports and sport not in self.sports:
+            return
+        with self.cond:
+            key = (sport, game)
+            if key in self.pending:
+                merged = dict(self.pending.pop(key))
+                merged.update(delta)
+                delta = merged
+            self.pending[key] = delta
+            if len(self.pending) > self.max_pending:
+                # Too far behind: drop the backlog and send one snapshot instead
+                self.pending.clear()
+                self.resync = True
+            self.cond.notify()
+
+    def take(self, timeout):
+        """Wait for work. Returns (resync, [deltas]) — both empty on timeout."""
+        with self.cond:
+            if not self.pending and not self.resync and not self.closed:
+                self.cond.wait(timeout)
+            resync, self.resync = self.resync, False
+            deltas = list(self.pending.values())
+            self.pending.clear()
+            return resync, deltas
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+
+
+class Relay:
+    """Shared score state + subscriber registry fed by a single poller."""
+
+    def __init__(self, sports, interval, max_pending):
+        self.sports = sports
+        self.interval = interval
+        self.max_pending = max_pending
+        self.scores = {s: {} for s in sports}
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        self.polls = 0
+        self.last_poll = None
+
+    def subscribe(self, sports):
+        sub = Subscriber(sports, self.max_pending)
+        with self.lock:
+            self.subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        sub.close()
+        with self.lock:
+            self.subscribers.discard(sub)
+
+    def snapshot(self, sports=None):
+        with self.lock:
+            return {s: dict(g) for s, g in self.scores.items() if not sports or s in sports}
+
+    def apply(self, sport, new_scores):
+        """Diff new scores against state; fan out per-game deltas. Returns delta count."""
+        deltas = []
+        with self.lock:
+            old = self.scores.get(sport, {})
+            for game, sc in new_scores.items():
+                prev = old.get(game, {})
+                changed = {k: v for k, v in sc.items() if prev.get(k) != v}
+                if changed:
+                    deltas.append((game, dict(changed, sport=sport, game=game)))
+            self.scores[sport] = dict(new_scores)
+            subs = list(self.subscribers)
+        for game, delta in deltas:
+            for sub in subs:
+                sub.push(sport, game, delta)
+        return len(deltas)
+
+    def poll_once(self):
+        today = datetime.now().strftime("%Y-%m-%d")
+        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        total = 0
+        for sport in self.sports:
+            scores = {}
+            for d in live_dates(sport, today, yesterday):
+                scores.update(fetch_espn_scores(sport, d))
+            if scores:
+                total += self.apply(sport, scores)
+        self.polls += 1
+        self.last_poll = datetime.now().isoformat(timespec="seconds")
+        return total
+
+    def run_poller(self):
+        while True:
+            t0 = time.time()
+            try:
+                n = self.poll_once()
+                print(f"  [relay] poll {self.polls}: {n} game delta(s) → {len(self.subscribers)} subscriber(s)")
+            except Exception as e:
+                print(f"  [relay] poll error (non-fatal): {e}")
+            time.sleep(max(1.0, self.interval - (time.time() - t0)))
+
+
+# ── HTTP ─────────────────────────────────────────────────────────
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+def make_handler(relay):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _sports(self, query):
+            raw = parse_qs(query).get("sports", [""])[0]
+            return {s.strip().upper() for s in raw.split(",") if s.strip()} or None
+
+        def _headers(self, status, ctype, extra=None):
+            self.send_response(status)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Access-Control-Allow-Origin", ALLOWED_ORIGIN)
+            for k, v in (extra or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+
+        def _json(self, payload, status=200):
+            body = json.dumps(payload).encode("utf-8")
+            self._headers(status, "application/json", {"Content-Length": str(len(body))})
+            self.wfile.write(body)
+
+        def _chunk(self, data):
+            """Write one HTTP/1.1 chunk (one flush per batch of coalesced events)."""
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/healthz":
+                return self._json({"polls": relay.polls, "last_poll": relay.last_poll,
+                                   "subscribers": len(relay.subscribers)})
+            if url.path == "/snapshot":
+                return self._json(relay.snapshot(self._sports(url.query)))
+            if url.path != "/events":
+                return self._json({"error": "not found"}, 404)
+
+            sports = self._sports(url.query)
+            sub = relay.subscribe(sports)
+            self._headers(200, "text/event-stream",
+                          {"Cache-Control": "no-cache", "Transfer-Encoding": "chunked"})
+            try:
+                self._chunk(_sse("snapshot", relay.snapshot(sports)))
+                while True:
+                    resync, deltas = sub.take(HEARTBEAT_SECS)
+                    out = _sse("snapshot", relay.snapshot(sports)) if resync else b""
+                    out += b"".join(_sse("score", d) for d in deltas)
+                    self._chunk(out or b": keep-alive\n\n")
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                pass
+            finally:
+                relay.unsubscribe(sub)
+
+    return Handler
+
+
+def run_client(url):
+    """Minimal SSE test client: print each event as it arrives."""
+    with requests.get(url, stream=True, timeout=(10, None)) as resp:
+        event = None
+        for line in resp.iter_lines(chunk_size=None, decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: "):
+                print(f"{datetime.now().strftime('%H:%M:%S')} {event}: {line[6:]}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Live-score SSE relay")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8787)
+    ap.add_argument("--interval", type=float, default=15.0, help="ESPN poll interval (s)")
+    ap.add_argument("--sports", default=",".join(ESPN_ENDPOINTS))
+    ap.add_argument("--max-pending", type=int, default=500,
+                    help="per-client coalesced games before falling back to a snapshot")
+    ap.add_argument("--client", metavar="URL", help="run as a test SSE client instead")
+    args = ap.parse_args()
+
+    if args.client:
+        run_client(args.client)
+        return 0
+
+    sports = [s for s in (x.strip().upper() for x in args.sports.split(",")) if s in ESPN_ENDPOINTS]
+    relay = Relay(sports, args.interval, args.max_pending)
+    threading.Thread(target=relay.run_poller, name="relay-poller", daemon=True).start()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(relay))
+    server.daemon_threads = True
+    print(f"  [relay] serving {', '.join(sports)} on http://{args.host}:{args.port}/events "
+          f"(poll every {args.interval:.0f}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
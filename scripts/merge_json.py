@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""merge_json.py — Schema-aware three-way merge for results/projection JSON.
+
+Used as a git merge driver so a push race between two grading runs is
+resolved in milliseconds instead of `git reset --hard` + a full regrade.
+
+Records are matched by identity, not by line:
+  days:        by date
+  game picks:  by type + game ("spread", "DAL @ BOS")
+  prop picks:  by player / prop / direction / line (+ pick label)
+  games:       by matchup (AWAY@HOME)
+
+Each record is merged field by field against the common ancestor. When
+both sides changed the same field, the more-graded record wins (final over
+live over scheduled, graded prop over ungraded), then "ours". Timestamps
+take the newer value. Day stats, allTime/all_time/cumulative aggregates are
+recomputed from the merged picks the same way the grader computes them, and
+a recomputed day's best bets are re-selected (top 5 game picks by
+confidence) rather than kept from both sides.
+
+Imports only stdlib helpers (grade_io.py), not the grader. The bootstrap
+intervals need NumPy: without it they are left out of recomputed aggregates
+until the next grading run writes them.
+
+Setup (done by check-scores.yml):
+    git config merge.grade-json.driver "python scripts/merge_json.py %O %A %B %P"
+    # .gitattributes: results.json merge=grade-json
+
+Usage:
+    python scripts/merge_json.py BASE OURS THEIRS [PATH]   # writes merged OURS
+"""
+
+import os
+import sys
+
+from grade_io import _make_stat, _sum_cat, _tally, save_json, tag_best_bets
+from json_canonical import TIMESTAMP_KEYS, record_key
+import json_codec
+
+try:
+    import bootstrap_ci
+except ImportError:  # no NumPy: aggregates are merged without intervals
+    bootstrap_ci = None
+
+STATUS_RANK = {"final": 3, "closed": 3, "live": 2}
+RESULT_KEYS = ("result", "hit", "spread_result", "total_result", "ml_result")
+
+
+# ── Record identity ──────────────────────────────────────────────
+
+
+def _progress(rec):
+    """How far along grading a record is (higher wins conflicts)."""
+    if not isinstance(rec, dict):
+        return 0
+    rank = STATUS_RANK.get(rec.get("status"), 0)
+    graded = sum(1 for k in RESULT_KEYS if rec.get(k) is not None)
+    return rank * 10 + graded
+
+
+def _keyed(items):
+    """Map record_key → record, disambiguating duplicate keys by ordinal."""
+    out = {}
+    seen = {}
+    for rec in items or []:
+        k = record_key(rec)
+        n = seen.get(k, 0)
+        seen[k] = n + 1
+        out[k + (n,) if n else k] = rec
+    return out
+
+
+# ── Three-way merge ──────────────────────────────────────────────
+
+
+def _is_record_list(v):
+    return isinstance(v, list) and v and all(isinstance(x, dict) for x in v)
+
+
+def merge_value(base, ours, theirs, key=None, prefer_ours=True):
+    """Three-way merge of any JSON value."""
+    if ours == theirs:
+        return ours
+    if base == ours:
+        return theirs
+    if base == theirs:
+        return ours
+    if key in TIMESTAMP_KEYS and isinstance(ours, str) and isinstance(theirs, str):
+        return max(ours, theirs)
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        return merge_dict(base if isinstance(base, dict) else {}, ours, theirs, prefer_ours)
+    if _is_record_list(ours) or _is_record_list(theirs):
+        return merge_records(base if isinstance(base, list) else [], ours or [], theirs or [])
+    return ours if prefer_ours else theirs
+
+
+def merge_dict(base, ours, theirs, prefer_ours=True):
+    if _progress(theirs) > _progress(ours):
+        prefer_ours = False
+    elif _progress(ours) > _progress(theirs):
+        prefer_ours = True
+    merged = {}
+    for k in list(ours) + [k for k in theirs if k not in ours]:
+        if k not in theirs:
+            # Removed by theirs: drop only if ours left it untouched
+            if k in base and base[k] == ours[k]:
+                continue
+            merged[k] = ours[k]
+        elif k not in ours:
+            if k in base and base[k] == theirs[k]:
+                continue
+            merged[k] = theirs[k]
+        else:
+            merged[k] = merge_value(base.get(k), ours[k], theirs[k], k, prefer_ours)
+    return merged
+
+
+def merge_records(base, ours, theirs):
+    """Merge two lists of records by identity, keeping ours' order."""
+    b, o, t = _keyed(base), _keyed(ours), _keyed(theirs)
+    merged = []
+    for k in list(o) + [k for k in t if k not in o]:
+        if k not in t:
+            if k in b and b[k] == o[k]:
+                continue  # deleted by theirs, untouched by ours
+            merged.append(o[k])
+        elif k not in o:
+            if k in b and b[k] == t[k]:
+                continue
+            merged.append(t[k])
+        else:
+            merged.append(merge_value(b.get(k), o[k], t[k]))
+    return merged
+
+
+# ── Aggregate recomputation ──────────────────────────────────────
+
+
+def _wlp(picks, key_fn=None):
+    """Tally WIN/LOSS/PUSH results, optionally grouped."""
+    if key_fn is None:
+        w = sum(1 for p in picks if p.get("result") == "WIN")
+        l = sum(1 for p in picks if p.get("result") == "LOSS")
+        return w, l, sum(1 for p in picks if p.get("result") == "PUSH")
+    groups = {}
+    for p in picks:
+        g = groups.setdefault(key_fn(p), {"wins": 0, "losses": 0, "pushes": 0})
+        if p.get("result") == "WIN":
+            g["wins"] += 1
+        elif p.get("result") == "LOSS":
+            g["losses"] += 1
+        else:
+            g["pushes"] += 1
+    return groups
+
+
+def _pct(w, l):
+    return round(w / (w + l) * 100, 1) if (w + l) > 0 else 0
+
+
+def _changed_days(merged, ours, theirs):
+    """Dates whose merged picks match neither side (need fresh day stats)."""
+    o = {d.get("date"): d.get("picks") for d in ours.get("days", [])}
+    t = {d.get("date"): d.get("picks") for d in theirs.get("days", [])}
+    return {d.get("date") for d in merged.get("days", [])
+            if d.get("picks") != o.get(d.get("date")) and d.get("picks") != t.get(d.get("date"))}
+
+
+def _prop_intervals(block, days):
+    if bootstrap_ci is not None:
+        bootstrap_ci.attach_prop_intervals(block, days)
+    else:
+        for key in ("roi", "ci", "rolling"):
+            block.pop(key, None)  # stale for the merged days
+
+
+def recompute_game_results(doc, dirty):
+    """results.json / <sport>_results.json: day category stats + allTime."""
+    for d in doc.get("days", []):
+        if d.get("date") not in dirty:
+            continue
+        picks = d.get("picks", [])
+        game_picks = [p for p in picks if p.get("type") in ("spread", "total", "ml")]
+        if not game_picks:
+            continue
+        tag_best_bets(game_picks)
+        for cat, typ in (("spreads", "spread"), ("totals", "total"), ("moneylines", "ml")):
+            d[cat] = _make_stat(*_tally([p for p in game_picks if p["type"] == typ]))
+        d["best_bets"] = _make_stat(*_tally([p for p in game_picks if p.get("best_bet")]))
+        if "props" in d:
+            d["props"] = _make_stat(*_tally([p for p in picks if p.get("type") == "prop"]))
+    doc.get("days", []).sort(key=lambda d: d.get("date", ""), reverse=True)
+
+    old = doc.get("allTime", {})
+    all_time = {cat: _sum_cat(doc.get("days", []), cat)
+                for cat in ("spreads", "totals", "moneylines", "best_bets")}
+    if "props" in old:
+        all_time["props"] = _sum_cat(doc.get("days", []), "props")
+    for key in ("best_prop_type", "best_prop_pct"):
+        if key in old:
+            all_time[key] = old[key]
+    if bootstrap_ci is not None:
+        bootstrap_ci.attach_game_intervals(all_time, doc.get("days", []))
+    doc["allTime"] = all_time
+
+
+def recompute_nhl_props_results(doc, dirty):
+    """nhl_props_results.json: day record stats + all_time."""
+    for d in doc.get("days", []):
+        if d.get("date") not in dirty:
+            continue
+        graded = [p for p in d.get("picks", []) if p.get("result")]
+        w, l, ps = _wlp(graded)
+        d.update(wins=w, losses=l, pushes=ps, total=len(graded), pct=_pct(w, l),
+                 by_type=_wlp(graded, lambda p: p.get("prop", "?")),
+                 by_tier=_wlp(graded, lambda p: p.get("edge", "FAIR") or "FAIR"))
+    days = doc.get("days", [])
+    all_w = sum(d.get("wins", 0) for d in days)
+    all_l = sum(d.get("losses", 0) for d in days)
+    all_time = doc.setdefault("all_time", {})
+    all_time.update(wins=all_w, losses=all_l, pushes=sum(d.get("pushes", 0) for d in days),
+                    pct=_pct(all_w, all_l))
+    _prop_intervals(all_time, days)
+
+
+def recompute_all_props_results(doc, dirty):
+    """all_props_results.json: day overall/by_stat_type + cumulative."""
+    days = doc.get("days", [])
+    for d in days:
+        if d.get("date") not in dirty:
+            continue
+        picks = d.get("picks", [])
+        w, l, ps = _wlp(picks)
+        d["total_props_graded"] = len(picks)
+        d["overall"] = {"wins": w, "losses": l, "pushes": ps, "total": len(picks),
+                        "record": f"{w}-{l}-{ps}", "win_pct": _pct(w, l)}
+        d["by_stat_type"] = _wlp(picks, lambda p: p.get("prop", "?"))
+    all_w = sum(d.get("overall", {}).get("wins", 0) for d in days)
+    all_l = sum(d.get("overall", {}).get("losses", 0) for d in days)
+    all_p = sum(d.get("overall", {}).get("pushes", 0) for d in days)
+    doc["cumulative"] = {"wins": all_w, "losses": all_l, "pushes": all_p,
+                         "total": all_w + all_l + all_p, "win_pct": _pct(all_w, all_l)}
+    _prop_intervals(doc["cumulative"], days)
+
+
+def merge_documents(base, ours, theirs):
+    """Three-way merge two versions of one of our JSON files.
+
+    Returns the merged document (aggregates recomputed where days changed).
+    """
+    merged = merge_dict(base or {}, ours, theirs)
+    if "days" not in merged:
+        return merged
+    for side in (ours, theirs):
+        if merged["days"] == side.get("days"):
+            # Days match one side exactly: its aggregates are already right
+            for key in ("allTime", "all_time", "cumulative"):
+                if key in side:
+                    merged[key] = side[key]
+            return merged
+
+    dirty = _changed_days(merged, ours, theirs)
+    if "allTime" in merged:
+        recompute_game_results(merged, dirty)
+    elif "all_time" in merged:
+        recompute_nhl_props_results(merged, dirty)
+    elif "cumulative" in merged:
+        recompute_all_props_results(merged, dirty)
+    return merged
+
+
+def _load(path):
+    if not path or not os.path.exists(path) or os.path.getsize(path) == 0:
+        return {}
+    return json_codec.load(path)
+
+
+def main(argv):
+    if len(argv) < 4:
+        print(__doc__)
+        return 1
+    base_path, ours_path, theirs_path = argv[1:4]
+    label = argv[4] if len(argv) > 4 else os.path.basename(ours_path)
+    try:
+        base, ours, theirs = _load(base_path), _load(ours_path), _load(theirs_path)
+    except (OSError, ValueError) as e:
+        print(f"  merge_json: cannot parse {label}: {e}")
+        return 1  # leave it to git's conflict handling
+    if not isinstance(ours, dict) or not isinstance(theirs, dict):
+        print(f"  merge_json: {label} is not a JSON object — not merging")
+        return 1
+
+    merged = merge_documents(base if isinstance(base, dict) else {}, ours, theirs)
+    if not save_json(ours_path, merged):
+        return 1
+    print(f"  merge_json: merged {label}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
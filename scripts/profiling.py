@@ -0,0 +1,170 @@
+"""profiling.py — Per-phase CPU and allocation profiles for a grading cycle.
+
+`check_and_grade.py --profile [DIR]` wraps every stage of the pipeline
+(check, fetch:<sport>, grade:<sport>, props:*, store, rollups, ...) with
+cProfile and tracemalloc and writes, per stage, into DIR
+(default .grade_cache/profile/<timestamp>/):
+
+  <stage>.pstats      cProfile stats — `python -m pstats FILE`, snakeviz, ...
+  <stage>.collapsed   folded stacks ("a;b;c <microseconds>") for flamegraph.pl
+                      or speedscope, reconstructed from the caller graph
+  <stage>.alloc.txt   top allocation sites (by net bytes) and the stage's peak
+
+plus summary.txt: wall/CPU time and peak traced memory per stage, the
+WATCHED hot paths (JSON encoding, the results rebuilds, box-score
+parsing, ...) broken out by the stage that called them, and each stage's
+top functions.
+
+Stages run one at a time while profiling (tracemalloc is process-wide, so
+parallel stages would blur each other's allocations) and the stage cache is
+bypassed so every stage actually runs. cProfile sees the stage's own thread;
+work a stage hands to a thread pool shows up as time waiting on futures,
+while its allocations are still counted.
+
+Stdlib only.
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+
+TOP_N = int(os.environ.get("GRADE_PROFILE_TOP", "25"))
+TRACE_FRAMES = 1
+MAX_STACK_DEPTH = 64
+WATCHED = ("_orjson_dumps", "_stdlib_dumps", "save_json", "load_json", "canonicalize",
+           "write_game_picks", "write_nba_game_picks",
+           "_update_nhl_props_results", "_update_nba_props_results",
+           "_fetch_box_score", "_parse_box_score", "_grade_props_list", "_grade_ledger",
+           "simulate")
+
+
+def _func_label(func):
+    filename, lineno, name = func
+    if filename == "~":
+        return name  # builtins: "<built-in method ...>"
+    return f"{os.path.basename(filename)}:{lineno}({name})"
+
+
+def collapsed_stacks(stats):
+    """Folded stacks {"a;b;c": microseconds} from a pstats.Stats caller graph.
+
+    cProfile keeps only caller→callee edges, so a function's self time is
+    split over the paths into it in proportion to each edge's cumulative
+    time (the same approximation gprof-style flame graphs use).
+    """
+    raw = stats.stats  # func -> (cc, nc, tt, ct, callers{caller: (cc, nc, tt, ct)})
+    callees = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge[3]
+    roots = [f for f, v in raw.items() if not v[4] or all(c not in raw for c in v[4])]
+
+    out = {}
+
+    def walk(func, budget, path):
+        _, _, tt, ct, _ = raw[func]
+        scale = budget / ct if ct else 0.0
+        stack = path + [_func_label(func)]
+        key = ";".join(stack)
+        us = int(tt * scale * 1e6)
+        if us:
+            out[key] = out.get(key, 0) + us
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_ct in callees.get(func, {}).items():
+            if callee in raw and _func_label(callee) not in stack and edge_ct * scale > 1e-6:
+                walk(callee, edge_ct * scale, stack)
+
+    for root in roots:
+        walk(root, raw[root][3], [])
+    return out
+
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+
+
+class PhaseProfiler:
+    """Wraps stage functions; collects one profile per stage run."""
+
+    def __init__(self, out_dir, top=TOP_N):
+        self.out_dir = out_dir
+        self.top = top
+        self.phases = []  # (name, wall, cpu, peak_bytes, net_bytes, top functions)
+        self.watched = {}  # (stage, function) -> (calls, cumulative seconds)
+        self._lock = threading.Lock()
+        os.makedirs(out_dir, exist_ok=True)
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+
+    def wrap(self, name, fn):
+        def profiled(inputs):
+            return self.run(name, fn, inputs)
+        return profiled
+
+    def run(self, name, fn, *args):
+        base = os.path.join(self.out_dir, _safe_name(name))
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        mem0 = tracemalloc.get_traced_memory()[0]
+        prof = cProfile.Profile()
+        t0, c0 = time.perf_counter(), time.thread_time()
+        try:
+            prof.enable()
+            try:
+                return fn(*args)
+            finally:
+                prof.disable()
+        finally:
+            wall, cpu = time.perf_counter() - t0, time.thread_time() - c0
+            cur, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            self._write(name, base, prof, before, after, wall, cpu, peak - mem0, cur - mem0)
+
+    def _write(self, name, base, prof, before, after, wall, cpu, peak, net):
+        prof.dump_stats(base + ".pstats")
+        stats = pstats.Stats(prof)
+        with open(base + ".collapsed", "w", encoding="utf-8") as f:
+            for stack, us in sorted(collapsed_stacks(stats).items()):
+                f.write(f"{stack} {us}\n")
+
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__),
+                  tracemalloc.Filter(False, __file__)]
+        diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+        diff.sort(key=lambda d: d.size_diff, reverse=True)
+        with open(base + ".alloc.txt", "w", encoding="utf-8") as f:
+            f.write(f"{name}: peak {peak / 1e6:.2f} MB above start, net {net / 1e6:+.2f} MB\n\n")
+            f.write(f"Top {self.top} allocation sites by net size:\n")
+            for d in diff[:self.top]:
+                f.write(f"  {d.size_diff / 1024:+10.1f} KiB {d.count_diff:+8d} blocks  {d.traceback}\n")
+
+        top = [(ct, _func_label(func)) for func, (_, _, _, ct, _) in stats.stats.items()]
+        top.sort(reverse=True)
+        with self._lock:
+            self.phases.append((name, wall, cpu, peak, net, top[:10]))
+            for (_, _, fname), (_, nc, _, ct, _) in stats.stats.items():
+                if fname in WATCHED:
+                    calls, secs = self.watched.get((name, fname), (0, 0.0))
+                    self.watched[(name, fname)] = (calls + nc, secs + ct)
+
+    def write_summary(self):
+        path = os.path.join(self.out_dir, "summary.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"{'stage':22s} {'wall s':>8s} {'cpu s':>8s} {'peak MB':>8s} {'net MB':>8s}\n")
+            for name, wall, cpu, peak, net, _ in self.phases:
+                f.write(f"{name:22s} {wall:8.3f} {cpu:8.3f} {peak / 1e6:8.2f} {net / 1e6:+8.2f}\n")
+            if self.watched:
+                f.write(f"\n{'hot path':28s} {'stage':22s} {'calls':>7s} {'cum s':>8s}\n")
+                for (stage, fname), (calls, secs) in sorted(self.watched.items(), key=lambda w: -w[1][1]):
+                    f.write(f"{fname:28s} {stage:22s} {calls:7d} {secs:8.3f}\n")
+            for name, wall, _, _, _, top in sorted(self.phases, key=lambda p: -p[1]):
+                f.write(f"\n{name} — top functions by cumulative time\n")
+                for ct, label in top:
+                    f.write(f"  {ct:8.3f}s  {label}\n")
+        return path
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""results_store.py — Embedded SQLite store of graded picks and prop results.
+
+Every day and pick of the results files is kept in one SQLite database
+(.grade_cache/results.db, not committed) with indexed columns for the
+fields people ask questions about, plus the exact JSON of each record:
+
+  picks          results.json / ncaab_ / nhl_ / mlb_results.json day picks
+                 (sport, date, type, game, away, home, player, team, pick,
+                  result, hit, confidence, best_bet)
+  prop_results   nhl_props_results.json / all_props_results.json day picks
+                 (sport, date, player, team, opponent, prop, direction, line,
+                  projection, actual, result, confidence, ev, edge)
+  days, docs     everything else in each day / file (stats, by_* breakdowns)
+
+`sync()` ingests the JSON files incrementally: a day is rewritten only when
+its content hash changed. `render()` regenerates a results file from the
+store as a view — byte-for-byte the same document — either whole or only
+for given dates, patched into the file on disk.
+
+The committed JSON stays the artifact the dashboards and the merge driver
+read; the database is a derived index, rebuilt from the JSON on a fresh
+checkout in well under a second.
+
+Usage:
+    python scripts/results_store.py sync
+    python scripts/results_store.py query "SELECT date, game, pick, hit FROM picks
+        WHERE sport='NCAAB' AND type='total' AND confidence > 65 AND date >= '2026-02-01'"
+    python scripts/results_store.py render ncaab_results.json [--date 2026-03-06 ...] [--out PATH]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import json_codec
+from grade_io import load_json, save_json
+from sports import SPORTS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.environ.get("GRADE_RESULTS_DB") or os.path.join(REPO_ROOT, ".grade_cache", "results.db")
+
+# Results file → (sport, table its day picks go to), from the sport registry
+RESULTS_FILES = {spec["results_file"]: (label, "picks") for label, spec in SPORTS.items()}
+RESULTS_FILES.update({spec["props"]["results_file"]: (label, "prop_results")
+                      for label, spec in SPORTS.items() if spec["props"]})
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    file TEXT PRIMARY KEY,
+    meta TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS days (
+    file TEXT NOT NULL, date TEXT NOT NULL, dup INTEGER NOT NULL DEFAULT 0,
+    ord INTEGER NOT NULL, meta TEXT NOT NULL, hash TEXT NOT NULL,
+    PRIMARY KEY (file, date, dup)
+);
+CREATE TABLE IF NOT EXISTS picks (
+    file TEXT NOT NULL, date TEXT NOT NULL, dup INTEGER NOT NULL DEFAULT 0, ord INTEGER NOT NULL,
+    sport TEXT, pick_date TEXT, type TEXT, game TEXT, away TEXT, home TEXT,
+    player TEXT, team TEXT, pick TEXT, result TEXT, hit INTEGER,
+    confidence REAL, best_bet INTEGER, raw TEXT NOT NULL,
+    PRIMARY KEY (file, date, dup, ord)
+);
+CREATE TABLE IF NOT EXISTS prop_results (
+    file TEXT NOT NULL, date TEXT NOT NULL, dup INTEGER NOT NULL DEFAULT 0, ord INTEGER NOT NULL,
+    sport TEXT, player TEXT, team TEXT, opponent TEXT, prop TEXT, direction TEXT,
+    line REAL, projection REAL, actual REAL, result TEXT,
+    confidence REAL, ev REAL, edge TEXT, raw TEXT NOT NULL,
+    PRIMARY KEY (file, date, dup, ord)
+);
+CREATE INDEX IF NOT EXISTS picks_date ON picks (date);
+CREATE INDEX IF NOT EXISTS picks_sport_type_date ON picks (sport, type, date);
+CREATE INDEX IF NOT EXISTS picks_away ON picks (away, date);
+CREATE INDEX IF NOT EXISTS picks_home ON picks (home, date);
+CREATE INDEX IF NOT EXISTS picks_team ON picks (team, date);
+CREATE INDEX IF NOT EXISTS picks_player ON picks (player, date);
+CREATE INDEX IF NOT EXISTS props_date ON prop_results (date);
+CREATE INDEX IF NOT EXISTS props_sport_prop_date ON prop_results (sport, prop, date);
+CREATE INDEX IF NOT EXISTS props_player ON prop_results (player, date);
+CREATE INDEX IF NOT EXISTS props_team ON prop_results (team, date);
+CREATE INDEX IF NOT EXISTS props_edge ON prop_results (edge, date);
+"""
+
+_PLACEHOLDER = None  # marks where "days" / "picks" sit in the stored key order
+
+
+def connect(path=DB_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _num(v):
+    return float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else None
+
+
+def _hit(v):
+    return None if v is None else int(bool(v))
+
+
+# ── Ingest ───────────────────────────────────────────────────────
+
+
+def _pick_row(file, date, dup, ord_, sport, p):
+    away = home = None
+    game = p.get("game")
+    if isinstance(game, str) and " @ " in game:
+        away, home = game.split(" @ ", 1)
+    result = p.get("result")
+    return (file, date, dup, ord_, sport, p.get("date"), p.get("type"), game, away, home,
+            p.get("player"), p.get("team"), p.get("pick"),
+            None if result is None else str(result), _hit(p.get("hit")),
+            _num(p.get("confidence")), _hit(p.get("best_bet")), _dumps(p))
+
+
+def _prop_row(file, date, dup, ord_, sport, p):
+    return (file, date, dup, ord_, sport, p.get("player"), p.get("team"), p.get("opponent"),
+            p.get("prop"), p.get("direction"), _num(p.get("line")), _num(p.get("projection")),
+            _num(p.get("actual")), p.get("result"), _num(p.get("confidence")), _num(p.get("ev")),
+            p.get("edge"), _dumps(p))
+
+
+def _day_keys(days):
+    """(date, dup) per day — dup disambiguates repeated dates."""
+    seen = {}
+    keys = []
+    for d in days:
+        date = d.get("date") or ""
+        keys.append((date, seen.get(date, 0)))
+        seen[date] = seen.get(date, 0) + 1
+    return keys
+
+
+def ingest_document(conn, file, doc):
+    """Bring one file's rows up to date with `doc`. Returns (changed, removed) day counts."""
+    sport, table = RESULTS_FILES[file]
+    row_fn = _pick_row if table == "picks" else _prop_row
+    days = doc.get("days", [])
+    keys = _day_keys(days)
+
+    meta = {k: (_PLACEHOLDER if k == "days" else v) for k, v in doc.items()}
+    conn.execute("INSERT OR REPLACE INTO docs (file, meta) VALUES (?, ?)", (file, _dumps(meta)))
+
+    stored = {(r[0], r[1]): (r[2], r[3]) for r in conn.execute(
+        "SELECT date, dup, hash, ord FROM days WHERE file = ?", (file,))}
+    changed = 0
+    for ord_, (day, (date, dup)) in enumerate(zip(days, keys)):
+        blob = _dumps(day)
+        digest = hashlib.sha1(blob.encode("utf-8")).hexdigest()
+        prev = stored.pop((date, dup), None)
+        if prev and prev[0] == digest:
+            if prev[1] != ord_:
+                conn.execute("UPDATE days SET ord = ? WHERE file = ? AND date = ? AND dup = ?",
+                             (ord_, file, date, dup))
+            continue
+        day_meta = {k: (_PLACEHOLDER if k == "picks" else v) for k, v in day.items()}
+        conn.execute("INSERT OR REPLACE INTO days (file, date, dup, ord, meta, hash) VALUES (?, ?, ?, ?, ?, ?)",
+                     (file, date, dup, ord_, _dumps(day_meta), digest))
+        conn.execute(f"DELETE FROM {table} WHERE file = ? AND date = ? AND dup = ?", (file, date, dup))
+        rows = [row_fn(file, date, dup, i, sport, p) for i, p in enumerate(day.get("picks") or [])
+                if isinstance(p, dict)]
+        if rows:
+            conn.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(rows[0]))})", rows)
+        changed += 1
+
+    for date, dup in stored:
+        conn.execute("DELETE FROM days WHERE file = ? AND date = ? AND dup = ?", (file, date, dup))
+        conn.execute(f"DELETE FROM {table} WHERE file = ? AND date = ? AND dup = ?", (file, date, dup))
+    return changed, len(stored)
+
+
+def sync(files=None, root=REPO_ROOT, db_path=DB_PATH, quiet=False):
+    """Ingest results files whose days changed. Returns {file: changed days}."""
+    t0 = time.time()
+    out = {}
+    conn = connect(db_path)
+    try:
+        with conn:
+            for file in files or RESULTS_FILES:
+                path = os.path.join(root, file)
+                if not os.path.exists(path):
+                    continue
+                doc = json_codec.load(path)
+                changed, removed = ingest_document(conn, file, doc)
+                out[file] = changed + removed
+    finally:
+        conn.close()
+    if not quiet:
+        total = sum(out.values())
+        print(f"  Results store: {total} day(s) re-indexed across {len(out)} file(s) "
+              f"[{time.time() - t0:.2f}s]")
+    return out
+
+
+# ── Views ────────────────────────────────────────────────────────
+
+
+def _load_day(conn, file, table, date, dup, meta):
+    day = json.loads(meta)
+    if "picks" in day:
+        day["picks"] = [json.loads(raw) for (raw,) in conn.execute(
+            f"SELECT raw FROM {table} WHERE file = ? AND date = ? AND dup = ? ORDER BY ord",
+            (file, date, dup))]
+    return day
+
+
+def render(conn, file, dates=None, base=None):
+    """Regenerate a results document from the store.
+
+    With `dates`, only those days are rebuilt and patched into `base` (the
+    document on disk); everything else in `base` is reused as is.
+    """
+    _, table = RESULTS_FILES[file]
+    row = conn.execute("SELECT meta FROM docs WHERE file = ?", (file,)).fetchone()
+    if row is None:
+        return None
+    doc = json.loads(row[0])
+    day_rows = conn.execute("SELECT date, dup, meta FROM days WHERE file = ? ORDER BY ord",
+                            (file,)).fetchall()
+
+    if dates is None or base is None:
+        days = [_load_day(conn, file, table, date, dup, meta) for date, dup, meta in day_rows]
+    else:
+        wanted = set(dates)
+        old = {k: d for k, d in zip(_day_keys(base.get("days", [])), base.get("days", []))}
+        days = []
+        for date, dup, meta in day_rows:
+            if date in wanted or (date, dup) not in old:
+                days.append(_load_day(conn, file, table, date, dup, meta))
+            else:
+                days.append(old[(date, dup)])
+    if "days" in doc:
+        doc["days"] = days
+    return doc
+
+
+def write_view(file, dates=None, out=None, root=REPO_ROOT, db_path=DB_PATH):
+    """Render `file` from the store and save it (canonical write)."""
+    path = out or os.path.join(root, file)
+    conn = connect(db_path)
+    try:
+        doc = render(conn, file, dates, load_json(path) if dates else None)
+    finally:
+        conn.close()
+    if doc is None:
+        print(f"  Results store: {file} not in store — run sync first")
+        return False
+    return save_json(path, doc)
+
+
+def query(sql, params=(), db_path=DB_PATH):
+    conn = connect(db_path)
+    try:
+        cur = conn.execute(sql, params)
+        cols = [c[0] for c in cur.description or []]
+        return cols, cur.fetchall()
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="SQLite results store")
+    sub = ap.add_subparsers(dest="cmd")
+    sub.add_parser("sync", help="ingest changed days from the results files")
+    q = sub.add_parser("query", help="run a SQL query against the store")
+    q.add_argument("sql")
+    r = sub.add_parser("render", help="regenerate a results file from the store")
+    r.add_argument("file", choices=sorted(RESULTS_FILES))
+    r.add_argument("--date", action="append", help="only rebuild this day (repeatable)")
+    r.add_argument("--out", help="write here instead of the repo file")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "sync":
+        sync()
+    elif args.cmd == "query":
+        sync(quiet=True)
+        t0 = time.time()
+        cols, rows = query(args.sql)
+        print("\t".join(cols))
+        for row in rows:
+            print("\t".join("" if v is None else str(v) for v in row))
+        print(f"  ({len(rows)} row(s), {(time.time() - t0) * 1000:.1f} ms)")
+    elif args.cmd == "render":
+        sync(quiet=True)
+        write_view(args.file, args.date, args.out)
+    else:
+        ap.print_help()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
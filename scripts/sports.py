@@ -0,0 +1,168 @@
+"""sports.py — Sport registry: everything league-specific, one entry per league.
+
+Each `register_sport(...)` call bundles what the grader needs to know about a
+league:
+
+  ESPN      site path (scoreboard + summary URLs), extra scoreboard params,
+            abbreviation fixes, and the order scoreboard dates are fetched in
+            (later dates win on matchup clashes)
+  files     projection, live sidecar and results files; `results_schema` picks
+            the results writer ("games": game picks only, "nba": game picks
+            kept beside prop picks in the same days)
+  clock     regulation periods, period / overtime length in seconds (None for
+            untimed periods such as innings) and the fast-poll profile: the
+            final regulation period under `fast_poll_clock` seconds, or any
+            overtime when `fast_poll_overtime`
+  live      optional `live_model` for in-game probabilities (live_prob.py):
+            "normal" (rounded normal, for points) or "count" (Poisson /
+            negative binomial, for goals and runs), the variance/mean ratio of
+            a team's score, the correlation between the teams' scores, and
+            how a tie ends ("overtime" periods or the "next_score" wins)
+  props     optional: live sidecar, props source files (file, list key), props
+            results file, and the prop type → box-score label map
+  workers   concurrent box-score fetches for live props
+
+check_and_grade derives SPORT_CONFIG, ESPN_ENDPOINTS, ESPN_ABBR_FIX_BY_SPORT,
+PROPS_LIVE_CONFIG and its stat extractors from SPORTS, so a new league (WNBA,
+NFL, college football) is one more call here plus its projection files; a
+league whose projection file does not exist yet is skipped by the check stage.
+
+Prop stat maps: a label reads one cell, a tuple of labels sums the cells, and a
+nested tuple lists alternative labels for one component (first present wins):
+{"pts": "PTS", "pra": ("PTS", "REB", "AST"), "shots": (("S", "SOG"),)}.
+"""
+
+ESPN_SITE = "https://site.api.espn.com/apis/site/v2/sports"
+
+SPORTS = {}  # label -> spec, in registration (pipeline) order
+
+
+def register_sport(label, espn_path, proj_file, live_file, results_file, *, periods,
+                   period_secs=None, overtime_secs=None, fast_poll_clock=None,
+                   fast_poll_overtime=False, results_schema="games", scoreboard_params=None,
+                   fetch_dates=("today", "yesterday"), abbr_fix=None, live_model=None,
+                   props=None, box_score_workers=4):
+    """Add a league to SPORTS; returns its spec dict."""
+    spec = {
+        "label": label,
+        "scoreboard_url": f"{ESPN_SITE}/{espn_path}/scoreboard",
+        "summary_url": f"{ESPN_SITE}/{espn_path}/summary",
+        "scoreboard_params": dict(scoreboard_params or {}),
+        "fetch_dates": tuple(fetch_dates),
+        "abbr_fix": dict(abbr_fix or {}),
+        "proj_file": proj_file,
+        "live_file": live_file,
+        "results_file": results_file,
+        "results_schema": results_schema,
+        "periods": periods,
+        "period_secs": period_secs,
+        "overtime_secs": overtime_secs,
+        "fast_poll_clock": fast_poll_clock,
+        "fast_poll_overtime": fast_poll_overtime,
+        "live_model": dict(live_model) if live_model else None,
+        "props": props,
+        "box_score_workers": box_score_workers,
+    }
+    SPORTS[label] = spec
+    return spec
+
+
+def scoreboard_dates(label, today, yesterday):
+    """Scoreboard dates to fetch for one grading cycle, in merge order."""
+    return [today if d == "today" else yesterday for d in SPORTS[label]["fetch_dates"]]
+
+
+def live_dates(label, today, yesterday):
+    """Scoreboard dates that can still hold in-progress games: today, after
+    yesterday for slates that run past midnight (yesterday fetched first)."""
+    return [yesterday, today] if SPORTS[label]["fetch_dates"][0] == "yesterday" else [today]
+
+
+def ending_soon(label, period, clock_secs):
+    """True when an in-progress game is in its fast-poll window."""
+    spec = SPORTS.get(label)
+    if spec is None:
+        return False
+    if spec["fast_poll_overtime"] and period > spec["periods"]:
+        return True
+    return period >= spec["periods"] and (spec["fast_poll_clock"] is None
+                                          or clock_secs < spec["fast_poll_clock"])
+
+
+def remaining_fraction(label, period, clock_secs):
+    """Share of regulation playing time left, as a fraction of a full game.
+
+    period 0 is pregame (1.0). In overtime only the current period counts.
+    Untimed periods (innings) count half of the current one as left. An
+    unknown clock (None) counts as the whole period.
+    """
+    spec = SPORTS[label]
+    periods = spec["periods"]
+    if period <= 0:
+        return 1.0
+    if not spec["period_secs"]:
+        return max(periods - period + 0.5, 0.5) / periods
+    regulation = periods * spec["period_secs"]
+    if period > periods:
+        length = spec["overtime_secs"] or 0
+        left = length if clock_secs is None else min(clock_secs, length)
+        return left / regulation
+    left = spec["period_secs"] if clock_secs is None else min(clock_secs, spec["period_secs"])
+    return ((periods - period) * spec["period_secs"] + left) / regulation
+
+
+# ── Leagues ──────────────────────────────────────────────────────
+
+# ESPN NBA box score labels: MIN, PTS, FG, 3PT, FT, REB, AST, TO, STL, BLK, ...
+register_sport(
+    "NBA", "basketball/nba", "game_projections.json", "nba_live.json", "results.json",
+    periods=4, period_secs=720, overtime_secs=300, fast_poll_clock=180,
+    results_schema="nba",
+    live_model={"dist": "normal", "dispersion": 1.0, "corr": 0.33, "ties": "overtime"},
+    abbr_fix={"GS": "GSW", "SA": "SAS", "NY": "NYK", "NO": "NOP", "UTAH": "UTA", "WSH": "WAS"},
+    props={
+        "live_file": "nba_props_live.json",
+        "sources": [("all_props.json", "props"), ("projections.json", "projections")],
+        "results_file": "all_props_results.json",
+        "stats": {
+            "pts": "PTS", "reb": "REB", "ast": "AST", "stl": "STL", "blk": "BLK",
+            "to": "TO", "3pm": "3PT",
+            "pra": ("PTS", "REB", "AST"), "pr": ("PTS", "REB"), "pa": ("PTS", "AST"),
+            "ra": ("REB", "AST"),
+        },
+    },
+)
+
+# ESPN NHL labels: G, A, SOG, S, BS, HT, TK, SV, SA, etc.
+register_sport(
+    "NHL", "hockey/nhl", "nhl_game_projections.json", "nhl_live.json", "nhl_results.json",
+    periods=3, period_secs=1200, overtime_secs=300, fast_poll_clock=300, fast_poll_overtime=True,
+    abbr_fix={"TB": "TBL", "SJ": "SJS", "LA": "LAK", "NJ": "NJD",
+              "MON": "MTL", "CLB": "CBJ", "NASH": "NSH"},
+    live_model={"dist": "count", "dispersion": 1.0, "ties": "next_score"},
+    props={
+        "live_file": "nhl_props_live.json",
+        "sources": [("nhl_player_props.json", "projections")],
+        "results_file": "nhl_props_results.json",
+        "stats": {
+            "shots": (("S", "SOG"),), "goals": "G", "assists": "A", "saves": "SV",
+            "blocked_shots": "BS", "hits": "HT", "points": ("G", "A"),
+        },
+    },
+)
+
+# Division I only (groups=50), whole slate in one page; late tips run past
+# midnight, so yesterday's scoreboard is fetched first and today's wins.
+register_sport(
+    "NCAAB", "basketball/mens-college-basketball", "ncaab_projections.json", "ncaab_live.json",
+    "ncaab_results.json",
+    periods=2, period_secs=1200, overtime_secs=300, fast_poll_clock=180,
+    scoreboard_params={"limit": 300, "groups": 50}, fetch_dates=("yesterday", "today"),
+    live_model={"dist": "normal", "dispersion": 1.35, "corr": 0.36, "ties": "overtime"},
+)
+
+register_sport(
+    "MLB", "baseball/mlb", "mlb_game_projections.json", "mlb_live.json", "mlb_results.json",
+    periods=9,
+    live_model={"dist": "count", "dispersion": 2.0, "ties": "next_score"},
+)
@@ -0,0 +1,287 @@
+"""stage_dag.py — Tiny declarative stage executor for the grading pipeline.
+
+A stage is a plain dict (built with `stage()`) that declares:
+  needs:    in-memory artifacts it consumes (e.g. "scoreboard:NBA")
+  provides: artifacts it returns as a dict from its function
+  reads:    repo files it reads (e.g. "game_projections.json")
+  writes:   repo files it writes
+  after:    extra explicit ordering on other stage names
+
+Edges are derived from those declarations in declaration order, so the
+graph is always acyclic: a stage waits for earlier stages that provide an
+artifact it needs, write a file it reads or writes, or read a file it writes.
+Everything else runs in parallel on daemon threads, each with its own
+timeout and timing. A timed-out stage's thread cannot be killed: it is
+abandoned (its dependents are blocked) and joined before run_stages returns,
+for at most STRAGGLER_GRACE seconds; one still running after that fails the
+run with exit code 1 rather than being cut off mid-write at interpreter exit.
+
+Cacheable stages are skipped when the content hash of everything they read
+and need matches the hash recorded after their last successful run; their
+last outputs are restored from the state file instead.
+
+Self-contained (stdlib only): no grader imports, so it can be reused and
+tested on its own.
+"""
+
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+
+STRAGGLER_GRACE = float(os.environ.get("GRADE_STAGE_GRACE", "30"))
+
+
+class PipelineHalt(Exception):
+    """Raised by a stage to stop scheduling further stages with an exit code."""
+
+    def __init__(self, code, message=""):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def stage(name, fn, needs=(), provides=(), reads=(), writes=(), after=(),
+          timeout=120, cache=True, ttl=None):
+    """Build a stage definition.
+
+    Args:
+        name: Unique stage name (shown in logs and timing)
+        fn: Callable taking a dict of the needed artifacts, returning a dict
+            of provided artifacts (or None)
+        needs / provides: Artifact names consumed / produced
+        reads / writes: Absolute file paths read / written
+        after: Names of stages that must finish first (ordering only)
+        timeout: Seconds before the stage is abandoned
+        cache: Skip the stage when its inputs are unchanged since last run
+        ttl: Optional max age (seconds) of a cached run before forcing a rerun
+    """
+    return {
+        "name": name, "fn": fn,
+        "needs": tuple(needs), "provides": tuple(provides),
+        "reads": tuple(reads), "writes": tuple(writes), "after": tuple(after),
+        "timeout": timeout, "cache": cache, "ttl": ttl,
+    }
+
+
+# ── Fingerprinting ───────────────────────────────────────────────
+
+
+def _hash_file(path):
+    if not os.path.exists(path):
+        return "missing"
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _hash_value(value):
+    blob = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def _fingerprint(st, artifacts):
+    """Content hash of everything a stage reads and needs."""
+    h = hashlib.sha1()
+    for path in sorted(st["reads"]):
+        h.update(f"{path}={_hash_file(path)};".encode("utf-8"))
+    for name in sorted(st["needs"]):
+        h.update(f"{name}={_hash_value(artifacts.get(name))};".encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path, state):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"), default=str)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"  [dag] could not save state: {e}")
+
+
+# ── Graph ────────────────────────────────────────────────────────
+
+
+def build_edges(stages):
+    """Return {stage_name: set(upstream stage names)} from declarations."""
+    names = [s["name"] for s in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("duplicate stage names")
+    deps = {s["name"]: set(s["after"]) for s in stages}
+    for i, st in enumerate(stages):
+        for prev in stages[:i]:
+            if (set(st["needs"]) & set(prev["provides"])
+                    or set(st["reads"]) & set(prev["writes"])
+                    or set(st["writes"]) & set(prev["writes"])
+                    or set(st["writes"]) & set(prev["reads"])):
+                deps[st["name"]].add(prev["name"])
+    for name, ups in deps.items():
+        unknown = ups - set(names)
+        if unknown:
+            raise ValueError(f"stage {name} depends on unknown stage(s): {sorted(unknown)}")
+    return deps
+
+
+# ── Execution ────────────────────────────────────────────────────
+
+
+def _run_in_thread(st, inputs, done_q):
+    def target():
+        t0 = time.time()
+        try:
+            out = st["fn"](inputs) or {}
+            done_q.put((st["name"], "ok", out, None, time.time() - t0))
+        except PipelineHalt as h:
+            done_q.put((st["name"], "halted", {}, h, time.time() - t0))
+        except Exception as e:
+            done_q.put((st["name"], "error", {}, e, time.time() - t0))
+
+    t = threading.Thread(target=target, name=f"stage-{st['name']}", daemon=True)
+    t.start()
+    return t
+
+
+def run_stages(stages, state_path=None, serial=False, grace=None):
+    """Execute stages respecting declared dependencies.
+
+    With `serial`, at most one stage runs at a time (still in dependency
+    order) — used when profiling so per-stage measurements don't overlap.
+    `grace` (default STRAGGLER_GRACE) bounds the wait for timed-out stages'
+    threads at the end.
+
+    Returns (artifacts, report, halt):
+        artifacts: dict of every artifact provided by completed/cached stages
+        report: {name: {"status", "secs", "error"}} in declaration order;
+                status is ok | cached | error | timeout | blocked | halted | not_run
+        halt: the PipelineHalt raised by a stage (or code 1 when a timed-out
+              stage is still running after the grace period), or None
+    """
+    by_name = {s["name"]: s for s in stages}
+    deps = build_edges(stages)
+    state = load_state(state_path) if state_path else {}
+    artifacts = {}
+    report = {s["name"]: {"status": "not_run", "secs": 0.0, "error": None} for s in stages}
+    finished = set()
+    abandoned = set()  # timed out (thread may still be running) or blocked behind one
+    running = {}  # name -> deadline
+    threads = {}  # name -> thread, for joining the abandoned ones
+    done_q = queue.Queue()
+    halt = None
+    state_dirty = False
+
+    def _finish(name, status, secs=0.0, error=None):
+        report[name].update(status=status, secs=secs, error=error)
+        finished.add(name)
+
+    while True:
+        # Schedule everything that is ready
+        progressed = True
+        while progressed and halt is None:
+            progressed = False
+            for st in stages:
+                name = st["name"]
+                if name in finished or name in running or not deps[name] <= finished:
+                    continue
+                if serial and running:
+                    break
+                progressed = True
+                stuck = sorted(deps[name] & abandoned)
+                if stuck:
+                    # an abandoned thread may still be writing what this stage reads
+                    abandoned.add(name)
+                    _finish(name, "blocked", error=f"upstream timed out: {', '.join(stuck)}")
+                    continue
+                missing = [n for n in st["needs"] if n not in artifacts]
+                if missing:
+                    _finish(name, "blocked", error=f"missing {', '.join(missing)}")
+                    continue
+                inputs = {n: artifacts[n] for n in st["needs"]}
+                if st["cache"]:
+                    prev = state.get(name)
+                    fresh = (prev is not None
+                             and (st["ttl"] is None or time.time() - prev.get("at", 0) < st["ttl"]))
+                    if fresh and prev.get("fp") == _fingerprint(st, artifacts):
+                        artifacts.update(prev.get("out", {}))
+                        _finish(name, "cached")
+                        continue
+                threads[name] = _run_in_thread(st, inputs, done_q)
+                running[name] = time.time() + st["timeout"]
+
+        if not running:
+            break
+
+        wait = max(0.0, min(running.values()) - time.time())
+        try:
+            name, status, out, err, secs = done_q.get(timeout=wait)
+        except queue.Empty:
+            now = time.time()
+            for name, deadline in list(running.items()):
+                if deadline <= now:
+                    del running[name]
+                    abandoned.add(name)
+                    _finish(name, "timeout", secs=by_name[name]["timeout"],
+                            error=f"exceeded {by_name[name]['timeout']}s")
+                    print(f"  ERROR stage {name} timed out after {by_name[name]['timeout']}s (non-fatal)")
+            continue
+
+        if name not in running:
+            continue  # late result from a stage that already timed out
+        del running[name]
+        st = by_name[name]
+        if status == "ok":
+            provided = {k: v for k, v in out.items() if k in st["provides"]}
+            artifacts.update(provided)
+            _finish(name, "ok", secs)
+            if st["cache"]:
+                try:
+                    json.dumps(provided)
+                    state[name] = {"fp": _fingerprint(st, artifacts), "out": provided, "at": time.time()}
+                    state_dirty = True
+                except (TypeError, ValueError):
+                    pass
+        elif status == "halted":
+            halt = err
+            _finish(name, "halted", secs, err.message)
+        else:
+            _finish(name, "error", secs, str(err))
+            print(f"  ERROR in stage {name} (non-fatal): {err}")
+
+    if state_path and state_dirty:
+        save_state(state_path, state)
+
+    deadline = time.time() + (STRAGGLER_GRACE if grace is None else grace)
+    stragglers = []
+    for name in abandoned & threads.keys():
+        threads[name].join(max(0.0, deadline - time.time()))
+        if threads[name].is_alive():
+            stragglers.append(name)
+    if stragglers and halt is None:
+        halt = PipelineHalt(1, f"timed-out stage(s) still running: {', '.join(sorted(stragglers))}")
+    return artifacts, report, halt
+
+
+def format_timing(report):
+    """One-line per-stage timing summary, e.g. 'check 0.0s, grade:NBA cached'."""
+    parts = []
+    for name, r in report.items():
+        if r["status"] == "not_run":
+            continue
+        if r["status"] in ("ok", "halted"):
+            parts.append(f"{name} {r['secs']:.1f}s")
+        else:
+            parts.append(f"{name} {r['status']}")
+    return ", ".join(parts)
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import check_and_grade as cg  # noqa: E402
+import grade_journal  # noqa: E402
+
+DATE = "2026-03-07"
+
+
+def _game(away, home, away_score, home_score):
+    return {"away_team": away, "home_team": home, "status": "final",
+            "away_score": away_score, "home_score": home_score,
+            "spread_pick": f"{home} -3.5", "spread_conf": 60, "spread_result": "W" if home_score - away_score > 3.5 else "L",
+            "ml_pick": home, "ml_conf": 70, "ml_result": "W" if home_score > away_score else "L"}
+
+
+def _final(game, at):
+    e = grade_journal.game_final_event("NCAAB", DATE, game)
+    e["at"] = at
+    return e
+
+
+def _lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_same_outcome_is_journaled_once_and_a_return_to_it_again(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    a, b = _game("A", "H", 60, 70), _game("A", "H", 60, 71)  # score corrected, then reverted
+
+    assert grade_journal.append_events([_final(a, 1.0)], path) == 1
+    assert grade_journal.append_events([_final(a, 2.0)], path) == 0  # already the latest
+    assert grade_journal.append_events([_final(b, 3.0)], path) == 1
+    assert grade_journal.append_events([_final(a, 4.0)], path) == 1
+    assert grade_journal.append_events([_final(a, 4.0), _final(b, 3.0)], path) == 0
+
+    latest = grade_journal._latest(grade_journal.read_events(path))
+    assert [e["home_score"] for e in latest.values()] == [70]
+    assert len(_lines(path)) == 3
+
+
+def test_journal_replaced_on_disk_is_reread(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    a = _game("A", "H", 60, 70)
+    assert grade_journal.append_events([_final(a, 1.0)], path) == 1
+    open(path, "w").close()  # git reset to a journal without it
+    assert grade_journal.append_events([_final(a, 1.0)], path) == 1
+    assert len(_lines(path)) == 1
+
+
+def test_compact_keeps_the_latest_event_of_recent_days(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    a, b = _game("A", "H", 60, 70), _game("A", "H", 60, 71)
+    old = grade_journal.game_final_event("NCAAB", "2026-02-01", a)
+    grade_journal.append_events([old, _final(a, 1.0)], path)
+    grade_journal.append_events([_final(b, 2.0)], path)
+
+    assert grade_journal.compact(path, keep_days=7, today="2026-03-08") == (3, 1)
+    assert [(e["date"], e["home_score"]) for e in _lines(path)] == [(DATE, 71)]
+    assert grade_journal.append_events([_final(b, 2.0)], path) == 0  # cache follows the rewrite
+    assert grade_journal.compact(path, keep_days=7, today="2026-03-08") == (1, 1)
+
+
+def test_replayed_score_picks_survive_a_regrade(tmp_path, monkeypatch):
+    monkeypatch.setattr(grade_journal, "REPO_ROOT", str(tmp_path))
+    path = str(tmp_path / "grade_journal.jsonl")
+    results_path = str(tmp_path / "ncaab_results.json")
+    g1, g2 = _game("A", "H", 60, 70), _game("B", "K", 80, 75)
+    score = {"date": DATE, "type": "score", "game": "C @ L", "pick": "", "result": "66-64", "hit": None}
+
+    grade_journal.record_game_finals("NCAAB", DATE, [g1], cg.build_game_picks([g1], DATE), path)
+    grade_journal.record_score_picks("NCAAB", DATE, [score], path)
+
+    # Replay onto a results file that lost everything (git reset)
+    assert grade_journal.materialize(path)["results_days"] == 1
+    day = cg.load_json(results_path)["days"][0]
+    assert sorted((p["type"], p["game"]) for p in day["picks"]) == [
+        ("ml", "A @ H"), ("score", "C @ L"), ("spread", "A @ H")]
+    assert grade_journal.materialize(path)["results_days"] == 0
+
+    # The next grade cycle rewrites the day's game picks from the projection file
+    cg.write_game_picks(cg.build_game_picks([g1, g2], DATE), DATE, results_path)
+    day = cg.load_json(results_path)["days"][0]
+    assert sorted((p["type"], p["game"]) for p in day["picks"]) == [
+        ("ml", "A @ H"), ("ml", "B @ K"), ("score", "C @ L"), ("spread", "A @ H"), ("spread", "B @ K")]
+    assert day["moneylines"]["record"] == "1-1"
+    assert day["best_bets"]["record"] == "2-2"
+    assert not any(p.get("best_bet") for p in day["picks"] if p["type"] == "score")
+
+    # Once the game itself is graded, its score-only entry goes
+    g3 = _game("C", "L", 66, 64)
+    cg.write_game_picks(cg.build_game_picks([g1, g2, g3], DATE), DATE, results_path)
+    day = cg.load_json(results_path)["days"][0]
+    assert not any(p["type"] == "score" for p in day["picks"])
+    assert grade_journal.materialize(path)["results_days"] == 0
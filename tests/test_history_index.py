@@ -0,0 +1,64 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import history_index  # noqa: E402
+
+
+def _prop(player, team, prop, line, projection, direction="OVER"):
+    return {"player": player, "team": team, "opponent": "BOS", "prop": prop, "line": line,
+            "projection": projection, "direction": direction}
+
+
+def _snapshot(root, date, props):
+    doc = {"nhl_player_props": {"date": date, "projections": props}}
+    with open(os.path.join(root, "archive", f"projections_{date}.json"), "w", encoding="utf-8") as f:
+        json.dump(doc, f)
+
+
+def _build(tmp_path):
+    root = tmp_path / "repo"
+    (root / "archive").mkdir(parents=True)
+    _snapshot(str(root), "2026-03-01", [_prop("Matt Boldy", "MIN", "POINTS", 0.5, 0.9),
+                                        _prop("Kirill Kaprizov", "MIN", "SOG", 3.5, 4.1)])
+    _snapshot(str(root), "2026-03-03", [_prop("Matt Boldy", "MIN", "POINTS", 1.5, 1.2, "UNDER"),
+                                        _prop("Auston Matthews", "TOR", "SOG", 4.5, 5.0)])
+    results = {"days": [{"date": "2026-03-01", "picks": [
+        {"player": "Matt Boldy", "team": "MIN", "prop": "POINTS", "direction": "OVER", "line": 0.5,
+         "actual": 2.0, "result": "WIN"}]}]}
+    (root / "nhl_props_results.json").write_text(json.dumps(results))
+    return {"root": str(root), "index_dir": str(tmp_path / "index"), "db_path": str(tmp_path / "results.db")}
+
+
+def test_player_and_team_queries(tmp_path):
+    paths = _build(tmp_path)
+    assert history_index.update(quiet=True, **paths) == 3  # two snapshots, one results day
+    index = history_index.HistoryIndex(paths["index_dir"])
+
+    rows = index.player("matt boldy")
+    assert [(r["date"], r["line"], r["source"]) for r in rows] == [
+        ("2026-03-01", 0.5, "archive"), ("2026-03-01", 0.5, "results"), ("2026-03-03", 1.5, "archive")]
+    assert [r["direction"] for r in history_index.coalesce(rows)] == ["OVER", "UNDER"]
+    graded = history_index.coalesce(rows)[0]
+    assert (graded["projection"], graded["actual"], graded["result"]) == (0.9, 2.0, "WIN")
+
+    assert [r["player"] for r in index.team("MIN", prop="sog")] == ["Kirill Kaprizov"]
+    assert [r["player"] for r in index.team("min", since=index.latest(1))] == ["Matt Boldy"]
+    assert index.player("Nobody") == [] and index.team("XYZ") == []
+
+
+def test_update_reparses_only_changed_units(tmp_path):
+    paths = _build(tmp_path)
+    history_index.update(quiet=True, **paths)
+    assert history_index.update(quiet=True, **paths) == 0
+
+    _snapshot(paths["root"], "2026-03-03", [_prop("Auston Matthews", "TOR", "SOG", 3.5, 4.0)])
+    os.remove(os.path.join(paths["root"], "archive", "projections_2026-03-01.json"))
+    assert history_index.update(quiet=True, **paths) == 1
+
+    index = history_index.HistoryIndex(paths["index_dir"])
+    assert [r["line"] for r in index.player("Auston Matthews")] == [3.5]
+    assert [r["source"] for r in index.player("Matt Boldy")] == ["results"]
+    assert index.player("Kirill Kaprizov") == []
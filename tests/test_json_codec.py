@@ -0,0 +1,64 @@
+import json
+import math
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import json_codec  # noqa: E402
+
+DOCS = [
+    {"games": [{"away_team": "DRKE", "home_team": "UIC", "spread_line": -3.5,
+                "home_win_prob": 61.2, "status": "final", "away_score": 70, "home_score": 68}],
+     "updated": "2026-03-07T21:14:03"},
+    {"name": "Nikola Jokić", "note": "café — \U0001F3C0 \x7f", "empty": {}, "list": []},
+    {"nan": math.nan, "inf": math.inf, "ninf": -math.inf, "nested": [math.nan, 1.5]},
+    {"tiny": 1.5e-7, "small": 0.00001, "big": 1e16, "str_like": "10.00001", "exp": "1e-3"},
+    {"big_int": 2 ** 70, "neg": -(2 ** 65), "bools": [True, False, None]},
+    {1: "int key", "x": 0.1 + 0.2},
+    [],
+    "plain",
+]
+
+
+def _sanitized(obj):
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    if isinstance(obj, dict):
+        return {k: _sanitized(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_sanitized(v) for v in obj]
+    return obj
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "orjson"])
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("doc", DOCS)
+def test_dumps_matches_stdlib_json_bytes(monkeypatch, backend, compact, doc):
+    if backend == "orjson" and json_codec.orjson is None:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_codec, "BACKEND", backend)
+    expected = (json.dumps(_sanitized(doc), separators=(",", ":")) if compact
+                else json.dumps(_sanitized(doc), indent=2)).encode("ascii")
+    assert json_codec.dumps(doc, compact) == expected
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "orjson"])
+def test_loads_round_trips_what_the_stdlib_accepts(monkeypatch, backend):
+    if backend == "orjson" and json_codec.orjson is None:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_codec, "BACKEND", backend)
+    text = '{"a": NaN, "b": 123456789012345678901234567890, "c": "\\ud800", "d": [1.5]}'
+    got = json_codec.loads(text)
+    assert math.isnan(got["a"]) and got["b"] == 123456789012345678901234567890
+    assert got["c"] == "\ud800" and got["d"] == [1.5]
+
+
+def test_dump_replaces_the_file_without_leaving_temp_files(tmp_path):
+    path = tmp_path / "results.json"
+    path.write_text("old")
+    n = json_codec.dump({"games": [1, 2]}, str(path))
+    assert path.read_bytes() == json_codec.dumps({"games": [1, 2]}) and n == path.stat().st_size
+    assert os.listdir(tmp_path) == ["results.json"]
@@ -0,0 +1,45 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import live_prob  # noqa: E402
+
+NBA_GAME = {"away_team": "A", "home_team": "H", "proj_score": "110-114", "home_win_prob": 62,
+            "spread_pick": "H -2", "total_line": 220.5, "total_pick": "OVER", "ml_pick": "H"}
+
+
+def _state(away, home, period, clock):
+    return {"away_score": away, "home_score": home, "period": period, "clock": clock}
+
+
+def test_tie_at_the_end_of_regulation_plays_overtime():
+    dog = dict(NBA_GAME, spread_pick="A 1.5")
+    tied = _state(100, 100, 4, "0:00")
+    fav, under = live_prob.simulate("NBA", [NBA_GAME, dog], [tied, tied])
+
+    # played-out overtime leaves every market uncertain
+    assert 0.45 < fav["home_win"] < 0.65
+    assert 0.5 < fav["total"] < 0.95  # 200 + overtime points
+    assert 0.2 < fav["spread"] < fav["home_win"]  # -2 needs a 3-point overtime win
+    assert 1 - fav["home_win"] < under["spread"] < 0.9  # +1.5 also covers a 1-point home win
+
+
+def test_untied_games_do_not_go_to_overtime():
+    (prob,) = live_prob.simulate("NBA", [NBA_GAME], [_state(100, 110, 4, "0:00")])
+    assert prob == {"home_win": 1.0, "spread": 1.0, "total": 0.0, "ml": 1.0}
+
+
+def test_next_score_tie_break_uses_the_pregame_win_probability():
+    game = {"away_team": "A", "home_team": "H", "proj_score": "2.8-3.1", "home_win_prob": 60, "ml_pick": "A"}
+    (prob,) = live_prob.simulate("NHL", [game], [_state(2, 2, 3, "0:00")])
+    assert abs(prob["home_win"] - 0.60) < 0.03
+    assert prob["ml"] == round(1 - prob["home_win"], 3)
+
+
+def test_a_games_probabilities_do_not_depend_on_the_rest_of_the_slate():
+    state = _state(88, 90, 4, "3:10")
+    other = dict(NBA_GAME, away_team="B", home_team="K", proj_score="101-99")
+    alone = live_prob.simulate("NBA", [NBA_GAME], [state])
+    batch = live_prob.simulate("NBA", [other, NBA_GAME], [_state(95, 95, 4, "0:00"), state])
+    assert batch[1] == alone[0]
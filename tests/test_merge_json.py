@@ -0,0 +1,85 @@
+import copy
+import json
+import os
+import subprocess
+import sys
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+sys.path.insert(0, SCRIPTS)
+
+import merge_json  # noqa: E402
+
+
+def _pick(game, typ, conf, hit, best_bet=False):
+    p = {"date": "2026-03-07", "type": typ, "game": game, "pick": "X", "result": "70-68",
+         "hit": hit, "confidence": conf}
+    if best_bet:
+        p["best_bet"] = True
+    return p
+
+
+def _results(picks):
+    return {"updated": "2026-03-07T20:00:00", "allTime": {},
+            "days": [{"date": "2026-03-07", "picks": picks}]}
+
+
+def _best_bets(doc):
+    return sorted((p["game"], p["type"]) for p in doc["days"][0]["picks"] if p.get("best_bet"))
+
+
+def test_concurrent_grades_keep_both_sides_and_reselect_best_bets():
+    base_picks = [_pick(f"A{i} @ H{i}", "spread", 60 + i, True) for i in range(5)]
+    base = _results(base_picks)
+    ours = _results(copy.deepcopy(base_picks) + [_pick("O1 @ O2", "total", 90, False),
+                                                 _pick("O3 @ O4", "ml", 88, True)])
+    theirs = _results(copy.deepcopy(base_picks) + [_pick("T1 @ T2", "spread", 95, True),
+                                                   _pick("T3 @ T4", "total", 50, None)])
+    for doc in (ours, theirs):  # each side tagged its own top 5
+        for p in doc["days"][0]["picks"]:
+            p.pop("best_bet", None)
+        for p in sorted(doc["days"][0]["picks"], key=lambda p: p["confidence"], reverse=True)[:5]:
+            p["best_bet"] = True
+    theirs["updated"] = "2026-03-07T20:05:00"
+
+    merged = merge_json.merge_documents(base, ours, theirs)
+
+    day = merged["days"][0]
+    assert len(day["picks"]) == 9
+    assert _best_bets(merged) == sorted([("T1 @ T2", "spread"), ("O1 @ O2", "total"),
+                                         ("O3 @ O4", "ml"), ("A4 @ H4", "spread"),
+                                         ("A3 @ H3", "spread")])
+    assert day["spreads"]["record"] == "6-0"
+    assert day["totals"] == {"wins": 0, "losses": 1, "pushes": 1, "record": "0-1-1", "pct": 0.0}
+    assert day["best_bets"]["record"] == "4-1"
+    assert merged["allTime"]["spreads"]["wins"] == 6
+    assert merged["updated"] == "2026-03-07T20:05:00"
+
+
+def test_conflicting_field_takes_the_more_graded_record():
+    base = {"games": [{"away_team": "A", "home_team": "H", "status": "scheduled"}]}
+    ours = {"games": [{"away_team": "A", "home_team": "H", "status": "live"}]}
+    theirs = {"games": [{"away_team": "A", "home_team": "H", "status": "final",
+                         "away_score": 70, "home_score": 68, "spread_result": "W"}]}
+    merged = merge_json.merge_documents(base, ours, theirs)
+    assert merged["games"][0]["status"] == "final"
+    assert merged["games"][0]["spread_result"] == "W"
+
+
+def test_driver_merges_files_without_numpy_or_requests(tmp_path):
+    base = _results([_pick("A @ H", "spread", 60, True)])
+    ours = _results([_pick("A @ H", "spread", 60, True), _pick("B @ C", "total", 70, False)])
+    theirs = _results([_pick("A @ H", "spread", 60, True), _pick("D @ E", "ml", 80, True)])
+    paths = []
+    for name, doc in (("base", base), ("ours", ours), ("theirs", theirs)):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps(doc))
+        paths.append(str(path))
+    blocker = "import sys; sys.modules['numpy'] = None; sys.modules['requests'] = None; "
+    run = (f"sys.path.insert(0, {SCRIPTS!r}); import merge_json; "
+           f"sys.exit(merge_json.main(['merge_json.py', *{paths!r}, 'results.json']))")
+    proc = subprocess.run([sys.executable, "-c", blocker + run], capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+
+    merged = json.loads((tmp_path / "ours.json").read_text())
+    assert [p["game"] for p in merged["days"][0]["picks"]] == ["A @ H", "B @ C", "D @ E"]
+    assert "ci" not in merged["allTime"]["spreads"]
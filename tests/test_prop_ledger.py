@@ -0,0 +1,58 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from check_and_grade import _grade_ledger, build_prop_ledger  # noqa: E402
+
+BOX_SCORES = {("DEN", "LAL"): {"_eid": "401", "Nikola Jokic": {"points": 31.0, "rebounds": 9.0}}}
+
+
+def _prop(**kw):
+    p = {"player": "Nikola Jokic", "prop": "points", "line": 27.5, "direction": "OVER"}
+    p.update(kw)
+    return p
+
+
+def _stat(calls):
+    def get(stats, prop_type):
+        calls.append(prop_type)
+        return stats.get(prop_type)
+    return get
+
+
+def test_prop_is_graded_from_whichever_copy_can_be_matched():
+    first = _prop(team="DEN")  # no opponent: no box score for this copy
+    second = _prop(team="LAL", opponent="DEN")  # other side's copy: no box score either
+    third = _prop(team="DEN", opponent="LAL")
+    calls = []
+
+    graded, wins, losses = _grade_ledger(build_prop_ledger([first], [second], [third]), BOX_SCORES, _stat(calls))
+
+    assert (graded, wins, losses) == (1, 1, 0)
+    assert calls == ["points"]  # one lookup for the three copies
+    for p in (first, second, third):
+        assert (p["result"], p["actual"]) == ("WIN", 31.0)
+
+
+def test_a_final_copy_is_reused_without_a_lookup():
+    done = _prop(team="DEN", opponent="LAL", line=33.5, result="LOSS", actual=31.0)
+    early = _prop(team="DEN", line=33.5, result="WIN", actual=35.0, settled_early=True)
+    pending = _prop(line=33.5)
+    calls = []
+
+    graded, wins, losses = _grade_ledger(build_prop_ledger([pending], [early, done]), BOX_SCORES, _stat(calls))
+
+    assert (graded, wins, losses) == (1, 0, 1)
+    assert calls == []
+    for p in (pending, early):
+        assert (p["result"], p["actual"]) == ("LOSS", 31.0)
+    assert "settled_early" not in early
+
+
+def test_ungradable_copies_stay_pending():
+    a = _prop(team="DEN", opponent="LAL", player="Someone Else")
+    b = _prop(team="BOS", opponent="NYK")
+
+    assert _grade_ledger(build_prop_ledger([a], [b]), BOX_SCORES, _stat([])) == (0, 0, 0)
+    assert "result" not in a and "result" not in b
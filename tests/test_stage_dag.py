@@ -0,0 +1,53 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from stage_dag import run_stages, stage  # noqa: E402
+
+
+def test_timed_out_stage_blocks_its_dependents():
+    release = threading.Event()
+    ran = []
+
+    def slow(inputs):
+        release.wait(5)  # still "writing" after the executor gave up on it
+        ran.append("slow")
+
+    stages = [
+        stage("grade", slow, writes=("results.json",), timeout=0.2, cache=False),
+        stage("store", lambda i: ran.append("store"), reads=("results.json",), cache=False),
+        stage("rollups", lambda i: ran.append("rollups"), after=("store",), cache=False),
+        stage("other", lambda i: ran.append("other"), reads=("other.json",), cache=False),
+    ]
+    timer = threading.Timer(0.5, release.set)
+    timer.start()
+    try:
+        _, report, halt = run_stages(stages, grace=5)
+    finally:
+        release.set()
+        timer.cancel()
+
+    assert halt is None
+    assert report["grade"]["status"] == "timeout"
+    assert report["store"]["status"] == "blocked"
+    assert report["rollups"]["status"] == "blocked"
+    assert report["other"]["status"] == "ok"
+    assert "store" not in ran and "rollups" not in ran and "other" in ran
+    assert "slow" in ran  # joined before run_stages returned
+
+
+def test_stage_still_running_after_grace_fails_the_run():
+    release = threading.Event()
+    stages = [stage("grade", lambda i: release.wait(5), timeout=0.1, cache=False)]
+    t0 = time.time()
+    try:
+        _, report, halt = run_stages(stages, grace=0.2)
+    finally:
+        release.set()
+
+    assert time.time() - t0 < 2
+    assert report["grade"]["status"] == "timeout"
+    assert halt is not None and halt.code == 1 and "grade" in halt.message